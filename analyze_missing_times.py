@@ -1,9 +1,11 @@
-import sqlite3
 import json
 
-# Connect to database
-conn = sqlite3.connect('brown_courses.db')
+from database import connect_read_only
+
+# Connect to database read-only, in one transaction so every count sees the same snapshot
+conn = connect_read_only('brown_courses.db')
 cursor = conn.cursor()
+cursor.execute('BEGIN')
 
 # Get total count
 cursor.execute('SELECT COUNT(*) FROM courses')
@@ -0,0 +1,80 @@
+"""
+Measure cold-start time of the database-only CLI commands.
+
+Runs each command in a fresh interpreter several times and reports the
+median wall time, and checks that no browser dependencies were imported.
+The target is under ~100 ms per command.
+
+The project's modules are byte-compiled first, as they would be after any
+normal run. With PYTHONDONTWRITEBYTECODE set and no up-to-date .pyc files,
+every start recompiles database.py and friends, which adds 30-50 ms.
+"""
+
+import compileall
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    ['stats'],
+    ['export', '--format', 'json', '--output', os.devnull],
+    ['--help'],
+]
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'scraper')
+TARGET_MS = 100
+RUNS = 10
+
+
+def time_command(args, runs: int = RUNS) -> float:
+    """Median wall time in ms of `python cli.py <args>` over several runs."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'cli.py'] + args, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def heavy_imports(args) -> list:
+    """Browser-related modules loaded while running a command."""
+    code = (
+        "import sys, contextlib, io, cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        f"        cli.main({args!r})\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    compileall.compile_dir('.', maxlevels=0, quiet=1)
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        subprocess.run([sys.executable, '-c', 'pass'], check=False)
+    interpreter_ms = (time.perf_counter() - start) * 1000 / RUNS
+    print(f"Bare interpreter startup: {interpreter_ms:.0f} ms\n")
+
+    failed = False
+    for args in COMMANDS:
+        median_ms = time_command(args)
+        loaded = heavy_imports(args)
+        status = "OK" if median_ms < TARGET_MS and not loaded else "SLOW"
+        failed |= status != "OK"
+        print(f"{status:<5} cli.py {' '.join(args):<50} {median_ms:6.0f} ms"
+              + (f"  (imported {', '.join(loaded)})" if loaded else ""))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
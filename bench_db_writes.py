@@ -0,0 +1,112 @@
+"""
+Measure course-write throughput of CourseDatabase.
+
+Writes synthetic sections into a fresh database file for each strategy and
+size, and reports rows per second:
+
+    per-row      insert_course, one commit per row (the scraper's old path)
+    batch        insert_course inside db.batch()
+    bulk         insert_courses (executemany, one commit)
+    bulk-tuned   insert_courses with journal_mode=WAL, synchronous=NORMAL
+
+Per-row commits are far too slow for the larger sizes, so that strategy
+writes at most PER_ROW_CAP rows and its rate is reported for those.
+
+    python bench_db_writes.py                 # 1k, 100k and 1M rows
+    python bench_db_writes.py --sizes 1000 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from course_record import CourseRecord
+from database import CourseDatabase
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+PER_ROW_CAP = 5_000
+DEPARTMENTS = ['AFRI', 'APMA', 'CSCI', 'ECON', 'ENGL', 'HIST', 'MATH', 'PHYS']
+TIMES = ['MWF 10-10:50a', 'TTh 1-2:20p', 'M 3-5:30p', 'TTh 10:30-11:50a']
+
+
+def synthetic_courses(count: int):
+    """Yield count distinct sections shaped like scraped rows."""
+    for i in range(count):
+        department = DEPARTMENTS[i % len(DEPARTMENTS)]
+        yield CourseRecord(
+            course_code=f"{department} {i // 10:04d}",
+            course_name=f"Course {i}",
+            department=department,
+            course_times=TIMES[i % len(TIMES)],
+            instructor=f"Instructor {i % 500}",
+            max_enrollment=40,
+            seats_available=i % 40,
+            section=f"S{i % 10:02d}",
+            crn=str(100000 + i),
+            term='202520',
+        )
+
+
+def per_row(db: CourseDatabase, count: int):
+    for course in synthetic_courses(count):
+        db.insert_course(course)
+
+
+def batched(db: CourseDatabase, count: int):
+    with db.batch(size=1000, interval=1.0):
+        for course in synthetic_courses(count):
+            db.insert_course(course)
+
+
+def bulk(db: CourseDatabase, count: int):
+    db.insert_courses(synthetic_courses(count))
+
+
+STRATEGIES = [
+    ('per-row', per_row, {}),
+    ('batch', batched, {}),
+    ('bulk', bulk, {}),
+    ('bulk-tuned', bulk, {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}),
+]
+
+
+def time_strategy(write, count: int, pragmas: dict, directory: str) -> float:
+    """Rows per second for one strategy writing count rows into a new file."""
+    path = os.path.join(directory, f"bench-{time.time_ns()}.db")
+    db = CourseDatabase(path, **pragmas)
+    try:
+        start = time.perf_counter()
+        write(db, count)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CourseDatabase write throughput")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Row counts to write")
+    parser.add_argument('--dir', default=None,
+                        help="Directory for the scratch databases (default: system temp dir; "
+                             "use a directory on the disk the real database lives on)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.gettempdir()
+    print(f"Scratch databases in {directory}\n")
+    print(f"{'rows':>10}  " + "  ".join(f"{name:>12}" for name, _, _ in STRATEGIES) + "   (rows/sec)")
+    for size in args.sizes:
+        rates = []
+        for name, write, pragmas in STRATEGIES:
+            count = min(size, PER_ROW_CAP) if name == 'per-row' else size
+            rates.append(time_strategy(write, count, pragmas, directory))
+        print(f"{size:>10}  " + "  ".join(f"{rate:>12,.0f}" for rate in rates))
+    print(f"\nper-row writes at most {PER_ROW_CAP:,} rows per size.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Crawl several course catalogs concurrently into one partitioned store.
+
+Each catalog is described by a site adapter (see site_adapters.py) and gets
+its own partition of the store: a database file named after the catalog
+under the store directory (catalogs/brown.db, catalogs/<name>.db, ...). The
+courses table keys rows by CRN and by course code + section, which only
+identify a section within one catalog, so catalogs can't share one table.
+
+Every catalog is crawled on its own thread with its own browser and its own
+rate controller, so one slow site doesn't throttle the others.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+from database import CourseDatabase
+
+
+class CatalogStore:
+    """Directory of per-catalog course databases."""
+
+    def __init__(self, root: str = "catalogs"):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding one <catalog>.db per catalog
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, catalog: str) -> str:
+        """Database path of a catalog's partition."""
+        return os.path.join(self.root, f"{catalog}.db")
+
+    def open(self, catalog: str, read_only: bool = False) -> CourseDatabase:
+        """Open a catalog's partition (read_only for reports on a live crawl)."""
+        return CourseDatabase(self.path_for(catalog), read_only=read_only)
+
+    def catalogs(self) -> List[str]:
+        """Names of the catalogs in the store."""
+        return sorted(os.path.splitext(os.path.basename(path))[0]
+                      for path in glob.glob(os.path.join(self.root, "*.db")))
+
+    def summary(self) -> Dict[str, int]:
+        """Course count per catalog."""
+        counts = {}
+        for catalog in self.catalogs():
+            with self.open(catalog, read_only=True) as db:
+                counts[catalog] = db.get_course_count()
+        return counts
+
+
+def crawl_catalog(adapter, store: CatalogStore, max_courses: int = None,
+                  headless: bool = True, list_only: bool = False) -> Dict:
+    """
+    Crawl one catalog into its partition.
+
+    Args:
+        adapter: Site adapter for the catalog
+        store: Store to write into
+        max_courses: Maximum number of courses to scrape (None for all)
+        headless: Run the browser without a window
+        list_only: Store list rows without clicking into them
+
+    Returns:
+        Dictionary with courses_scraped, seconds and error (None on success)
+    """
+    from rate_controller import RateController
+    from scraper import BrownCourseScraper
+
+    start = time.time()
+    scraper = BrownCourseScraper(headless=headless, db_path=store.path_for(adapter.name),
+                                 rate_controller=RateController(), adapter=adapter)
+    error = None
+    try:
+        scraper.run(max_courses=max_courses, list_only=list_only)
+    except Exception as e:
+        error = str(e)
+    return {'courses_scraped': scraper.courses_scraped, 'seconds': round(time.time() - start, 1), 'error': error}
+
+
+def crawl_catalogs(adapters: list, store: CatalogStore, max_courses: int = None,
+                   headless: bool = True, list_only: bool = False, max_workers: int = None) -> Dict[str, Dict]:
+    """
+    Crawl several catalogs concurrently.
+
+    Args:
+        adapters: Site adapters, one per catalog (names must be unique)
+        store: Store to write into
+        max_courses: Maximum number of courses per catalog (None for all)
+        headless: Run the browsers without a window
+        list_only: Store list rows without clicking into them
+        max_workers: Catalogs crawled at once (default: all of them)
+
+    Returns:
+        Mapping of catalog name to its crawl result (see crawl_catalog)
+    """
+    names = [adapter.name for adapter in adapters]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Catalog names must be unique: {names}")
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(adapters)) as executor:
+        futures = {
+            executor.submit(crawl_catalog, adapter, store, max_courses, headless, list_only): adapter.name
+            for adapter in adapters
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            status = f"failed: {results[name]['error']}" if results[name]['error'] else "done"
+            print(f"[{name}] {status} - {results[name]['courses_scraped']} courses "
+                  f"in {results[name]['seconds']:.0f}s")
+    return results
@@ -1,7 +1,7 @@
 """Quick script to check database contents."""
 from database import CourseDatabase
 
-db = CourseDatabase()
+db = CourseDatabase(read_only=True)
 courses = db.get_all_courses()
 
 print(f"\nTotal courses in database: {len(courses)}\n")
@@ -0,0 +1,114 @@
+"""
+Check that one CourseDatabase can be shared by many threads.
+
+Opens a scratch database the way the scraper does (WAL, one batch around
+the whole run). Writer threads insert and upsert distinct synthetic
+sections while reader threads query, search and stream it. The check fails
+if any call raises or reports an error, or if the final table doesn't hold
+exactly the rows written (with their meetings and full-text entries).
+Exits with status 1 on any failure:
+
+    python check_db_threads.py
+    python check_db_threads.py --writers 16 --readers 16 --rows 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from bench_db_writes import synthetic_courses
+from database import CourseDatabase
+
+
+def writer(db: CourseDatabase, courses: list, failures: list):
+    """Write courses one at a time, alternating full inserts and list upserts."""
+    for i, course in enumerate(courses):
+        written = db.insert_course(course) if i % 2 else db.upsert_list_data(course)
+        if not written:
+            failures.append(f"write of CRN {course.crn} failed")
+
+
+def reader(db: CourseDatabase, stop: threading.Event, failures: list, counts: list):
+    """Run every kind of read until stopped."""
+    reads = 0
+    try:
+        while not stop.is_set():
+            db.get_course_by_crn('100000')
+            db.get_courses_by_department('CSCI')
+            db.get_courses_meeting('T', '13:00', '15:00')
+            db.search('course 1', limit=5)
+            with db.snapshot():
+                db.get_course_count()
+                sum(1 for _ in db.iter_courses(500, columns=['crn']))
+            reads += 1
+    except Exception as e:
+        failures.append(f"read failed: {e!r}")
+    counts.append(reads)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stress a shared CourseDatabase from many threads")
+    parser.add_argument('--writers', type=int, default=8, help="Writer threads")
+    parser.add_argument('--readers', type=int, default=8, help="Reader threads")
+    parser.add_argument('--rows', type=int, default=500, help="Rows per writer")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "threads.db")
+    db = CourseDatabase(path, journal_mode="WAL", synchronous="NORMAL")
+    courses = list(synthetic_courses(args.writers * args.rows))
+    failures, counts = [], []
+    stop = threading.Event()
+
+    readers = [threading.Thread(target=reader, args=(db, stop, failures, counts))
+               for _ in range(args.readers)]
+    writers = [threading.Thread(target=writer, args=(db, courses[i::args.writers], failures))
+               for i in range(args.writers)]
+    start = time.perf_counter()
+    try:
+        with db.batch(size=50, interval=2.0):
+            for thread in readers + writers:
+                thread.start()
+            for thread in writers:
+                thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        total = db.get_course_count()
+        with db.lock:
+            orphans = db.conn.execute(
+                "SELECT COUNT(*) FROM meetings WHERE course_id NOT IN (SELECT id FROM courses)").fetchone()[0]
+            unparsed = db.conn.execute(
+                "SELECT COUNT(*) FROM courses WHERE id NOT IN (SELECT course_id FROM meetings)").fetchone()[0]
+            if db.has_fts:
+                db.conn.execute("INSERT INTO courses_fts(courses_fts) VALUES ('integrity-check')")
+    except Exception as e:
+        failures.append(f"check failed: {e!r}")
+        total = orphans = unparsed = None
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    if total != len(courses):
+        failures.append(f"{total} rows stored, expected {len(courses)}")
+    if orphans or unparsed:
+        failures.append(f"meetings out of sync: {orphans} orphaned, {unparsed} courses without meetings")
+
+    print(f"{args.writers} writers stored {len(courses):,} rows in {elapsed:.1f}s "
+          f"while {args.readers} readers completed {sum(counts):,} read rounds")
+    for failure in failures[:20]:
+        print(f"  FAIL {failure}")
+    print(f"\n{len(failures)} failures" if failures else "\nNo errors")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
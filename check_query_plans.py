@@ -0,0 +1,88 @@
+"""
+Check that CourseDatabase's query methods use indexes.
+
+Fills a scratch database with synthetic sections, calls every query
+method, and runs EXPLAIN QUERY PLAN on each statement it executed. A plan
+that scans the courses table (instead of searching an index) fails the
+check. Scanning a partial index is allowed, as it only holds matching
+rows. Exits with status 1 on any failure, so it can guard schema or
+query changes:
+
+    python check_query_plans.py
+"""
+
+import os
+import sys
+import tempfile
+
+from bench_db_writes import synthetic_courses
+from database import CourseDatabase
+
+ROWS = 5_000
+
+# Method name -> arguments
+QUERIES = [
+    ('get_course_by_crn', ('100042',)),
+    ('get_courses_by_department', ('CSCI',)),
+    ('get_courses_by_instructor', ('Instructor 7',)),
+    ('get_courses_by_crns', (['100001', '100002', '100500'],)),
+    ('get_courses_by_number_range', ('CSCI', 10, 50)),
+    ('get_open_courses', ()),
+    ('get_open_courses', ('CSCI',)),
+    ('get_courses_meeting', ('T', '13:00', '15:00')),
+    ('get_courses_meeting', ('T', '13:00', '15:00', True)),
+    ('get_meetings', ('100042',)),
+]
+
+
+def query_plans(db: CourseDatabase, method: str, args: tuple) -> list:
+    """
+    EXPLAIN QUERY PLAN of every SELECT a query method runs.
+
+    Returns:
+        List of (sql, [plan detail, ...])
+    """
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        getattr(db, method)(*args)
+    finally:
+        db.conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith('SELECT'):
+            rows = db.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plans.append((sql, [row[-1] for row in rows]))
+    return plans
+
+
+def main() -> int:
+    path = os.path.join(tempfile.mkdtemp(), "plans.db")
+    db = CourseDatabase(path)
+    db.insert_courses(synthetic_courses(ROWS))
+
+    partial_indexes = {name for (name,) in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'")}
+
+    failures = 0
+    try:
+        for method, args in QUERIES:
+            for sql, details in query_plans(db, method, args):
+                scans = [detail for detail in details if detail.startswith('SCAN ')
+                         and detail.split()[-1] not in partial_indexes]
+                status = "FAIL" if scans else "ok"
+                failures += bool(scans)
+                print(f"[{status:>4}] {method}{args}")
+                for detail in details:
+                    print(f"         {detail}")
+    finally:
+        db.close()
+        os.remove(path)
+
+    print(f"\n{failures} queries scan the courses table" if failures else "\nEvery query uses an index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
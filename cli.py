@@ -0,0 +1,380 @@
+"""
+Command-line interface for the Brown course scraper.
+
+    python cli.py scrape [--max-courses N] [--crns ...] [--course-codes ...] [--departments ...]
+    python cli.py refresh [--requests-per-minute N]
+    python cli.py watch TARGET... [--interval SECONDS] [--webhook URL] [--file PATH]
+    python cli.py export [--format json|csv] [--output PATH]
+    python cli.py stats
+    python cli.py search WORDS... [--limit N]
+    python cli.py monitor [--interval SECONDS]
+    python cli.py serve [--port PORT]
+    python cli.py crawl CATALOG... [--store DIR] [--max-courses N]
+    python cli.py daemon start [--sessions N] | scrape CRN... | refresh DEPT | state | stop
+
+Selenium, webdriver_manager and the scraper are only imported by the
+subcommands that drive a browser, so the database-only commands start fast.
+Keep module-level imports here to the standard library.
+"""
+
+import argparse
+import sys
+
+
+def _make_profiler(args):
+    """PhaseProfiler if --profile was given, else None."""
+    if not getattr(args, 'profile', None):
+        return None
+    from profiling import PhaseProfiler
+    return PhaseProfiler()
+
+
+def cmd_scrape(args):
+    """Scrape the catalog into the database."""
+    from site_adapters import get_adapter
+
+    try:
+        adapter = get_adapter(args.catalog)
+    except ValueError as e:
+        sys.exit(str(e))
+    from scraper import BrownCourseScraper
+
+    profiler = _make_profiler(args)
+    response_cache = None
+    if args.response_cache:
+        from response_cache import ResponseCache
+        response_cache = ResponseCache(args.response_cache)
+    tracer = None
+    if args.trace_commands:
+        from driver_tracer import CommandTracer
+        tracer = CommandTracer()
+    click_tracer = None
+    if args.trace_slow_clicks:
+        from devtools_trace import SlowClickTracer
+        threshold = args.trace_slow_clicks
+        if threshold.lower().startswith('p'):
+            click_tracer = SlowClickTracer(args.trace_dir, percentile=float(threshold[1:]))
+        else:
+            click_tracer = SlowClickTracer(args.trace_dir, threshold=float(threshold))
+
+    scraper = BrownCourseScraper(
+        adapter=adapter,
+        headless=args.headless,
+        db_path=args.db,
+        max_courses_per_session=args.max_courses_per_session,
+        max_memory_mb=args.max_memory_mb,
+        profiler=profiler,
+        response_cache=response_cache,
+        tracer=tracer,
+        click_tracer=click_tracer,
+    )
+    try:
+        scraper.run(max_courses=args.max_courses, crns=args.crns,
+                    course_codes=args.course_codes, departments=args.departments,
+                    list_only=args.list_only, pipelined=args.pipelined)
+    finally:
+        if profiler:
+            profiler.write_report(args.profile)
+        if tracer:
+            tracer.write_report(args.trace_commands)
+        if click_tracer:
+            click_tracer.write_summary()
+        if response_cache:
+            stats = response_cache.stats()
+            print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_ratio']:.0%} hit ratio), {stats['bytes_written']} bytes written, "
+                  f"{stats['bytes_deduped']} bytes deduplicated")
+            response_cache.close()
+        metrics = scraper.rate_controller.metrics()
+        print(f"Request rate: {metrics['rate']}/s, concurrency {metrics['concurrency']}, "
+              f"{metrics['requests']} requests, {metrics['timeouts']} timeouts, {metrics['errors']} errors, "
+              f"{metrics['throttle_events']} throttle events")
+    print(f"Courses scraped: {scraper.courses_scraped}")
+
+
+def cmd_refresh(args):
+    """Continuously refresh enrollment for hot sections."""
+    from refresh_scheduler import RefreshScheduler
+    from scraper import BrownCourseScraper
+
+    scraper = BrownCourseScraper(headless=args.headless, db_path=args.db)
+    scheduler = RefreshScheduler(scraper.refresh_course, requests_per_minute=args.requests_per_minute)
+    scheduler.load_from_db(scraper.db)
+    print(f"Scheduling refreshes for {len(scheduler.sections)} sections")
+
+    try:
+        scraper.setup_driver()
+        scheduler.run(duration=args.duration)
+    except KeyboardInterrupt:
+        print("\nStopped refreshing")
+    finally:
+        print(f"Refreshes: {scheduler.refreshes}, failures: {scheduler.failures}")
+        scraper.cleanup()
+
+
+def cmd_watch(args):
+    """Watch a list of CRNs or course codes for seat changes."""
+    from scraper import BrownCourseScraper
+    from watch_service import FileSink, StdoutSink, WatchService, WebhookSink
+
+    sinks = [] if args.quiet else [StdoutSink()]
+    if args.file:
+        sinks.append(FileSink(args.file))
+    for url in args.webhook:
+        sinks.append(WebhookSink(url))
+
+    scraper = BrownCourseScraper(headless=not args.headed, db_path=args.db)
+    service = WatchService(scraper, args.targets, sinks, interval=args.interval)
+    print(f"Watching {len(args.targets)} targets every {args.interval:.0f}s")
+
+    try:
+        scraper.setup_driver()
+        service.run()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        print(f"Checks: {service.cycles}, events: {service.events}")
+        scraper.cleanup()
+
+
+def cmd_export(args):
+    """Export the database to JSON (for the heatmap) or CSV."""
+    if args.format == 'csv':
+        from export_db import export_csv
+        export_csv(args.db, args.output or 'brown_courses.csv')
+    else:
+        from export_schedule_data import export_schedule_data
+        profiler = _make_profiler(args)
+        export_schedule_data(args.db, args.output or 'schedule_data.json', profiler,
+                             hydrate=args.hydrate, ttl=args.ttl)
+        if profiler:
+            profiler.write_report(args.profile)
+
+
+def cmd_stats(args):
+    """Print a summary of the database contents."""
+    import os
+    from database import CourseDatabase
+
+    if not os.path.exists(args.db):
+        print(f"No database at {args.db}")
+        return
+    with CourseDatabase(args.db, read_only=True) as db, db.snapshot():
+        cursor = db.cursor
+        total = db.get_course_count()
+        cursor.execute("SELECT COUNT(DISTINCT department) FROM courses")
+        departments = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM courses WHERE course_times IS NULL OR course_times = ''")
+        no_times = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM courses WHERE seats_available = 0")
+        full = cursor.fetchone()[0]
+        cursor.execute("SELECT MIN(last_updated), MAX(last_updated) FROM courses")
+        oldest, newest = cursor.fetchone()
+        cursor.execute("""
+            SELECT department, COUNT(*) FROM courses
+            GROUP BY department ORDER BY COUNT(*) DESC LIMIT ?
+        """, (args.top,))
+        top_departments = cursor.fetchall()
+
+    print(f"Courses:            {total}")
+    print(f"Departments:        {departments}")
+    print(f"Without times:      {no_times}")
+    print(f"Full sections:      {full}")
+    print(f"Last updated:       {oldest} .. {newest}")
+    if top_departments:
+        print("\nLargest departments:")
+        for department, count in top_departments:
+            print(f"  {department:<6} {count}")
+
+
+def cmd_search(args):
+    """Full-text search over course names, codes and instructors."""
+    import os
+    from database import CourseDatabase
+
+    if not os.path.exists(args.db):
+        print(f"No database at {args.db}")
+        return
+    with CourseDatabase(args.db, read_only=True) as db:
+        courses = db.search(" ".join(args.words), limit=args.limit)
+    for course in courses:
+        print(f"{course.crn or '':>6}  {course.course_code:<11} {course.course_name}  ({course.instructor or 'TBA'})")
+    if not courses:
+        print("No matches")
+
+
+def cmd_monitor(args):
+    """Watch the course count while a scrape runs."""
+    from monitor_db import monitor
+    monitor(args.db, args.interval)
+
+
+def cmd_serve(args):
+    """Serve the heatmap's static files and exported schedule data."""
+    import functools
+    import http.server
+
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=args.directory)
+    with http.server.ThreadingHTTPServer(('127.0.0.1', args.port), handler) as server:
+        print(f"Serving {args.directory} at http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped serving")
+
+
+def cmd_crawl(args):
+    """Crawl several catalogs concurrently into a partitioned store."""
+    from catalog_crawler import CatalogStore, crawl_catalogs
+    from site_adapters import get_adapter
+
+    try:
+        adapters = [get_adapter(spec) for spec in args.catalogs]
+    except ValueError as e:
+        sys.exit(str(e))
+    store = CatalogStore(args.store)
+    print(f"Crawling {len(adapters)} catalogs into {args.store}/")
+    results = crawl_catalogs(adapters, store, max_courses=args.max_courses, headless=not args.headed,
+                             list_only=args.list_only, max_workers=args.workers)
+    for catalog, count in store.summary().items():
+        print(f"  {catalog:<16} {count} courses")
+    if any(result['error'] for result in results.values()):
+        sys.exit(1)
+
+
+def cmd_daemon(args):
+    """Run the warm scraping daemon, or send it a command."""
+    from scrape_daemon import ScrapeDaemon, print_events, send_command
+
+    if args.action == 'start':
+        ScrapeDaemon(args.socket, sessions=args.sessions, db_path=args.db, headless=not args.headed).serve()
+        return
+
+    if args.action in ('scrape', 'refresh') and not args.targets:
+        sys.exit(f"daemon {args.action} needs {'CRNs' if args.action == 'scrape' else 'a department'}")
+    if args.action == 'scrape':
+        command = {'cmd': 'scrape', 'crns': args.targets}
+    elif args.action == 'refresh':
+        command = {'cmd': 'refresh', 'department': args.targets[0]}
+    elif args.action == 'state':
+        command = {'cmd': 'state'}
+    else:
+        command = {'cmd': 'shutdown'}
+    try:
+        events = print_events(send_command(command, args.socket))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"No daemon listening on {args.socket} (start one with: cli.py daemon start)")
+    if events and events[-1].get('event') == 'error':
+        sys.exit(1)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(prog='cli.py', description="Brown course catalog scraper")
+    parser.add_argument('--db', default='brown_courses.db', help="Path to SQLite database file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scrape = subparsers.add_parser('scrape', help="Scrape the catalog into the database")
+    scrape.add_argument('--max-courses', type=int, default=None, help="Stop after N courses")
+    scrape.add_argument('--crns', nargs='+', default=None, help="Only scrape these CRNs")
+    scrape.add_argument('--course-codes', nargs='+', default=None,
+                        help='Only scrape these courses (quote codes: "APMA 0355")')
+    scrape.add_argument('--departments', nargs='+', default=None, help="Only scrape these departments")
+    scrape.add_argument('--list-only', action='store_true',
+                        help="Store list rows without clicking into each course (hydrate later)")
+    scrape.add_argument('--pipelined', action='store_true',
+                        help="Let an in-page observer click and buffer detail panels (full crawl)")
+    scrape.add_argument('--headless', action='store_true', help="Run without a browser window")
+    scrape.add_argument('--catalog', default='brown',
+                        help="Catalog adapter: a registered name or NAME=URL (default brown)")
+    scrape.add_argument('--max-courses-per-session', type=int, default=None,
+                        help="Restart the browser after N courses")
+    scrape.add_argument('--max-memory-mb', type=float, default=None,
+                        help="Restart the browser above this memory use")
+    scrape.add_argument('--response-cache', metavar='DIR', default=None,
+                        help="Revalidate detail panels against an on-disk cache in DIR")
+    scrape.add_argument('--profile', metavar='PREFIX', default=None,
+                        help="Profile the run and write PREFIX.json / PREFIX.txt reports")
+    scrape.add_argument('--trace-commands', metavar='PREFIX', default=None,
+                        help="Count and time every WebDriver command; write PREFIX.json / PREFIX.txt")
+    scrape.add_argument('--trace-slow-clicks', metavar='THRESHOLD', default=None,
+                        help="Save a DevTools trace for clicks slower than THRESHOLD seconds, "
+                             "or than a percentile of clicks so far (e.g. p95)")
+    scrape.add_argument('--trace-dir', default='.cache/traces', help="Directory for slow-click traces")
+    scrape.set_defaults(func=cmd_scrape)
+
+    refresh = subparsers.add_parser('refresh', help="Keep enrollment fresh for hot sections")
+    refresh.add_argument('--requests-per-minute', type=float, default=20, help="Global refresh budget")
+    refresh.add_argument('--duration', type=float, default=None, help="Stop after N seconds")
+    refresh.add_argument('--headless', action='store_true', help="Run without a browser window")
+    refresh.set_defaults(func=cmd_refresh)
+
+    watch = subparsers.add_parser('watch', help="Alert on seat changes for a watchlist")
+    watch.add_argument('targets', nargs='+', help='CRNs or course codes (quote codes: "APMA 0355")')
+    watch.add_argument('--interval', type=float, default=30, help="Seconds between checks")
+    watch.add_argument('--webhook', action='append', default=[], help="POST events to this URL")
+    watch.add_argument('--file', default=None, help="Append events to this file as JSON lines")
+    watch.add_argument('--quiet', action='store_true', help="Don't print events to stdout")
+    watch.add_argument('--headed', action='store_true', help="Show the browser window")
+    watch.set_defaults(func=cmd_watch)
+
+    export = subparsers.add_parser('export', help="Export the database")
+    export.add_argument('--format', choices=('json', 'csv'), default='json', help="Output format")
+    export.add_argument('--output', default=None,
+                        help="Output path (default schedule_data.json or brown_courses.csv)")
+    export.add_argument('--profile', metavar='PREFIX', default=None,
+                        help="Profile the JSON export and write PREFIX.json / PREFIX.txt reports")
+    export.add_argument('--hydrate', action='store_true',
+                        help="Fetch details missing from list-only rows first (starts a browser)")
+    export.add_argument('--ttl', type=float, default=6 * 3600,
+                        help="Seconds a cached detail stays fresh when hydrating")
+    export.set_defaults(func=cmd_export)
+
+    stats = subparsers.add_parser('stats', help="Summarize the database")
+    stats.add_argument('--top', type=int, default=10, help="Number of departments to list")
+    stats.set_defaults(func=cmd_stats)
+
+    search = subparsers.add_parser('search', help="Search course names, codes and instructors")
+    search.add_argument('words', nargs='+', help="Words to match (prefixes match too: 'intro comp')")
+    search.add_argument('--limit', type=int, default=20, help="Maximum number of results")
+    search.set_defaults(func=cmd_search)
+
+    monitor = subparsers.add_parser('monitor', help="Watch the course count during a scrape")
+    monitor.add_argument('--interval', type=float, default=5, help="Seconds between checks")
+    monitor.set_defaults(func=cmd_monitor)
+
+    serve = subparsers.add_parser('serve', help="Serve the heatmap and schedule data")
+    serve.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    serve.add_argument('--directory', default='schedule-heatmap/dist',
+                       help="Directory to serve (a built heatmap with schedule_data.json)")
+    serve.set_defaults(func=cmd_serve)
+
+    crawl = subparsers.add_parser('crawl', help="Crawl several catalogs concurrently")
+    crawl.add_argument('catalogs', nargs='+', help="Registered catalog names or NAME=URL")
+    crawl.add_argument('--store', default='catalogs', help="Directory with one database per catalog")
+    crawl.add_argument('--max-courses', type=int, default=None, help="Stop each catalog after N courses")
+    crawl.add_argument('--list-only', action='store_true', help="Store list rows without clicking into courses")
+    crawl.add_argument('--workers', type=int, default=None, help="Catalogs crawled at once (default all)")
+    crawl.add_argument('--headed', action='store_true', help="Show the browser windows")
+    crawl.set_defaults(func=cmd_crawl)
+
+    daemon = subparsers.add_parser('daemon', help="Warm browser sessions controlled over a Unix socket")
+    daemon.add_argument('action', choices=('start', 'scrape', 'refresh', 'state', 'stop'),
+                        help="start the daemon, or send it a command")
+    daemon.add_argument('targets', nargs='*', help="CRNs for scrape, a department for refresh")
+    daemon.add_argument('--socket', default='.cache/scraper.sock', help="Path of the daemon's socket")
+    daemon.add_argument('--sessions', type=int, default=1, help="Number of warm browser sessions (start)")
+    daemon.add_argument('--headed', action='store_true', help="Show the browser windows (start)")
+    daemon.set_defaults(func=cmd_daemon)
+
+    return parser
+
+
+def main(argv=None):
+    """Main entry point."""
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Compact course record shared by the scraper, the database and the exports.
+
+A CourseRecord holds one section with the courses table's columns as slots,
+so it is much smaller than the equivalent dict. Departments, instructors,
+terms and meeting strings repeat across thousands of sections and are
+interned, so every record shares a single copy of each. Meeting times are
+parsed on first use and cached.
+
+Records also accept dict-style access (record['crn'], record.get('crn'),
+record.update({...})). Callers that were written against plain course
+dictionaries keep working, but only the column names are valid keys.
+
+Conversions:
+    CourseRecord.from_row(row)   - row of CourseRecord.SELECT (column order)
+    CourseRecord.from_dict(data) - scraper/database dict, or an export dict
+                                   using the export keys (code, name, ...)
+    record.to_dict()             - column-name dictionary
+    record.to_export_dict()      - schedule export entry (see export_schedule_data.py)
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Column order of the courses table
+FIELDS = ('id', 'course_code', 'course_name', 'department', 'course_times',
+          'instructor', 'max_enrollment', 'seats_available', 'section',
+          'crn', 'last_updated', 'term')
+
+# Ordered, set-like view of FIELDS (what dict.keys() returns)
+_KEYS = dict.fromkeys(FIELDS).keys()
+
+# Fields whose values repeat across many sections
+INTERNED_FIELDS = ('department', 'instructor', 'term', 'course_times')
+
+# Day abbreviation <-> day index stored in the meetings table (0 = Monday)
+DAY_NAMES = ('M', 'T', 'W', 'Th', 'F', 'S', 'Su')
+DAY_INDEX = {name: index for index, name in enumerate(DAY_NAMES)}
+
+# Short export keys -> column names
+EXPORT_KEYS = {'code': 'course_code', 'name': 'course_name', 'raw_time_string': 'course_times'}
+
+
+def parse_days(day_string: str) -> List[str]:
+    """
+    Parse day abbreviations into individual days.
+
+    Examples:
+        'MWF' -> ['M', 'W', 'F']
+        'TTh' -> ['T', 'Th']
+        'M' -> ['M']
+        'SSu' -> ['S', 'Su']
+    """
+    days = []
+    i = 0
+    while i < len(day_string):
+        # Check for 'Th' and 'Su' first (two characters)
+        if i < len(day_string) - 1 and day_string[i:i+2] in ('Th', 'Su'):
+            days.append(day_string[i:i+2])
+            i += 2
+        else:
+            # Single character day
+            days.append(day_string[i])
+            i += 1
+    return days
+
+
+def parse_time(time_str: str) -> Optional[str]:
+    """
+    Parse time string to 24-hour format.
+
+    Examples:
+        '2:30p' -> '14:30'
+        '12-12:50p' -> '12:00'
+        '9a' -> '09:00'
+        '10:30a' -> '10:30'
+    """
+    if not time_str:
+        return None
+
+    # Remove spaces
+    time_str = time_str.strip()
+
+    # Check if it ends with 'a' or 'p'
+    is_pm = time_str.endswith('p')
+    is_am = time_str.endswith('a')
+
+    if not (is_pm or is_am):
+        return None
+
+    # Remove the 'a' or 'p'
+    time_str = time_str[:-1]
+
+    # Split on ':' to get hours and minutes
+    if ':' in time_str:
+        parts = time_str.split(':')
+        hours = int(parts[0])
+        minutes = int(parts[1])
+    else:
+        hours = int(time_str)
+        minutes = 0
+
+    # Convert to 24-hour format
+    if is_pm and hours != 12:
+        hours += 12
+    elif is_am and hours == 12:
+        hours = 0
+
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def parse_course_times(course_times: str) -> Optional[Dict]:
+    """
+    Parse course time string into structured data.
+
+    Examples:
+        'TTh 2:30-3:50p' -> {
+            'days': ['T', 'Th'],
+            'start_time': '14:30',
+            'end_time': '15:50'
+        }
+        'MWF 12-12:50p' -> {
+            'days': ['M', 'W', 'F'],
+            'start_time': '12:00',
+            'end_time': '12:50'
+        }
+    """
+    if not course_times or course_times.strip() == '':
+        return None
+
+    # Pattern: <days> <start>-<end>
+    # Days can be: M, T, W, Th, F, S, Su
+    # Times can be: 9a, 10:30a, 2:30p, etc.
+
+    # Try to split on space to separate days from times
+    parts = course_times.strip().split()
+    if len(parts) < 2:
+        return None
+
+    days_str = parts[0]
+    time_range = ' '.join(parts[1:])
+
+    # Parse days
+    days = parse_days(days_str)
+
+    # Parse time range
+    # Look for pattern: <start>-<end>
+    time_match = re.search(r'([\d:]+[ap]?)-([\d:]+[ap])', time_range)
+    if not time_match:
+        return None
+
+    start_str = time_match.group(1)
+    end_str = time_match.group(2)
+
+    # If start doesn't have a/p, inherit from end
+    if not (start_str.endswith('a') or start_str.endswith('p')):
+        if end_str.endswith('a'):
+            start_str += 'a'
+        elif end_str.endswith('p'):
+            start_str += 'p'
+
+    start_time = parse_time(start_str)
+    end_time = parse_time(end_str)
+
+    if not start_time or not end_time:
+        return None
+
+    return {
+        'days': days,
+        'start_time': start_time,
+        'end_time': end_time
+    }
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Minutes after midnight of a 24-hour time ('14:30' -> 870)."""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_time(minutes: int) -> str:
+    """24-hour time of minutes after midnight (870 -> '14:30')."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_meetings(course_times: str) -> List[Tuple[int, int, int, int]]:
+    """
+    Parse course times into one row per meeting day.
+    
+    A section can list several patterns separated by ';'
+    ('MF 10-10:50a; TTh 10:30-11:50a'); each is numbered in order.
+    Patterns that don't parse are skipped.
+    
+    Examples:
+        'TTh 2:30-3:50p' -> [(0, 1, 870, 950), (0, 3, 870, 950)]
+    
+    Returns:
+        List of (pattern, day index, start minute, end minute)
+    """
+    if not course_times:
+        return []
+    return list(_parse_meetings(course_times))
+
+
+@lru_cache(maxsize=4096)
+def _parse_meetings(course_times: str) -> tuple:
+    """parse_meetings, cached: a term has only a few hundred distinct time strings."""
+    rows = []
+    for pattern, segment in enumerate(part for part in course_times.split(';') if part.strip()):
+        parsed = parse_course_times(segment)
+        if not parsed:
+            continue
+        start = time_to_minutes(parsed['start_time'])
+        end = time_to_minutes(parsed['end_time'])
+        rows.extend((pattern, DAY_INDEX[day], start, end) for day in parsed['days'] if day in DAY_INDEX)
+    return tuple(rows)
+
+
+def _intern(value):
+    """Intern strings; leave None and other types alone."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class CourseRecord:
+    """One course section, with the courses table's columns as slots."""
+
+    __slots__ = FIELDS + ('_meeting',)
+
+    # Column list matching from_row's argument order
+    SELECT = ", ".join(FIELDS)
+
+    def __init__(self, id=None, course_code=None, course_name=None, department=None,
+                 course_times=None, instructor=None, max_enrollment=None, seats_available=None,
+                 section=None, crn=None, last_updated=None, term=None):
+        self.id = id
+        self.course_code = course_code
+        self.course_name = course_name
+        self.department = _intern(department)
+        self.course_times = _intern(course_times)
+        self.instructor = _intern(instructor)
+        self.max_enrollment = max_enrollment
+        self.seats_available = seats_available
+        self.section = section
+        self.crn = crn
+        self.last_updated = last_updated
+        self.term = _intern(term)
+        self._meeting = None
+
+    def __repr__(self):
+        return f"CourseRecord({self.course_code!r}, section={self.section!r}, crn={self.crn!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, CourseRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS)
+
+    __hash__ = None
+
+    # Conversions
+
+    @classmethod
+    def from_row(cls, row) -> 'CourseRecord':
+        """Record from a row selected with CourseRecord.SELECT."""
+        return cls(*row)
+
+    @classmethod
+    def from_dict(cls, data) -> 'CourseRecord':
+        """
+        Record from a course dictionary (or another record).
+
+        Args:
+            data: Mapping with column names, or an export entry using the
+                export keys (code, name, raw_time_string); other keys are ignored
+
+        Returns:
+            New record
+        """
+        if isinstance(data, CourseRecord):
+            return data.copy()
+        record = cls()
+        for key, value in data.items():
+            key = EXPORT_KEYS.get(key, key)
+            if key in FIELDS:
+                record[key] = value
+        return record
+
+    @classmethod
+    def coerce(cls, data) -> 'CourseRecord':
+        """The record itself, or a new record built from a dictionary."""
+        return data if isinstance(data, CourseRecord) else cls.from_dict(data)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> List['CourseRecord']:
+        """Records from rows selected with CourseRecord.SELECT."""
+        return [cls(*row) for row in rows]
+
+    def to_row(self) -> tuple:
+        """Values in column order (see FIELDS)."""
+        return (self.id, self.course_code, self.course_name, self.department, self.course_times,
+                self.instructor, self.max_enrollment, self.seats_available, self.section,
+                self.crn, self.last_updated, self.term)
+
+    def to_dict(self) -> Dict:
+        """Column-name dictionary (JSON-ready apart from last_updated)."""
+        return dict(zip(FIELDS, self.to_row()))
+
+    def copy(self) -> 'CourseRecord':
+        """Shallow copy."""
+        return CourseRecord(*self.to_row())
+
+    # Derived fields
+
+    @property
+    def meeting(self) -> Optional[Dict]:
+        """Parsed course_times (days, start_time, end_time), or None if unparseable."""
+        # Cached with the string it was parsed from, so edits to course_times re-parse
+        if self._meeting is None or self._meeting[0] is not self.course_times:
+            self._meeting = (self.course_times, parse_course_times(self.course_times))
+        return self._meeting[1]
+
+    @property
+    def current_enrollment(self) -> int:
+        """Students enrolled (max enrollment when seats available is unknown)."""
+        if self.max_enrollment is not None and self.seats_available is not None:
+            return self.max_enrollment - self.seats_available
+        if self.max_enrollment is not None:
+            return self.max_enrollment
+        return 0
+
+    def to_export_dict(self, meeting: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Schedule export entry.
+
+        Args:
+            meeting: Already-parsed meeting (days, start_time, end_time), e.g.
+                read from the meetings table; parsed from course_times if None
+
+        Returns:
+            Dictionary with code, name, instructor, section, crn, days,
+            start_time, end_time, current_enrollment, max_enrollment and
+            raw_time_string, or None if the meeting times can't be parsed
+        """
+        meeting = meeting or self.meeting
+        if not meeting:
+            return None
+        return {
+            'code': self.course_code,
+            'name': self.course_name,
+            'instructor': self.instructor or '',
+            'section': self.section or '',
+            'crn': self.crn or '',
+            'days': list(meeting['days']),
+            'start_time': meeting['start_time'],
+            'end_time': meeting['end_time'],
+            'current_enrollment': self.current_enrollment,
+            'max_enrollment': self.max_enrollment or 0,
+            'raw_time_string': self.course_times
+        }
+
+    # Dictionary-style access for code written against course dicts
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+
+    def __contains__(self, key):
+        return key in FIELDS and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        """Field value, or default when the field is unknown or None."""
+        if key not in FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def update(self, data: Dict):
+        """Set fields from a mapping (unknown keys raise KeyError)."""
+        for key, value in data.items():
+            self[key] = value
+
+    def keys(self):
+        """Column names, in table order."""
+        return _KEYS
+
+    def items(self):
+        """(column, value) pairs, in table order."""
+        return zip(FIELDS, self.to_row())
@@ -3,31 +3,221 @@ Database module for storing Brown University course catalog data.
 """
 
 import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Iterator, Optional, List, Sequence
 import os
+import re
+
+from course_record import DAY_INDEX, DAY_NAMES, CourseRecord, FIELDS, minutes_to_time, parse_meetings, time_to_minutes
+
+# Seconds a connection waits for another process's lock before "database is locked"
+DEFAULT_TIMEOUT = 30.0
+
+
+def connect_read_only(db_path: str, timeout: float = DEFAULT_TIMEOUT,
+                      check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open a database file read-only.
+    
+    A read-only connection never takes the write lock, so it can't block
+    the scraper. In WAL mode it also never waits for the scraper.
+    
+    Args:
+        db_path: Path to an existing SQLite database file
+        timeout: Busy timeout in seconds
+        check_same_thread: Refuse use from threads other than the creating one
+        
+    Returns:
+        sqlite3 connection that rejects writes
+        
+    Raises:
+        sqlite3.OperationalError: If the file doesn't exist
+    """
+    # Built by hand rather than with pathlib, which roughly doubles this module's import time
+    path = os.path.realpath(db_path).replace(os.sep, '/')
+    path = path.replace('%', '%25').replace('?', '%3f').replace('#', '%23')
+    uri = f"file:{'' if path.startswith('/') else '/'}{path}?mode=ro"
+    return sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=check_same_thread)
+
+
+def select_columns(conn: sqlite3.Connection, table: str = "") -> str:
+    """
+    Column list for CourseRecord.from_row on this connection's courses table.
+    
+    Columns the file doesn't have yet (an old file opened read-only, so
+    not migrated) are selected as NULL.
+    
+    Args:
+        conn: Open connection
+        table: Alias to qualify the columns with (for joins), e.g. "c"
+    """
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(courses)")}
+    prefix = f"{table}." if table else ""
+    return ", ".join(f"{prefix}{column}" if column in existing else f"NULL AS {column}"
+                     for column in FIELDS)
+
+
+class _ReaderHandle:
+    """A thread's read connection, stored in its thread-local storage."""
+    
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_reader(conn: sqlite3.Connection, readers: list, lock):
+    """Close a thread's read connection once the thread is gone."""
+    with lock:
+        if conn in readers:
+            readers.remove(conn)
+    conn.close()
 
 
 class CourseDatabase:
-    """Manages SQLite database for course information."""
+    """
+    Manages SQLite database for course information.
+    
+    One instance can be shared by several threads (e.g. parallel detail
+    workers). Writes from every thread go through a single writer
+    connection, one at a time, and join the same batch. Reads from the
+    thread that opened the database use the writer connection too; every
+    other thread reads through its own read-only connection, so readers
+    run concurrently with each other and, in WAL mode, with the writer.
+    """
+    
+    # Columns added after the original schema, in the order they were added
+    ADDED_COLUMNS = [('term', 'TEXT')]
+    
+    # Secondary indexes (name, definition), created on open when missing.
+    # crn and (course_code, section) are already indexed by their UNIQUE constraints.
+    INDEXES = [
+        ('idx_courses_department', "courses(department, course_code)"),
+        ('idx_courses_instructor', "courses(instructor)"),
+        # Partial: holds only open sections, already in the order queries return them
+        ('idx_courses_open_seats', "courses(department, course_code) WHERE seats_available > 0"),
+        ('idx_meetings_day_time', "meetings(day, start_minute, end_minute, course_id)"),
+        ('idx_meetings_course', "meetings(course_id, pattern, day)"),
+    ]
+    
+    # Upsert written by insert_course and insert_courses (parameters from _insert_values)
+    INSERT_SQL = """
+        INSERT OR REPLACE INTO courses 
+        (course_code, course_name, department, course_times, instructor, 
+         max_enrollment, seats_available, section, crn, last_updated, term)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    # Full-text index over these columns, in this order (see search())
+    FTS_COLUMNS = ('course_name', 'course_code', 'instructor')
+    # bm25 weight per FTS column: code and instructor matches outrank title words
+    FTS_WEIGHTS = (1.0, 4.0, 2.0)
     
-    def __init__(self, db_path: str = "brown_courses.db"):
+    def __init__(self, db_path: str = "brown_courses.db", synchronous: Optional[str] = None,
+                 journal_mode: Optional[str] = None, read_only: bool = False,
+                 timeout: float = DEFAULT_TIMEOUT):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            synchronous: PRAGMA synchronous level (OFF, NORMAL, FULL); None keeps
+                SQLite's default (FULL)
+            journal_mode: PRAGMA journal_mode (DELETE, TRUNCATE, MEMORY, WAL, ...);
+                None keeps the file's current mode. WAL persists in the file and
+                lets readers run alongside the writer
+            read_only: Open an existing file read-only (for monitors and exports);
+                the schema isn't created or migrated
+            timeout: Busy timeout in seconds
         """
         self.db_path = db_path
+        self.synchronous = synchronous
+        self.journal_mode = journal_mode
+        self.read_only = read_only
+        self.timeout = timeout
         self.conn = None
         self.cursor = None
+        # Held while using the writer connection (self.conn and self.cursor)
+        self.lock = threading.RLock()
+        # Thread that opened the database; it reads through the writer connection
+        self._owner = threading.get_ident()
+        # Other threads' read connections (see _read_connection), closed by close()
+        self._local = threading.local()
+        self._readers = []
+        # Open write batch (see batch()): None, or rows per commit and seconds per commit
+        self._batch_size = None
+        self._batch_interval = None
+        self._pending = 0
+        self._batch_started = 0.0
+        # Nested batch() blocks open, across all threads
+        self._batch_depth = 0
         self._connect()
-        self._create_tables()
+        if not read_only:
+            self._create_tables()
+        self._select = select_columns(self.conn)
+        # Column name -> select expression ("NULL AS term" on an unmigrated file)
+        self._column_sql = dict(zip(FIELDS, self._select.split(", ")))
+        self._search_select = select_columns(self.conn, table="c")
+        self.has_fts = self._table_exists('courses_fts')
     
     def _connect(self):
         """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            self.conn = connect_read_only(self.db_path, self.timeout, check_same_thread=False)
+            self.cursor = self.conn.cursor()
+            return
+        # Shared by every thread's writes, serialized by self.lock
+        self.conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
         self.cursor = self.conn.cursor()
+        # INSERT OR REPLACE only fires the delete triggers (which keep courses_fts
+        # in sync) for the rows it replaces when recursive triggers are on
+        self.cursor.execute("PRAGMA recursive_triggers = ON")
+        if self.journal_mode:
+            self.cursor.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous:
+            self.cursor.execute(f"PRAGMA synchronous = {self.synchronous}")
+    
+    def _read_connection(self) -> sqlite3.Connection:
+        """
+        Connection for reads on the calling thread.
+        
+        The thread that opened the database reads through the writer
+        connection, so it sees rows its open batch hasn't committed yet.
+        Any other thread gets its own read-only connection, opened on first
+        use and closed when the thread exits, which sees committed rows only. An in-memory database has no
+        file to share, so every thread reads through the writer connection.
+        """
+        if threading.get_ident() == self._owner or self.db_path == ":memory:":
+            return self.conn
+        handle = getattr(self._local, 'reader', None)
+        if handle is None:
+            handle = _ReaderHandle(connect_read_only(self.db_path, self.timeout, check_same_thread=False))
+            with self.lock:
+                self._readers.append(handle.conn)
+            # A thread's local storage is dropped when it exits, and its connection is closed with it
+            weakref.finalize(handle, _close_reader, handle.conn, self._readers, self.lock)
+            self._local.reader = handle
+        return handle.conn
+    
+    def _lock_for(self, conn: sqlite3.Connection):
+        """The writer lock for the writer connection, a no-op for a thread's own."""
+        return self.lock if conn is self.conn else nullcontext()
+    
+    @contextmanager
+    def _reading(self):
+        """
+        Cursor for one read on the calling thread (see _read_connection).
+        
+        Reads through the writer connection hold the lock, so they can't
+        interleave with another thread's write on the shared cursor.
+        """
+        conn = self._read_connection()
+        with self._lock_for(conn):
+            yield self.cursor if conn is self.conn else conn.cursor()
     
     def _create_tables(self):
         """Create database tables if they don't exist."""
@@ -44,46 +234,351 @@ class CourseDatabase:
                 section TEXT,
                 crn TEXT UNIQUE,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                term TEXT,
                 UNIQUE(course_code, section)
             )
         """)
+        self._migrate_columns()
+        self._create_meetings()
+        self._create_indexes()
+        self._create_fts()
         self.conn.commit()
     
-    def insert_course(self, course_data: Dict) -> bool:
+    def _migrate_columns(self):
+        """Add columns introduced after a database file was first created."""
+        self.cursor.execute("PRAGMA table_info(courses)")
+        existing = {row[1] for row in self.cursor.fetchall()}
+        for column, column_type in self.ADDED_COLUMNS:
+            if column not in existing:
+                self.cursor.execute(f"ALTER TABLE courses ADD COLUMN {column} {column_type}")
+    
+    def _create_meetings(self):
+        """
+        Create the meetings table: course_times parsed into one row per day.
+        
+        Rows are written whenever a course is inserted or its times change
+        (see _write_meetings) and deleted with the course by a trigger. A
+        file created before the table existed is filled in when it is added.
+        """
+        if self._table_exists('meetings'):
+            return
+        self.cursor.execute("""
+            CREATE TABLE meetings (
+                course_id INTEGER NOT NULL,
+                pattern INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                start_minute INTEGER NOT NULL,
+                end_minute INTEGER NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_course_delete AFTER DELETE ON courses BEGIN
+                DELETE FROM meetings WHERE course_id = old.id;
+            END
+        """)
+        self._write_meetings(self.conn.execute(
+            "SELECT id, course_times FROM courses WHERE course_times IS NOT NULL AND course_times != ''"
+        ).fetchall())
+    
+    def _write_meetings(self, courses):
+        """
+        Replace the meetings rows of courses.
+        
+        A course whose times can't be parsed (e.g. "10::30p") gets no
+        meetings rows; the course row itself is kept.
+        
+        Args:
+            courses: (course id, course_times) pairs
+        """
+        courses = list(courses)
+        rows = []
+        for course_id, course_times in courses:
+            try:
+                rows.extend((course_id,) + meeting for meeting in parse_meetings(course_times))
+            except ValueError as e:
+                print(f"Warning: skipping meetings of course {course_id} ({course_times!r}): {e}")
+        self.cursor.executemany("DELETE FROM meetings WHERE course_id = ?",
+                                [(course_id,) for course_id, _ in courses])
+        self.cursor.executemany(
+            "INSERT INTO meetings (course_id, pattern, day, start_minute, end_minute) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+    
+    def _create_indexes(self):
+        """Create secondary indexes missing from the database file."""
+        for name, definition in self.INDEXES:
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    
+    def _table_exists(self, name: str) -> bool:
+        """Whether a table exists in the database file."""
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    
+    def _create_fts(self):
+        """
+        Create the full-text index and the triggers that keep it in sync.
+        
+        courses_fts is an external-content FTS5 table: it indexes the
+        courses rows without storing a second copy of the text. A file
+        created before the index existed is indexed when it is added.
+        SQLite builds without FTS5 skip it, and search() falls back to LIKE.
+        """
+        if self._table_exists('courses_fts'):
+            return
+        columns = ", ".join(self.FTS_COLUMNS)
+        new_values = ", ".join(f"new.{column}" for column in self.FTS_COLUMNS)
+        old_values = ", ".join(f"old.{column}" for column in self.FTS_COLUMNS)
+        try:
+            self.cursor.execute(f"""
+                CREATE VIRTUAL TABLE courses_fts USING fts5(
+                    {columns}, content='courses', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable ({e}); search() will use LIKE")
+            return
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS courses_fts_insert AFTER INSERT ON courses BEGIN
+                INSERT INTO courses_fts(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS courses_fts_delete AFTER DELETE ON courses BEGIN
+                INSERT INTO courses_fts(courses_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS courses_fts_update AFTER UPDATE OF {columns} ON courses BEGIN
+                INSERT INTO courses_fts(courses_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO courses_fts(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """)
+        self.cursor.execute("INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')")
+    
+    def insert_course(self, course_data) -> bool:
         """
         Insert or update a course record.
         
+        The course row and its meetings are written under one savepoint, so
+        a failure leaves neither behind (even inside a batch).
+        
         Args:
-            course_data: Dictionary containing course information
+            course_data: CourseRecord or dictionary containing course information
             
         Returns:
             True if successful, False otherwise
         """
+        with self.lock:
+            saved = False
+            try:
+                record = CourseRecord.coerce(course_data)
+                self.cursor.execute("SAVEPOINT insert_course")
+                saved = True
+                self.cursor.execute(self.INSERT_SQL, self._insert_values(record, datetime.now()))
+                self._write_meetings([(self.cursor.lastrowid, record.course_times)])
+                self.cursor.execute("RELEASE insert_course")
+                self._row_written()
+                return True
+            except Exception as e:
+                print(f"Error inserting course: {e}")
+                if saved and self.conn.in_transaction:
+                    self.cursor.execute("ROLLBACK TO insert_course")
+                    self.cursor.execute("RELEASE insert_course")
+                return False
+    
+    def insert_courses(self, courses: Iterable, chunk_size: int = 1000) -> int:
+        """
+        Insert or update many course records at once.
+        
+        Rows are written with executemany in chunks of chunk_size and
+        committed together, instead of one transaction per row. Inside
+        batch() they join the open batch instead.
+        
+        SQLite's write lock is taken up front, so the rows each chunk created
+        are exactly those with ids above the previous highest id (ids only
+        grow) and their meetings can be written from them. The call runs
+        inside a savepoint, so an error undoes all of its rows (and their
+        meetings), even inside a batch, and leaves other rows alone.
+        
+        Args:
+            courses: CourseRecords or dictionaries (any iterable, consumed lazily)
+            chunk_size: Rows per executemany call
+            
+        Returns:
+            Number of rows written (0 if an error rolled the write back)
+        """
+        with self.lock:
+            written = 0
+            try:
+                if not self.conn.in_transaction:
+                    self.cursor.execute("BEGIN IMMEDIATE")
+                self.cursor.execute("SAVEPOINT insert_courses")
+                last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM courses").fetchone()[0]
+                
+                def write(chunk):
+                    nonlocal written, last_id
+                    self.cursor.executemany(self.INSERT_SQL, chunk)
+                    written += len(chunk)
+                    created = self.conn.execute("SELECT id, course_times FROM courses WHERE id > ?",
+                                                (last_id,)).fetchall()
+                    if created:
+                        self._write_meetings(created)
+                        last_id = created[-1][0]
+                
+                now = datetime.now()
+                chunk = []
+                for course_data in courses:
+                    chunk.append(self._insert_values(CourseRecord.coerce(course_data), now))
+                    if len(chunk) >= chunk_size:
+                        write(chunk)
+                        chunk = []
+                if chunk:
+                    write(chunk)
+                self.cursor.execute("RELEASE insert_courses")
+                self._row_written(written)
+                return written
+            except Exception as e:
+                print(f"Error inserting courses: {e}")
+                if self.conn.in_transaction:
+                    self.cursor.execute("ROLLBACK TO insert_courses")
+                    self.cursor.execute("RELEASE insert_courses")
+                if self._batch_size is None:
+                    self.conn.rollback()
+                return 0
+    
+    @staticmethod
+    def _insert_values(record: CourseRecord, last_updated: datetime) -> tuple:
+        """INSERT_SQL parameters for a record."""
+        return (record.course_code, record.course_name, record.department, record.course_times,
+                record.instructor, record.max_enrollment, record.seats_available, record.section,
+                record.crn, last_updated, record.term)
+    
+    @contextmanager
+    def batch(self, size: int = 500, interval: float = 1.0):
+        """
+        Group writes into larger transactions.
+        
+        Inside the block, insert_course, insert_courses and upsert_list_data
+        don't commit every row. The open transaction is committed once it
+        holds size rows or is interval seconds old (checked on each write),
+        and when the block exits. A nested batch joins the outer one.
+        
+        The batch covers writes from every thread sharing this database.
+        Batches opened on several threads join into one, committed when
+        the last of them exits.
+        
+        Args:
+            size: Rows per commit
+            interval: Maximum age in seconds of an uncommitted row (checked at
+                the next write)
+        
+        Yields:
+            This database
+        """
+        with self.lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self._batch_size, self._batch_interval = size, interval
         try:
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO courses 
-                (course_code, course_name, department, course_times, instructor, 
-                 max_enrollment, seats_available, section, crn, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                course_data.get('course_code'),
-                course_data.get('course_name'),
-                course_data.get('department'),
-                course_data.get('course_times'),
-                course_data.get('instructor'),
-                course_data.get('max_enrollment'),
-                course_data.get('seats_available'),
-                course_data.get('section'),
-                course_data.get('crn'),
-                datetime.now()
-            ))
+            yield self
+        finally:
+            with self.lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._batch_size = self._batch_interval = None
+                    self.flush()
+    
+    def execute_write(self, sql: str, params=()) -> int:
+        """
+        Run a write statement as part of this database's transactions.
+        
+        For tables kept next to courses (e.g. the detail cache). The write
+        is committed like insert_course's: right away, or with the open
+        batch.
+        
+        Args:
+            sql: INSERT, UPDATE, DELETE or CREATE statement
+            params: Statement parameters
+            
+        Returns:
+            Number of rows changed
+        """
+        with self.lock:
+            self.cursor.execute(sql, params)
+            self._row_written()
+            return self.cursor.rowcount
+    
+    def flush(self):
+        """Commit rows held by an open batch."""
+        with self.lock:
+            if self.conn:
+                self.conn.commit()
+            self._pending = 0
+    
+    def _row_written(self, count: int = 1):
+        """Commit now, or once the open batch is full or old enough."""
+        if self._batch_size is None:
             self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error inserting course: {e}")
-            return False
+            return
+        if not self._pending:
+            self._batch_started = time.monotonic()
+        self._pending += count
+        if self._pending >= self._batch_size or time.monotonic() - self._batch_started >= self._batch_interval:
+            self.flush()
     
-    def get_course_by_crn(self, crn: str) -> Optional[Dict]:
+    def upsert_list_data(self, course_data) -> bool:
+        """
+        Insert or update only the list-view fields of a course.
+        
+        Unlike insert_course, enrollment data already stored for the CRN
+        is kept, so a list-only scrape doesn't wipe hydrated details.
+        
+        Args:
+            course_data: CourseRecord or dictionary from a list-view row (must include crn)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        with self.lock:
+            try:
+                record = CourseRecord.coerce(course_data)
+                values = (
+                    record.course_code,
+                    record.course_name,
+                    record.department,
+                    record.course_times,
+                    record.instructor,
+                    record.section,
+                    datetime.now(),
+                    record.term,
+                    record.crn,
+                )
+                self.cursor.execute("""
+                    INSERT OR IGNORE INTO courses 
+                    (course_code, course_name, department, course_times, instructor, 
+                     section, last_updated, term, crn)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, values)
+                if self.cursor.rowcount == 0:
+                    self.cursor.execute("""
+                        UPDATE courses SET course_code = ?, course_name = ?, department = ?,
+                            course_times = COALESCE(NULLIF(?, ''), course_times),
+                            instructor = COALESCE(NULLIF(?, ''), instructor),
+                            section = ?, last_updated = ?, term = ?
+                        WHERE crn = ?
+                    """, values)
+                self._write_meetings(self.conn.execute(
+                    "SELECT id, course_times FROM courses WHERE crn = ?", (record.crn,)
+                ).fetchall())
+                self._row_written()
+                return True
+            except Exception as e:
+                print(f"Error upserting course: {e}")
+                return False
+    
+    def get_course_by_crn(self, crn: str) -> Optional[CourseRecord]:
         """
         Retrieve a course by CRN.
         
@@ -91,12 +586,13 @@ class CourseDatabase:
             crn: Course Reference Number
             
         Returns:
-            Course data dictionary or None
+            CourseRecord or None
         """
-        self.cursor.execute("SELECT * FROM courses WHERE crn = ?", (crn,))
-        row = self.cursor.fetchone()
+        with self._reading() as cursor:
+            cursor.execute(f"SELECT {self._select} FROM courses WHERE crn = ?", (crn,))
+            row = cursor.fetchone()
         if row:
-            return self._row_to_dict(row)
+            return CourseRecord.from_row(row)
         return None
 
     def course_exists(self, course_code: str, section: str) -> bool:
@@ -118,20 +614,268 @@ class CourseDatabase:
                 query += " AND section = ?"
                 params.append(section)
                 
-            self.cursor.execute(query, params)
-            return self.cursor.fetchone() is not None
+            with self._reading() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchone() is not None
         except:
             return False    
-    def get_all_courses(self) -> List[Dict]:
+    def get_all_courses(self) -> List[CourseRecord]:
         """
         Retrieve all courses from database.
         
         Returns:
-            List of course data dictionaries
+            List of CourseRecords (they also support dictionary-style access)
+        """
+        with self._reading() as cursor:
+            cursor.execute(f"SELECT {self._select} FROM courses ORDER BY department, course_code")
+            rows = cursor.fetchall()
+        return CourseRecord.from_rows(rows)
+    
+    def _query(self, where: str, params=(), order: bool = True) -> List[CourseRecord]:
+        """Courses matching a WHERE clause, as CourseRecords."""
+        sql = f"SELECT {self._select} FROM courses WHERE {where}"
+        if order:
+            sql += " ORDER BY department, course_code"
+        with self._reading() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return CourseRecord.from_rows(rows)
+    
+    def get_courses_by_department(self, department: str) -> List[CourseRecord]:
+        """
+        Retrieve every section in a department.
+        
+        Args:
+            department: Department code (e.g. "CSCI")
+            
+        Returns:
+            CourseRecords ordered by course code
+        """
+        return self._query("department = ?", (department,))
+    
+    def get_courses_by_instructor(self, instructor: str) -> List[CourseRecord]:
+        """
+        Retrieve every section taught by an instructor.
+        
+        Args:
+            instructor: Instructor exactly as stored (e.g. "M. Ajibade")
+            
+        Returns:
+            CourseRecords ordered by department and course code
+        """
+        return self._query("instructor = ?", (instructor,))
+    
+    def get_courses_by_crns(self, crns: Iterable[str], chunk_size: int = 500) -> List[CourseRecord]:
+        """
+        Retrieve the sections with the given CRNs.
+        
+        Args:
+            crns: CRNs to look up (unknown CRNs are skipped)
+            chunk_size: CRNs per query (keeps under SQLite's parameter limit)
+            
+        Returns:
+            CourseRecords ordered by department and course code
+        """
+        crns = list(dict.fromkeys(str(crn) for crn in crns))
+        records = []
+        for start in range(0, len(crns), chunk_size):
+            chunk = crns[start:start + chunk_size]
+            records.extend(self._query(f"crn IN ({', '.join('?' * len(chunk))})", chunk, order=False))
+        records.sort(key=lambda record: (record.department or '', record.course_code or ''))
+        return records
+    
+    def get_courses_by_number_range(self, department: str, low: int, high: int) -> List[CourseRecord]:
+        """
+        Retrieve a department's sections with course numbers in a range.
+        
+        Course codes are "<DEPT> <4-digit number>[suffix]", so the range is
+        a range of course codes within the department ("CSCI 0100" through
+        "CSCI 0199" and its suffixed variants for low=100, high=199).
+        Numbers outside 0-9999 are clamped to it.
+        
+        Args:
+            department: Department code (e.g. "CSCI")
+            low: Lowest course number, inclusive
+            high: Highest course number, inclusive
+            
+        Returns:
+            CourseRecords ordered by course code
+        """
+        low, high = max(low, 0), min(high, 9999)
+        if low > high:
+            return []
+        # "\uffff" sorts after any suffix, so "CSCI 1470A" is within high=1470
+        return self._query("department = ? AND course_code >= ? AND course_code <= ?",
+                           (department, f"{department} {low:04d}", f"{department} {high:04d}\uffff"))
+    
+    def get_open_courses(self, department: Optional[str] = None) -> List[CourseRecord]:
+        """
+        Retrieve sections with open seats.
+        
+        Args:
+            department: Only this department (None for all)
+            
+        Returns:
+            CourseRecords ordered by department and course code
         """
-        self.cursor.execute("SELECT * FROM courses ORDER BY department, course_code")
-        rows = self.cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
+        if department:
+            return self._query("department = ? AND seats_available > 0", (department,))
+        return self._query("seats_available > 0")
+    
+    def get_courses_meeting(self, day, start: str, end: str, within: bool = False) -> List[CourseRecord]:
+        """
+        Retrieve sections meeting on a day during a time window.
+        
+        Example: get_courses_meeting('T', '13:00', '15:00') finds the
+        sections with a Tuesday meeting overlapping 1-3pm.
+        
+        Args:
+            day: Day abbreviation (M, T, W, Th, F, S, Su) or index (0 = Monday)
+            start: Window start, 24-hour "HH:MM"
+            end: Window end, 24-hour "HH:MM"
+            within: Only meetings entirely inside the window (default: any overlap)
+            
+        Returns:
+            CourseRecords ordered by department and course code
+        """
+        day = DAY_INDEX[day] if isinstance(day, str) else day
+        start, end = time_to_minutes(start), time_to_minutes(end)
+        if within:
+            condition = "start_minute >= ? AND end_minute <= ?"
+            params = (day, start, end)
+        else:
+            condition = "start_minute < ? AND end_minute > ?"
+            params = (day, end, start)
+        return self._query(f"id IN (SELECT course_id FROM meetings WHERE day = ? AND {condition})", params)
+    
+    def get_meetings(self, crn: str) -> List[Dict]:
+        """
+        Parsed meetings of a section.
+        
+        Args:
+            crn: Course Reference Number
+            
+        Returns:
+            One dictionary per meeting day: pattern, day ('T'), start and end ('14:30')
+        """
+        with self._reading() as cursor:
+            cursor.execute("""
+                SELECT m.pattern, m.day, m.start_minute, m.end_minute
+                FROM courses c JOIN meetings m ON m.course_id = c.id
+                WHERE c.crn = ? ORDER BY m.pattern, m.day
+            """, (crn,))
+            rows = cursor.fetchall()
+        return [{'pattern': pattern, 'day': DAY_NAMES[day], 'start': minutes_to_time(start),
+                 'end': minutes_to_time(end)} for pattern, day, start, end in rows]
+    
+    def search(self, query: str, limit: int = 20) -> List[CourseRecord]:
+        """
+        Full-text search over course names, codes and instructors.
+        
+        Every word must match. Words match as prefixes, so partial input
+        works for search-as-you-type. Results are ranked by bm25, where code
+        and instructor matches outrank title matches.
+        
+        Args:
+            query: Words to look for (e.g. "intro comp", "csci 01", "ajib")
+            limit: Maximum number of results
+            
+        Returns:
+            Best-matching CourseRecords first
+        """
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return []
+        if not self.has_fts:
+            clauses = " AND ".join(
+                "(course_name LIKE ? OR course_code LIKE ? OR instructor LIKE ?)" for _ in terms
+            )
+            params = [f"%{term}%" for term in terms for _ in range(3)]
+            with self._reading() as cursor:
+                cursor.execute(f"SELECT {self._select} FROM courses WHERE {clauses} "
+                               f"ORDER BY department, course_code LIMIT ?", params + [limit])
+                rows = cursor.fetchall()
+            return CourseRecord.from_rows(rows)
+        
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in self.FTS_WEIGHTS)
+        with self._reading() as cursor:
+            cursor.execute(f"""
+                SELECT {self._search_select} FROM courses_fts
+                JOIN courses c ON c.id = courses_fts.rowid
+                WHERE courses_fts MATCH ?
+                ORDER BY bm25(courses_fts, {weights}), c.course_code
+                LIMIT ?
+            """, (match, limit))
+            rows = cursor.fetchall()
+        return CourseRecord.from_rows(rows)
+    
+    def iter_batches(self, batch_size: int = 1000, columns: Optional[Sequence[str]] = None,
+                     order_by: Optional[Sequence[str]] = None) -> Iterator[list]:
+        """
+        Stream the courses table in batches.
+        
+        Rows are fetched batch_size at a time, so memory stays flat however
+        large the table is. Each stream reads through its own read-only
+        connection in one statement, so it sees the table as committed when
+        it started: rows an open batch hasn't committed yet are left out,
+        and rows written during the stream aren't seen. In WAL mode this
+        database can be written while a stream is open; in other journal
+        modes commits wait (up to the busy timeout) until the stream ends.
+        An in-memory database has no file to open again, so its streams
+        read through the writer connection and it mustn't be written while
+        one is open.
+        
+        Args:
+            batch_size: Rows per batch
+            columns: Columns to select; batches then hold tuples in this
+                order. None selects every column as CourseRecords
+            order_by: Columns to sort by (None: table order, no sort).
+                ("department", "course_code") follows an index
+            
+        Yields:
+            Lists of up to batch_size CourseRecords or tuples
+            
+        Raises:
+            ValueError: If a column name isn't a courses column
+        """
+        for column in list(columns or ()) + list(order_by or ()):
+            if column not in FIELDS:
+                raise ValueError(f"Unknown column {column!r}; use one of {FIELDS}")
+        select = ", ".join(self._column_sql[column] for column in columns) if columns else self._select
+        sql = f"SELECT {select} FROM courses"
+        if order_by:
+            sql += f" ORDER BY {', '.join(order_by)}"
+        
+        if self.db_path == ":memory:":
+            conn = self.conn
+        else:
+            conn = connect_read_only(self.db_path, self.timeout)
+        cursor = conn.cursor()
+        try:
+            with self._lock_for(conn):
+                cursor.execute(sql)
+            while True:
+                with self._lock_for(conn):
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows if columns else CourseRecord.from_rows(rows)
+        finally:
+            cursor.close()
+            if conn is not self.conn:
+                conn.close()
+    
+    def iter_courses(self, batch_size: int = 1000, columns: Optional[Sequence[str]] = None,
+                     order_by: Optional[Sequence[str]] = None) -> Iterator:
+        """
+        Stream the courses table one row at a time (see iter_batches).
+        
+        Yields:
+            CourseRecords, or tuples of the requested columns
+        """
+        for batch in self.iter_batches(batch_size, columns, order_by):
+            yield from batch
     
     def get_course_count(self) -> int:
         """
@@ -140,20 +884,45 @@ class CourseDatabase:
         Returns:
             Number of courses
         """
-        self.cursor.execute("SELECT COUNT(*) FROM courses")
-        return self.cursor.fetchone()[0]
+        with self._reading() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM courses")
+            return cursor.fetchone()[0]
     
-    def _row_to_dict(self, row) -> Dict:
-        """Convert database row to dictionary."""
-        columns = ['id', 'course_code', 'course_name', 'department', 'course_times',
-                   'instructor', 'max_enrollment', 'seats_available', 'section', 
-                   'crn', 'last_updated']
-        return dict(zip(columns, row))
+    @contextmanager
+    def snapshot(self):
+        """
+        Run several reads against one consistent state of the database.
+        
+        Commits made by other connections during the block aren't seen.
+        Meant for read-only connections; on a connection that already has a
+        transaction open (e.g. inside batch()) the block just joins it. On
+        the thread that opened a writable database, other threads' writes
+        wait until the block exits.
+        
+        Yields:
+            This database
+        """
+        conn = self._read_connection()
+        with self._lock_for(conn):
+            if conn.in_transaction:
+                yield self
+                return
+            conn.execute("BEGIN")
+            try:
+                yield self
+            finally:
+                conn.rollback()
     
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close database connections (committing rows held by an open batch)."""
+        with self.lock:
+            if self.conn:
+                if self._pending:
+                    self.flush()
+                self.conn.close()
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
     
     def __enter__(self):
         """Context manager entry."""
@@ -0,0 +1,182 @@
+"""
+TTL cache for lazily hydrated course details.
+
+A list-only scrape (`scrape_course_list(list_only=True)`) stores each row
+without clicking into it. Detail fields (enrollment, and times/instructor for
+courses whose list row lacks them) are fetched later, only for the courses
+an export or query actually needs, and recorded in a `course_details` table
+keyed by CRN and term together with their fetch time. Entries younger than
+the TTL are served from the cache; cold misses are fetched in bulk, one
+department search at a time where several CRNs share a department.
+"""
+
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from database import CourseDatabase
+
+DETAIL_FIELDS = ('course_times', 'instructor', 'section', 'max_enrollment', 'seats_available')
+
+# A department with at least this many misses is fetched with one department search
+DEPARTMENT_BATCH_MIN = 3
+
+
+class DetailCache:
+    """Detail data per (CRN, term) with a time-to-live."""
+
+    def __init__(self, db: CourseDatabase, ttl: float = 6 * 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            db: Open course database (the cache table lives next to courses)
+            ttl: Seconds a fetched entry stays fresh
+            clock: Time source (seconds)
+        """
+        self.db = db
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the cache table if it doesn't exist."""
+        self.db.execute_write("""
+            CREATE TABLE IF NOT EXISTS course_details (
+                crn TEXT NOT NULL,
+                term TEXT NOT NULL DEFAULT '',
+                fetched_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (crn, term)
+            )
+        """)
+
+    def get(self, crn: str, term: Optional[str] = None) -> Optional[Dict]:
+        """
+        Return cached detail data if it is still fresh.
+
+        Args:
+            crn: Course Reference Number
+            term: Term id (data-srcdb), if known
+
+        Returns:
+            Detail dictionary (with fetched_at), or None on a miss
+        """
+        # The writer connection sees entries put() on other threads right away
+        with self.db.lock:
+            self.db.cursor.execute(
+                "SELECT fetched_at, data FROM course_details WHERE crn = ? AND term = ?",
+                (crn, term or '')
+            )
+            row = self.db.cursor.fetchone()
+        if row and self.clock() - row[0] < self.ttl:
+            self.hits += 1
+            return dict(json.loads(row[1]), fetched_at=row[0])
+        self.misses += 1
+        return None
+
+    def put(self, crn: str, term: Optional[str], course_data: Dict):
+        """
+        Record freshly fetched detail data.
+
+        Args:
+            crn: Course Reference Number
+            term: Term id (data-srcdb), if known
+            course_data: Scraped course data; only detail fields are cached
+        """
+        data = {field: course_data.get(field) for field in DETAIL_FIELDS}
+        self.db.execute_write(
+            "INSERT OR REPLACE INTO course_details (crn, term, fetched_at, data) VALUES (?, ?, ?, ?)",
+            (crn, term or '', self.clock(), json.dumps(data))
+        )
+
+    def hydrate(self, courses: Iterable[Dict], scraper) -> Dict[Tuple[str, str], Dict]:
+        """
+        Make sure every course has fresh detail data, fetching misses in bulk.
+
+        Fetched rows are also written to the courses table by the scraper.
+        The scraper's browser is only started if something has to be fetched.
+
+        Args:
+            courses: Course rows (need crn; term and department are used if present)
+            scraper: BrownCourseScraper
+
+        Returns:
+            Mapping of (crn, term) to detail data for every course that could be hydrated
+        """
+        results = {}
+        misses_by_department = defaultdict(list)
+        for course in courses:
+            crn = course.get('crn')
+            if not crn:
+                continue
+            term = course.get('term') or ''
+            cached = self.get(crn, term)
+            if cached is not None:
+                results[(crn, term)] = cached
+            else:
+                misses_by_department[course.get('department') or ''].append((crn, term))
+
+        total_misses = sum(len(keys) for keys in misses_by_department.values())
+        if not total_misses:
+            return results
+        print(f"Hydrating {total_misses} courses ({len(results)} cached)...")
+        if scraper.driver is None:
+            scraper.setup_driver()
+
+        for department, keys in misses_by_department.items():
+            wanted = dict(keys)
+            if department and len(keys) >= DEPARTMENT_BATCH_MIN:
+                # One search returns every section in the department
+                fetched = scraper.lookup(department)
+            else:
+                fetched = []
+                for crn, _ in keys:
+                    course_data = scraper.refresh_course(crn)
+                    if course_data:
+                        fetched.append(course_data)
+
+            for course_data in fetched:
+                crn = course_data.get('crn')
+                if not crn:
+                    continue
+                term = course_data.get('term') or wanted.get(crn, '')
+                self.put(crn, term, course_data)
+                if crn in wanted:
+                    # Rows stored before the term was known are looked up without it
+                    if wanted[crn] != term:
+                        self.put(crn, wanted[crn], course_data)
+                    results[(crn, wanted[crn])] = {field: course_data.get(field) for field in DETAIL_FIELDS}
+
+        return results
+
+    def needs_detail(self) -> List[Dict]:
+        """
+        Courses whose detail data is missing or older than the TTL.
+
+        A row needs detail if it lacks enrollment, times or instructor (e.g.
+        stored by a list-only scrape), or if it has no cache entry younger
+        than the TTL. So seat counts are re-fetched once they expire, not
+        only the first time.
+
+        Returns:
+            Course rows (crn, term, department) to hydrate
+        """
+        with self.db.lock:
+            self.db.cursor.execute("""
+                SELECT c.crn, c.term, c.department FROM courses c
+                LEFT JOIN course_details d ON d.crn = c.crn AND d.term = COALESCE(c.term, '')
+                WHERE c.crn IS NOT NULL AND (
+                    d.fetched_at IS NULL OR d.fetched_at <= ?
+                    OR c.max_enrollment IS NULL
+                    OR c.course_times IS NULL OR c.course_times = ''
+                    OR c.instructor IS NULL OR c.instructor = ''
+                )
+            """, (self.clock() - self.ttl,))
+            rows = self.db.cursor.fetchall()
+        return [{'crn': crn, 'term': term, 'department': department}
+                for crn, term, department in rows]
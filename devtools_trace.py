@@ -0,0 +1,290 @@
+"""
+DevTools performance traces for slow detail clicks.
+
+With the option on, chromedriver records Chrome trace events and network
+events into its "performance" log for the whole session. The log is drained
+before every detail click. If the click's latency (click until the panel
+shows the CRN) crosses the threshold, the events are saved as a trace file
+named after the CRN. The file opens in the DevTools Performance panel or
+chrome://tracing. Otherwise they are thrown away.
+
+Each saved trace is also summarized by category. A nested event only counts
+its self time, so nothing is double counted:
+- network: time with at least one request in flight
+- scripting, layout, paint: renderer main-thread time per category
+- other: anything else
+Totals across the run show where the slowest clicks spend their time.
+"""
+
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+TRACE_CATEGORIES = ",".join([
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+])
+
+# Trace event name -> summary category (self time of everything else is "other")
+EVENT_CATEGORIES = {
+    'scripting': {
+        'EvaluateScript', 'FunctionCall', 'EventDispatch', 'TimerFire', 'FireAnimationFrame',
+        'FireIdleCallback', 'XHRReadyStateChange', 'XHRLoad', 'RunMicrotasks', 'V8.Execute',
+        'v8.compile', 'v8.run', 'V8.CompileCode', 'MajorGC', 'MinorGC', 'ParseHTML',
+    },
+    'layout': {
+        'Layout', 'UpdateLayoutTree', 'RecalculateStyles', 'UpdateLayerTree', 'HitTest',
+        'ScheduleStyleRecalculation', 'InvalidateLayout', 'PrePaint',
+    },
+    'paint': {
+        'Paint', 'PaintImage', 'CompositeLayers', 'RasterTask', 'Decode Image', 'ImageDecodeTask',
+        'Layerize', 'Commit', 'UpdateLayer',
+    },
+}
+_CATEGORY_BY_EVENT = {name: category for category, names in EVENT_CATEGORIES.items() for name in names}
+
+CATEGORIES = ('network', 'scripting', 'layout', 'paint', 'other')
+
+
+def enable_performance_logging(options):
+    """
+    Turn on chromedriver's performance log with trace categories.
+
+    Args:
+        options: selenium ChromeOptions, before the driver is created
+    """
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {
+        'enableNetwork': True,
+        'enablePage': False,
+        'traceCategories': TRACE_CATEGORIES,
+    })
+
+
+def _self_times(trace_events: List[Dict]) -> Dict[str, float]:
+    """
+    Self time (ms) per category of complete ("X") and begin/end events.
+
+    Only renderer main threads count when the trace names its threads.
+    Events on one thread nest; each event's time minus its children's is
+    attributed to its own category.
+    """
+    main_threads = {
+        (event.get('pid'), event.get('tid')) for event in trace_events
+        if event.get('ph') == 'M' and event.get('name') == 'thread_name'
+        and event.get('args', {}).get('name') == 'CrRendererMain'
+    }
+    spans = defaultdict(list)   # (pid, tid) -> [(start_us, end_us, name)]
+    open_events = {}
+    for event in trace_events:
+        phase = event.get('ph')
+        thread = (event.get('pid'), event.get('tid'))
+        if main_threads and thread not in main_threads:
+            continue
+        if phase == 'X' and 'dur' in event:
+            spans[thread].append((event['ts'], event['ts'] + event['dur'], event.get('name', '')))
+        elif phase == 'B':
+            open_events.setdefault(thread, []).append(event)
+        elif phase == 'E' and open_events.get(thread):
+            begin = open_events[thread].pop()
+            spans[thread].append((begin['ts'], event['ts'], begin.get('name', '')))
+
+    totals = defaultdict(float)
+    for thread_spans in spans.values():
+        # Parents first: earlier start, then longer duration
+        thread_spans.sort(key=lambda span: (span[0], -(span[1] - span[0])))
+        stack = []   # [end_us, category, child_us, duration_us]
+
+        def close(entry):
+            totals[entry[1]] += entry[3] - entry[2]
+
+        for start, end, name in thread_spans:
+            while stack and stack[-1][0] <= start:
+                close(stack.pop())
+            duration = end - start
+            if stack:
+                stack[-1][2] += duration
+            stack.append([end, _CATEGORY_BY_EVENT.get(name, 'other'), 0.0, duration])
+        while stack:
+            close(stack.pop())
+
+    return {category: round(max(us, 0.0) / 1000, 2) for category, us in totals.items()}
+
+
+def _network_time(network_messages: List[Dict]) -> float:
+    """Milliseconds during which at least one request was in flight."""
+    starts, intervals = {}, []
+    for message in network_messages:
+        method = message.get('method')
+        params = message.get('params', {})
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            starts.setdefault(request_id, params.get('timestamp'))
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed') and request_id in starts:
+            start = starts.pop(request_id)
+            if start is not None and params.get('timestamp') is not None:
+                intervals.append((start, params['timestamp']))
+
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return round(total * 1000, 2)
+
+
+def summarize(trace_events: List[Dict], network_messages: List[Dict]) -> Dict[str, float]:
+    """
+    Time per category for one trace.
+
+    Args:
+        trace_events: Chrome trace events
+        network_messages: DevTools Network.* messages
+
+    Returns:
+        Milliseconds per category (network, scripting, layout, paint, other)
+    """
+    summary = dict.fromkeys(CATEGORIES, 0.0)
+    summary.update(_self_times(trace_events))
+    summary['network'] = _network_time(network_messages)
+    return summary
+
+
+class SlowClickTracer:
+    """Keeps DevTools traces of detail clicks slower than a threshold."""
+
+    def __init__(self, output_dir: str = ".cache/traces", threshold: float = 3.0,
+                 percentile: Optional[float] = None, warmup: int = 20):
+        """
+        Initialize the tracer.
+
+        Args:
+            output_dir: Directory for the trace files and summary
+            threshold: Click latency (seconds) above which the trace is kept
+            percentile: Keep clicks slower than this percentile (e.g. 95) of the
+                latencies seen so far instead of a fixed threshold
+            warmup: Clicks to observe before a percentile threshold applies
+                (the fixed threshold is used until then)
+        """
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.percentile = percentile
+        self.warmup = warmup
+        self.latencies: List[float] = []
+        self.clicks = 0
+        self.traces: List[Dict] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def current_threshold(self) -> float:
+        """Latency (seconds) a click must reach for its trace to be kept."""
+        if self.percentile is None or len(self.latencies) < self.warmup:
+            return self.threshold
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def begin(self, driver):
+        """Drain the performance log so the next read only covers the click."""
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+
+    def end(self, driver, crn: Optional[str], latency: float) -> Optional[Dict]:
+        """
+        Read the click's events and keep them if the click was slow.
+
+        Args:
+            driver: WebDriver created with enable_performance_logging
+            crn: CRN of the clicked section (names the trace file)
+            latency: Click-to-render time in seconds
+
+        Returns:
+            The trace's summary if it was saved, else None
+        """
+        self.clicks += 1
+        threshold = self.current_threshold()
+        self.latencies.append(latency)
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+        if latency < threshold:
+            return None
+
+        trace_events, network_messages = [], []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method', '')
+            if method == 'Tracing.dataCollected':
+                trace_events.extend(message.get('params', {}).get('value', []))
+            elif method.startswith('Network.'):
+                network_messages.append(message)
+
+        summary = summarize(trace_events, network_messages)
+        safe_crn = re.sub(r'[^0-9A-Za-z_-]', '_', str(crn or 'unknown'))
+        path = os.path.join(self.output_dir, f"{safe_crn}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': trace_events,
+                'metadata': {'crn': crn, 'latency_ms': round(latency * 1000, 1), 'summary': summary},
+            }, f)
+
+        record = {'crn': crn, 'latency_ms': round(latency * 1000, 1), 'path': path, 'summary': summary}
+        self.traces.append(record)
+        return record
+
+    def report(self) -> Dict:
+        """
+        Totals per category across every saved trace.
+
+        Returns:
+            Clicks seen, traces saved, per-category totals and each trace
+        """
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for record in self.traces:
+            for category, ms in record['summary'].items():
+                totals[category] = round(totals.get(category, 0.0) + ms, 2)
+        return {
+            'threshold_ms': round(self.current_threshold() * 1000),
+            'percentile': self.percentile,
+            'clicks': self.clicks,
+            'slow_clicks': len(self.traces),
+            'category_ms': totals,
+            'traces': sorted(self.traces, key=lambda record: -record['latency_ms']),
+        }
+
+    def write_summary(self) -> str:
+        """
+        Write summary.json to the output directory and print the totals.
+
+        Returns:
+            Path of the summary file
+        """
+        report = self.report()
+        path = os.path.join(self.output_dir, "summary.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"{report['slow_clicks']} of {report['clicks']} clicks took over "
+              f"{report['threshold_ms'] / 1000:.1f}s; traces in {self.output_dir}")
+        total = sum(report['category_ms'].values())
+        for category in CATEGORIES:
+            ms = report['category_ms'].get(category, 0.0)
+            share = ms / total if total else 0.0
+            print(f"  {category:<10} {ms:10.1f} ms  {share:5.1%}")
+        return path
@@ -0,0 +1,276 @@
+"""
+WebDriver command-level tracing.
+
+Wraps the Selenium driver and every element it returns in thin proxies that
+count and time each WebDriver command (find_element, text, click,
+execute_script, ...). Commands are attributed to the current course (CRN or
+list index) and scrape phase, so the report shows how many round trips a
+course costs and which commands dominate. Only active when the scraper is
+given a tracer (`cli.py scrape --trace-commands PREFIX`).
+"""
+
+import heapq
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.remote.webelement import WebElement
+
+# Driver methods that send a command to the browser
+DRIVER_METHODS = {
+    'get', 'refresh', 'back', 'forward', 'find_element', 'find_elements',
+    'execute_script', 'execute_async_script', 'execute_cdp_cmd', 'maximize_window',
+    'get_screenshot_as_png', 'get_log',
+}
+# Driver properties whose getter sends a command
+DRIVER_PROPERTIES = {'page_source', 'current_url', 'title', 'window_handles'}
+ELEMENT_METHODS = {
+    'click', 'send_keys', 'clear', 'submit', 'find_element', 'find_elements',
+    'get_attribute', 'get_dom_attribute', 'get_property', 'is_displayed',
+    'is_enabled', 'is_selected', 'value_of_css_property',
+}
+ELEMENT_PROPERTIES = {'text', 'tag_name', 'location', 'size', 'rect', 'location_once_scrolled_into_view'}
+
+
+class _CommandStats:
+    """Count and time for one group of commands."""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 1),
+            'mean_ms': round(self.total * 1000 / self.count, 2) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+class CommandTracer:
+    """Aggregates WebDriver command timings per phase, command and course."""
+
+    def __init__(self, top_n: int = 25, course_key: Callable[[], Optional[str]] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            top_n: Number of slowest commands and most expensive courses in reports
+            course_key: Returns the current course (CRN or list index), or None
+        """
+        self.top_n = top_n
+        self.course_key = course_key or (lambda: None)
+        self.by_phase_command = defaultdict(_CommandStats)   # (phase, command) -> stats
+        self.by_course = defaultdict(_CommandStats)          # course -> stats
+        self.slowest = []                                    # min-heap of (seconds, seq, details)
+        self._phases: List[str] = []
+        self._seq = 0
+        self._start_time = time.perf_counter()
+
+    def push_phase(self, name: str):
+        """Enter a scrape phase (nested phases attribute to the innermost)."""
+        self._phases.append(name)
+
+    def pop_phase(self):
+        """Leave the current scrape phase."""
+        if self._phases:
+            self._phases.pop()
+
+    def record(self, command: str, seconds: float):
+        """
+        Record one command.
+
+        Args:
+            command: Command name, prefixed with "driver." or "element."
+            seconds: Time the command took
+        """
+        phase = self._phases[-1] if self._phases else 'other'
+        course = self.course_key()
+        self.by_phase_command[(phase, command)].add(seconds)
+        if course is not None:
+            self.by_course[str(course)].add(seconds)
+
+        self._seq += 1
+        entry = (seconds, self._seq, {'command': command, 'phase': phase, 'course': course})
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def wrap(self, driver) -> 'TracingDriver':
+        """Wrap a WebDriver so its commands are recorded."""
+        return TracingDriver(driver, self)
+
+    def report(self) -> Dict:
+        """
+        Build the report as a dictionary.
+
+        Returns:
+            Totals, per-phase and per-command aggregates, per-course averages
+            and the top offenders
+        """
+        phases = defaultdict(dict)
+        commands = defaultdict(_CommandStats)
+        for (phase, command), stats in self.by_phase_command.items():
+            phases[phase][command] = stats.as_dict()
+            merged = commands[command]
+            merged.count += stats.count
+            merged.total += stats.total
+            merged.max = max(merged.max, stats.max)
+
+        total_count = sum(stats.count for stats in commands.values())
+        total_time = sum(stats.total for stats in commands.values())
+        courses = sorted(self.by_course.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            'wall_time': round(time.perf_counter() - self._start_time, 3),
+            'commands': total_count,
+            'command_time_ms': round(total_time * 1000, 1),
+            'courses': len(self.by_course),
+            'commands_per_course': round(
+                sum(stats.count for stats in self.by_course.values()) / len(self.by_course), 1
+            ) if self.by_course else None,
+            'ms_per_course': round(
+                sum(stats.total for stats in self.by_course.values()) * 1000 / len(self.by_course), 1
+            ) if self.by_course else None,
+            'by_command': {command: stats.as_dict() for command, stats in commands.items()},
+            'by_phase': dict(phases),
+            'top_courses': [dict(course=course, **stats.as_dict()) for course, stats in courses[:self.top_n]],
+            'slowest_commands': [
+                dict(details, ms=round(seconds * 1000, 1))
+                for seconds, _, details in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def write_report(self, prefix: str):
+        """
+        Write <prefix>.json and a readable <prefix>.txt.
+
+        Args:
+            prefix: Output path without extension
+        """
+        report = self.report()
+        with open(f"{prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True, default=str)
+
+        with open(f"{prefix}.txt", 'w', encoding='utf-8') as f:
+            f.write(f"{report['commands']} WebDriver commands, {report['command_time_ms'] / 1000:.2f}s "
+                    f"of {report['wall_time']:.2f}s wall time\n")
+            if report['courses']:
+                f.write(f"{report['courses']} courses: {report['commands_per_course']} commands, "
+                        f"{report['ms_per_course']:.0f} ms per course\n")
+
+            f.write("\n=== By command ===\n")
+            for command, stats in sorted(report['by_command'].items(), key=lambda item: -item[1]['total_ms']):
+                f.write(f"  {stats['total_ms']:10.1f} ms {stats['count']:>8} x {stats['mean_ms']:8.2f} ms  {command}\n")
+
+            for phase, phase_commands in sorted(report['by_phase'].items()):
+                total_ms = sum(stats['total_ms'] for stats in phase_commands.values())
+                f.write(f"\n=== Phase {phase}: {total_ms:.1f} ms ===\n")
+                for command, stats in sorted(phase_commands.items(), key=lambda item: -item[1]['total_ms']):
+                    f.write(f"  {stats['total_ms']:10.1f} ms {stats['count']:>8} x {stats['mean_ms']:8.2f} ms  {command}\n")
+
+            f.write("\n=== Most expensive courses ===\n")
+            for row in report['top_courses']:
+                f.write(f"  {row['total_ms']:10.1f} ms {row['count']:>6} commands  {row['course']}\n")
+
+            f.write("\n=== Slowest commands ===\n")
+            for row in report['slowest_commands']:
+                f.write(f"  {row['ms']:10.1f} ms  {row['command']:<28} {row['phase']:<16} {row['course']}\n")
+
+        print(f"Command trace written to {prefix}.json and {prefix}.txt")
+
+
+def _unwrap(value):
+    """Replace tracing proxies in command arguments with the real objects."""
+    if isinstance(value, TracingElement):
+        return value._element
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+class _TracingProxy:
+    """Shared attribute forwarding for the driver and element proxies."""
+
+    _methods = set()
+    _properties = set()
+    _prefix = ''
+
+    def __init__(self, target, tracer: CommandTracer):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_tracer', tracer)
+
+    def _wrap_result(self, result):
+        if isinstance(result, WebElement):
+            return TracingElement(result, self._tracer)
+        if isinstance(result, list):
+            return [TracingElement(item, self._tracer) if isinstance(item, WebElement) else item
+                    for item in result]
+        return result
+
+    def __getattr__(self, name):
+        target = self._target
+        command = f"{self._prefix}.{name}"
+        if name in self._properties:
+            start = time.perf_counter()
+            try:
+                return self._wrap_result(getattr(target, name))
+            finally:
+                self._tracer.record(command, time.perf_counter() - start)
+
+        attribute = getattr(target, name)
+        if name not in self._methods or not callable(attribute):
+            return attribute
+
+        tracer = self._tracer
+
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return self._wrap_result(attribute(*_unwrap(args), **_unwrap(kwargs)))
+            finally:
+                tracer.record(command, time.perf_counter() - start)
+
+        return traced
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+
+class TracingDriver(_TracingProxy):
+    """WebDriver proxy recording every browser command."""
+
+    _methods = DRIVER_METHODS
+    _properties = DRIVER_PROPERTIES
+    _prefix = 'driver'
+
+
+class TracingElement(_TracingProxy):
+    """WebElement proxy recording every browser command."""
+
+    _methods = ELEMENT_METHODS
+    _properties = ELEMENT_PROPERTIES
+    _prefix = 'element'
+
+    @property
+    def _element(self):
+        return self._target
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
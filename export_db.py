@@ -1,30 +1,55 @@
 """
 Export database to CSV for easy viewing.
 """
-import sqlite3
 import csv
+from course_record import FIELDS
 from database import CourseDatabase
 
-def main():
-    print("Exporting database to brown_courses.csv...")
+
+def export_csv(db_path: str = "brown_courses.db", output_path: str = "brown_courses.csv",
+               batch_size: int = 1000) -> int:
+    """
+    Export every course in the database to a CSV file.
     
-    db = CourseDatabase()
-    courses = db.get_all_courses()
+    Rows are streamed from the database in batches and written as they
+    arrive, so memory use doesn't grow with the table.
     
-    if not courses:
-        print("No courses found in database.")
-        return
-
-    # Get headers from first dictionary
-    headers = list(courses[0].keys())
+    Args:
+        db_path: Path to SQLite database file
+        output_path: CSV file to write
+        batch_size: Rows read from the database at a time
+        
+    Returns:
+        Number of courses exported
+    """
+    print(f"Exporting database to {output_path}...")
     
-    with open('brown_courses.csv', 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(courses)
+    db = CourseDatabase(db_path, read_only=True)
+    try:
+        batches = db.iter_batches(batch_size, columns=FIELDS, order_by=('department', 'course_code'))
+        first = next(batches, None)
+        if not first:
+            print("No courses found in database.")
+            return 0
         
-    print(f"Successfully exported {len(courses)} courses to brown_courses.csv")
-    print("You can now open 'brown_courses.csv' in Excel or any text editor.")
+        count = 0
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for batch in ([first], batches):
+                for rows in batch:
+                    writer.writerows(rows)
+                    count += len(rows)
+    finally:
+        db.close()
+        
+    print(f"Successfully exported {count} courses to {output_path}")
+    return count
+
+
+def main():
+    if export_csv():
+        print("You can now open 'brown_courses.csv' in Excel or any text editor.")
 
 if __name__ == "__main__":
     main()
@@ -3,191 +3,148 @@ Export course schedule data from SQLite database to JSON format.
 Parses course times and calculates current enrollment.
 """
 
-import sqlite3
+import argparse
 import json
-import re
-from typing import List, Dict, Optional, Tuple
+from contextlib import nullcontext
+from itertools import groupby
+from typing import Dict, Optional, Tuple
 
-
-def parse_days(day_string: str) -> List[str]:
-    """
-    Parse day abbreviations into individual days.
-    
-    Examples:
-        'MWF' -> ['M', 'W', 'F']
-        'TTh' -> ['T', 'Th']
-        'M' -> ['M']
-    """
-    days = []
-    i = 0
-    while i < len(day_string):
-        # Check for 'Th' first (two characters)
-        if i < len(day_string) - 1 and day_string[i:i+2] == 'Th':
-            days.append('Th')
-            i += 2
-        else:
-            # Single character day
-            days.append(day_string[i])
-            i += 1
-    return days
+# The time parsers live with the record type; re-exported for existing imports
+from course_record import (DAY_NAMES, FIELDS, CourseRecord, minutes_to_time, parse_course_times,
+                           parse_days, parse_time)
+from database import connect_read_only, select_columns
 
 
-def parse_time(time_str: str) -> Optional[str]:
+def hydrate_details(db_path: str, ttl: float) -> Dict[Tuple[str, str], Dict]:
     """
-    Parse time string to 24-hour format.
-    
-    Examples:
-        '2:30p' -> '14:30'
-        '12-12:50p' -> '12:00'
-        '9a' -> '09:00'
-        '10:30a' -> '10:30'
-    """
-    if not time_str:
-        return None
-    
-    # Remove spaces
-    time_str = time_str.strip()
-    
-    # Check if it ends with 'a' or 'p'
-    is_pm = time_str.endswith('p')
-    is_am = time_str.endswith('a')
+    Fetch detail data (enrollment, times) that is missing or older than ttl.
     
-    if not (is_pm or is_am):
-        return None
+    Uses the detail TTL cache, so repeat exports only fetch what expired.
     
-    # Remove the 'a' or 'p'
-    time_str = time_str[:-1]
-    
-    # Split on ':' to get hours and minutes
-    if ':' in time_str:
-        parts = time_str.split(':')
-        hours = int(parts[0])
-        minutes = int(parts[1])
-    else:
-        hours = int(time_str)
-        minutes = 0
-    
-    # Convert to 24-hour format
-    if is_pm and hours != 12:
-        hours += 12
-    elif is_am and hours == 12:
-        hours = 0
-    
-    return f"{hours:02d}:{minutes:02d}"
+    Args:
+        db_path: Path to SQLite database file
+        ttl: Seconds a fetched detail stays fresh
+        
+    Returns:
+        Fresh detail fields per (crn, term), cached or just fetched
+    """
+    from detail_cache import DetailCache
+    from scraper import BrownCourseScraper
+    
+    scraper = BrownCourseScraper(headless=True, db_path=db_path)
+    try:
+        cache = DetailCache(scraper.db, ttl=ttl)
+        details = cache.hydrate(cache.needs_detail(), scraper)
+        print(f"Detail cache: {cache.hits} hits, {cache.misses} misses")
+        return details
+    finally:
+        scraper.cleanup()
 
 
-def parse_course_times(course_times: str) -> Optional[Dict]:
+def apply_details(record: CourseRecord, details: Optional[Dict]) -> bool:
     """
-    Parse course time string into structured data.
+    Overlay hydrated detail fields onto a record.
     
-    Examples:
-        'TTh 2:30-3:50p' -> {
-            'days': ['T', 'Th'],
-            'start_time': '14:30',
-            'end_time': '15:50'
-        }
-        'MWF 12-12:50p' -> {
-            'days': ['M', 'W', 'F'],
-            'start_time': '12:00',
-            'end_time': '12:50'
-        }
+    Args:
+        record: Course read from the database (updated in place)
+        details: Detail fields from hydrate_details, or None
+        
+    Returns:
+        True if course_times changed (meetings read from the database no
+        longer apply)
     """
-    if not course_times or course_times.strip() == '':
-        return None
-    
-    # Pattern: <days> <start>-<end>
-    # Days can be: M, T, W, Th, F, S, Su
-    # Times can be: 9a, 10:30a, 2:30p, etc.
-    
-    # Try to split on space to separate days from times
-    parts = course_times.strip().split()
-    if len(parts) < 2:
-        return None
-    
-    days_str = parts[0]
-    time_range = ' '.join(parts[1:])
-    
-    # Parse days
-    days = parse_days(days_str)
-    
-    # Parse time range
-    # Look for pattern: <start>-<end>
-    time_match = re.search(r'([\d:]+[ap]?)-([\d:]+[ap])', time_range)
-    if not time_match:
-        return None
-    
-    start_str = time_match.group(1)
-    end_str = time_match.group(2)
-    
-    # If start doesn't have a/p, inherit from end
-    if not (start_str.endswith('a') or start_str.endswith('p')):
-        if end_str.endswith('a'):
-            start_str += 'a'
-        elif end_str.endswith('p'):
-            start_str += 'p'
-    
-    start_time = parse_time(start_str)
-    end_time = parse_time(end_str)
-    
-    if not start_time or not end_time:
-        return None
-    
-    return {
-        'days': days,
-        'start_time': start_time,
-        'end_time': end_time
-    }
+    if not details:
+        return False
+    old_times = record.course_times
+    for field, value in details.items():
+        if field in FIELDS and value is not None:
+            record[field] = value
+    return record.course_times != old_times
 
 
-def export_schedule_data(db_path: str, output_path: str):
+def export_schedule_data(db_path: str, output_path: str, profiler=None,
+                         hydrate: bool = False, ttl: float = 6 * 3600):
     """
     Export course schedule data from database to JSON.
+    
+    Args:
+        db_path: Path to SQLite database file
+        output_path: JSON file to write
+        profiler: Optional profiling.PhaseProfiler to time each export phase
+        hydrate: First fetch details that are missing or older than ttl
+            (starts a browser if anything has to be fetched); the fresh
+            values are exported
+        ttl: Freshness of cached details when hydrating, in seconds
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    def phase(name):
+        return profiler.phase(name) if profiler else nullcontext()
+    
+    details = {}
+    if hydrate:
+        with phase('hydrate'):
+            details = hydrate_details(db_path, ttl)
     
-    # Query courses with times
-    cursor.execute('''
-        SELECT course_code, course_name, course_times, instructor,
-               max_enrollment, seats_available, section, crn
-        FROM courses
-        WHERE course_times IS NOT NULL AND course_times != ""
-    ''')
+    # Read-only: safe to run while the scraper is writing (one query, one snapshot)
+    conn = connect_read_only(db_path)
+    cursor = conn.cursor()
     
     courses = []
     skipped = 0
-    
-    for row in cursor.fetchall():
-        course_code, course_name, course_times, instructor, max_enrollment, seats_available, section, crn = row
-        
-        # Parse times
-        parsed_times = parse_course_times(course_times)
-        if not parsed_times:
-            skipped += 1
-            continue
+    has_meetings = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meetings'"
+    ).fetchone() is not None
+    
+    if has_meetings:
+        # Meeting times were parsed at ingest; read the first pattern's rows (one per day)
+        with phase('query'):
+            cursor.execute(f'''
+                SELECT {select_columns(conn, table="c")}, m.day, m.start_minute, m.end_minute
+                FROM courses c
+                LEFT JOIN meetings m ON m.course_id = c.id AND m.pattern = 0
+                WHERE c.course_times IS NOT NULL AND c.course_times != ""
+                ORDER BY c.id, m.day
+            ''')
+            rows = cursor.fetchall()
         
-        # Calculate current enrollment
-        current_enrollment = 0
-        if max_enrollment is not None and seats_available is not None:
-            current_enrollment = max_enrollment - seats_available
-        elif max_enrollment is not None:
-            current_enrollment = max_enrollment
-        
-        course_data = {
-            'code': course_code,
-            'name': course_name,
-            'instructor': instructor or '',
-            'section': section or '',
-            'crn': crn or '',
-            'days': parsed_times['days'],
-            'start_time': parsed_times['start_time'],
-            'end_time': parsed_times['end_time'],
-            'current_enrollment': current_enrollment,
-            'max_enrollment': max_enrollment or 0,
-            'raw_time_string': course_times
-        }
+        with phase('parse'):
+            width = len(FIELDS)
+            for _, course_rows in groupby(rows, key=lambda row: row[0]):
+                course_rows = list(course_rows)
+                first = course_rows[0]
+                if first[width] is None:
+                    skipped += 1
+                    continue
+                meeting = {
+                    'days': [DAY_NAMES[row[width]] for row in course_rows],
+                    'start_time': minutes_to_time(first[width + 1]),
+                    'end_time': minutes_to_time(first[width + 2]),
+                }
+                record = CourseRecord.from_row(first[:width])
+                if apply_details(record, details.get((record.crn, record.term or ''))):
+                    meeting = None
+                course_data = record.to_export_dict(meeting)
+                if course_data is None:
+                    skipped += 1
+                    continue
+                courses.append(course_data)
+    else:
+        # Older file opened read-only: parse course_times here
+        with phase('query'):
+            cursor.execute(f'''
+                SELECT {select_columns(conn)}
+                FROM courses
+                WHERE course_times IS NOT NULL AND course_times != ""
+            ''')
+            records = CourseRecord.from_rows(cursor.fetchall())
         
-        courses.append(course_data)
+        with phase('parse'):
+            for record in records:
+                apply_details(record, details.get((record.crn, record.term or '')))
+                course_data = record.to_export_dict()
+                if course_data is None:
+                    skipped += 1
+                    continue
+                courses.append(course_data)
     
     conn.close()
     
@@ -200,12 +157,38 @@ def export_schedule_data(db_path: str, output_path: str):
         }
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    with phase('write'):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            # One write instead of one per JSON token
+            f.write(json.dumps(output_data, indent=2, ensure_ascii=False))
     
     print(f"Exported {len(courses)} courses to {output_path}")
     print(f"Skipped {skipped} courses with unparseable times")
 
 
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Export course schedule data to JSON")
+    parser.add_argument('--db', default='brown_courses.db', help="Path to SQLite database file")
+    parser.add_argument('--output', default='schedule_data.json', help="JSON file to write")
+    parser.add_argument('--profile', metavar='PREFIX', default=None,
+                        help="Profile the export and write PREFIX.json / PREFIX.txt reports")
+    parser.add_argument('--hydrate', action='store_true',
+                        help="Fetch details missing from list-only rows before exporting")
+    parser.add_argument('--ttl', type=float, default=6 * 3600,
+                        help="Seconds a cached detail stays fresh when hydrating")
+    args = parser.parse_args()
+    
+    profiler = None
+    if args.profile:
+        from profiling import PhaseProfiler
+        profiler = PhaseProfiler()
+    
+    export_schedule_data(args.db, args.output, profiler, hydrate=args.hydrate, ttl=args.ttl)
+    
+    if profiler:
+        profiler.write_report(args.profile)
+
+
 if __name__ == '__main__':
-    export_schedule_data('brown_courses.db', 'schedule_data.json')
+    main()
@@ -0,0 +1,258 @@
+"""
+SQLite-backed lease job queue for sharing one crawl across several workers.
+
+Jobs are CRNs or department codes stored in a `scrape_jobs` table next to
+the `courses` table. A worker claims a batch of jobs under a time-limited
+lease, heartbeats while it works, and completes each job with a result.
+Leases held by crashed workers expire and the jobs become claimable again.
+All workers (on one or several hosts) must open the same database file.
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+JOB_KINDS = ('crn', 'department')
+
+
+class JobQueue:
+    """Lease-based job queue stored in the course database."""
+
+    def __init__(self, db_path: str = "brown_courses.db", lease_seconds: float = 300,
+                 max_attempts: int = 3):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path: Path to SQLite database file
+            lease_seconds: How long a claim stays valid without a heartbeat
+            max_attempts: Claims allowed per job before it is marked failed
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = None
+        self._connect()
+        self._create_tables()
+
+    def _connect(self):
+        """Establish database connection."""
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _create_tables(self):
+        """Create the job table if it doesn't exist."""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                target TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                updated REAL,
+                UNIQUE(kind, target)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status
+            ON scrape_jobs (status, lease_expires)
+        """)
+
+    def enqueue(self, kind: str, targets: Iterable[str]) -> int:
+        """
+        Add jobs to the queue. Targets already queued are ignored.
+
+        Args:
+            kind: 'crn' or 'department'
+            targets: CRNs or department codes
+
+        Returns:
+            Number of new jobs added
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO scrape_jobs (kind, target, updated) VALUES (?, ?, ?)",
+                [(kind, target, now) for target in targets]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def claim(self, worker_id: str, batch_size: int = 1) -> List[Dict]:
+        """
+        Lease up to batch_size jobs that are pending or whose lease expired.
+
+        Args:
+            worker_id: Unique name of the claiming worker
+            batch_size: Maximum number of jobs to claim
+
+        Returns:
+            List of job dictionaries (id, kind, target, attempts)
+        """
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can
+        # never select the same rows
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute("""
+                SELECT id, kind, target, attempts FROM scrape_jobs
+                WHERE status = 'pending'
+                   OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY id
+                LIMIT ?
+            """, (now, batch_size)).fetchall()
+
+            jobs = []
+            for job_id, kind, target, attempts in rows:
+                if attempts >= self.max_attempts:
+                    # Crashed too many times while holding this job
+                    self.conn.execute(
+                        "UPDATE scrape_jobs SET status = 'failed', worker_id = NULL, updated = ? WHERE id = ?",
+                        (now, job_id)
+                    )
+                    continue
+                self.conn.execute("""
+                    UPDATE scrape_jobs
+                    SET status = 'leased', worker_id = ?, lease_expires = ?,
+                        attempts = attempts + 1, updated = ?
+                    WHERE id = ?
+                """, (worker_id, now + self.lease_seconds, now, job_id))
+                jobs.append({'id': job_id, 'kind': kind, 'target': target, 'attempts': attempts + 1})
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return jobs
+
+    def heartbeat(self, worker_id: str, job_ids: Iterable[int]) -> int:
+        """
+        Extend the lease on jobs still held by this worker.
+
+        Args:
+            worker_id: Worker holding the leases
+            job_ids: Jobs to extend
+
+        Returns:
+            Number of leases extended (jobs lost to expiry are not counted)
+        """
+        now = time.time()
+        extended = 0
+        for job_id in job_ids:
+            cursor = self.conn.execute("""
+                UPDATE scrape_jobs SET lease_expires = ?, updated = ?
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+            """, (now + self.lease_seconds, now, job_id, worker_id))
+            extended += cursor.rowcount
+        return extended
+
+    def complete(self, worker_id: str, job_id: int, result: Optional[Dict] = None) -> bool:
+        """
+        Mark a leased job as done.
+
+        Args:
+            worker_id: Worker holding the lease
+            job_id: Job to complete
+            result: JSON-serializable result summary
+
+        Returns:
+            True if the job was still leased to this worker, False otherwise
+        """
+        cursor = self.conn.execute("""
+            UPDATE scrape_jobs
+            SET status = 'done', result = ?, lease_expires = NULL, updated = ?
+            WHERE id = ? AND worker_id = ? AND status = 'leased'
+        """, (json.dumps(result) if result is not None else None, time.time(), job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def fail(self, worker_id: str, job_id: int, error: str) -> bool:
+        """
+        Release a leased job after an error so it can be retried.
+
+        Jobs that have used up max_attempts are marked failed instead.
+
+        Args:
+            worker_id: Worker holding the lease
+            job_id: Job that failed
+            error: Error message to record
+
+        Returns:
+            True if the job was still leased to this worker, False otherwise
+        """
+        cursor = self.conn.execute("""
+            UPDATE scrape_jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                worker_id = NULL, lease_expires = NULL, error = ?, updated = ?
+            WHERE id = ? AND worker_id = ? AND status = 'leased'
+        """, (self.max_attempts, error, time.time(), job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count jobs by status.
+
+        Returns:
+            Dictionary mapping status to number of jobs
+        """
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM scrape_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Close database connection."""
+        if self.conn:
+            self.conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def main():
+    """Enqueue jobs or show queue status."""
+    parser = argparse.ArgumentParser(description="Manage the shared scrape job queue")
+    parser.add_argument('--db', default='brown_courses.db', help="Path to SQLite database file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="Add jobs to the queue")
+    enqueue_parser.add_argument('--crns', nargs='*', default=[], help="CRNs to scrape")
+    enqueue_parser.add_argument('--departments', nargs='*', default=[], help="Department codes to scrape")
+    enqueue_parser.add_argument('--all-departments', action='store_true',
+                                help="Queue every department already in the database")
+
+    subparsers.add_parser('stats', help="Show job counts by status")
+
+    args = parser.parse_args()
+
+    with JobQueue(args.db) as queue:
+        if args.command == 'enqueue':
+            departments = list(args.departments)
+            if args.all_departments:
+                rows = queue.conn.execute(
+                    "SELECT DISTINCT department FROM courses WHERE department != '' ORDER BY department"
+                ).fetchall()
+                departments.extend(row[0] for row in rows)
+            added = queue.enqueue('crn', args.crns) + queue.enqueue('department', departments)
+            print(f"Queued {added} new jobs")
+
+        for status, count in sorted(queue.stats().items()):
+            print(f"{status}: {count}")
+
+
+if __name__ == "__main__":
+    main()
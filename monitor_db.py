@@ -6,10 +6,17 @@ from database import CourseDatabase
 import time
 
 
-def main():
+def monitor(db_path: str = "brown_courses.db", interval: float = 5):
+    """
+    Print the course count whenever it changes, until Ctrl+C.
+    
+    Args:
+        db_path: Path to SQLite database file
+        interval: Seconds between checks
+    """
     print("Monitoring database... (Press Ctrl+C to stop)\n")
     
-    db = CourseDatabase()
+    db = CourseDatabase(db_path, read_only=True)
     last_count = 0
     
     try:
@@ -18,7 +25,7 @@ def main():
             if count != last_count:
                 print(f"[{time.strftime('%H:%M:%S')}] Courses in database: {count}")
                 last_count = count
-            time.sleep(5)
+            time.sleep(interval)
     except KeyboardInterrupt:
         print("\n\nStopped monitoring")
         print(f"Final count: {db.get_course_count()} courses")
@@ -26,5 +33,9 @@ def main():
         db.close()
 
 
+def main():
+    monitor()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,304 @@
+"""
+Pipelined detail capture with an in-page MutationObserver buffer.
+
+The regular loop is click -> sleep -> read -> sleep, with several WebDriver
+round trips per course. In this mode a script injected into the page owns
+the clicking: it clicks the next queued row as soon as the previous detail
+panel has rendered, and a MutationObserver snapshots each panel (tagged with
+the row's data-key) into an in-page buffer. The scraper tops up the queue
+and drains the buffer in batches, parsing and saving one batch while the
+page renders the next. Each queued row holds a rate controller ticket until
+its snapshot arrives, so the queue depth follows the controller's limits.
+"""
+
+import logging
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Read every result row in one round trip (same fields as extract_list_data);
+# arguments[0] holds the adapter's selectors
+LIST_ROWS_JS = """
+var sel = arguments[0];
+return Array.from(document.querySelectorAll(sel.row)).map(function (row) {
+    function text(selector, root) {
+        var el = (root || row).querySelector(selector);
+        return el ? el.innerText.trim() : '';
+    }
+    var link = row.querySelector(sel.link);
+    var part = row.querySelector(sel.part);
+    return {
+        key: link ? link.getAttribute('data-key') || '' : '',
+        srcdb: link ? link.getAttribute('data-srcdb') || '' : '',
+        course_code: text(sel.code),
+        course_name: text(sel.title),
+        section: part ? text(sel.section, part) : '',
+        course_times: text(sel.times),
+        instructor: text(sel.instructor)
+    };
+});
+"""
+
+# Installs window.__detailCapture: a click queue driven by a MutationObserver
+DETAIL_OBSERVER_JS = """
+if (window.__detailCapture) { return false; }
+var timeoutMs = arguments[0], settleMs = arguments[1], sel = arguments[2];
+var cap = window.__detailCapture = {queue: [], buffer: [], current: null};
+var crnPattern = new RegExp(sel.crnPattern, 'i');
+
+function panel() {
+    var panels = document.querySelectorAll(sel.panel);
+    return panels.length ? panels[panels.length - 1] : null;
+}
+
+function snapshot(timedOut) {
+    var c = cap.current;
+    if (!c) { return; }
+    clearTimeout(c.timer);
+    var p = panel();
+    cap.buffer.push({
+        key: c.key,
+        text: p ? p.innerText : '',
+        rows: p ? Array.from(p.querySelectorAll(sel.sectionRows))
+                       .map(function (r) { return r.innerText; }) : [],
+        timed_out: timedOut,
+        render_ms: performance.now() - c.start
+    });
+    cap.current = null;
+    next();
+}
+
+function rendered() {
+    // The panel's own CRN field, not just the CRN anywhere in it: a sibling
+    // section's panel already lists this CRN in its All Sections table
+    var p = panel();
+    var match = p && crnPattern.exec(p.innerText);
+    return Boolean(match) && match[1] === cap.current.crn;
+}
+
+function next() {
+    if (cap.current || !cap.queue.length) { return; }
+    var key = cap.queue.shift();
+    var link = document.querySelector(sel.link + '[data-key="' + key + '"]');
+    if (!link) {
+        cap.buffer.push({key: key, error: 'row not found'});
+        next();
+        return;
+    }
+    cap.current = {key: key, crn: key.slice(sel.keyPrefix.length), start: performance.now(), settling: false};
+    cap.current.timer = setTimeout(function () { snapshot(true); }, timeoutMs);
+    link.click();
+    check();
+}
+
+function check() {
+    var c = cap.current;
+    if (c && !c.settling && rendered()) {
+        // Let the rest of the panel finish rendering before the snapshot
+        c.settling = true;
+        setTimeout(function () { if (cap.current === c) { snapshot(false); } }, settleMs);
+    }
+}
+
+new MutationObserver(check).observe(document.body, {childList: true, subtree: true, characterData: true});
+
+cap.enqueue = function (keys) { Array.prototype.push.apply(cap.queue, keys); next(); };
+cap.drain = function () { return cap.buffer.splice(0, cap.buffer.length); };
+return true;
+"""
+
+
+class PipelinedDetailCapture:
+    """Scrapes the loaded results list by draining an in-page detail buffer."""
+
+    def __init__(self, scraper, batch_size: int = 25, render_timeout: float = 10,
+                 settle_time: float = 0.1, poll_interval: float = 0.25,
+                 stall_timeout: float = 60):
+        """
+        Initialize the capture.
+
+        Args:
+            scraper: BrownCourseScraper with the results list loaded
+            batch_size: Rows queued in the page ahead of the drained position
+            render_timeout: Seconds to wait for one detail panel before snapshotting anyway
+            settle_time: Seconds to wait after a panel shows its CRN before snapshotting
+            poll_interval: Seconds between buffer drains when it is empty
+            stall_timeout: Give up if no snapshot arrives for this long
+        """
+        self.scraper = scraper
+        self.batch_size = batch_size
+        self.render_timeout = render_timeout
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.stall_timeout = stall_timeout
+        self.timeouts = 0
+        self.mismatches = 0
+
+    def read_list_rows(self) -> List[Dict]:
+        """
+        Read every result row with one script call.
+
+        Returns:
+            List-view course data in the same shape as extract_list_data
+        """
+        adapter = self.scraper.adapter
+        selectors = {
+            'row': adapter.result_row, 'link': adapter.result_link, 'part': adapter.result_part,
+            'code': adapter.result_code, 'title': adapter.result_title, 'section': adapter.result_section,
+            'times': adapter.result_times, 'instructor': adapter.result_instructor,
+        }
+        rows = []
+        for row in self.scraper.driver.execute_script(LIST_ROWS_JS, selectors):
+            course_data = {
+                'course_code': row['course_code'],
+                'department': adapter.extract_department(row['course_code']),
+                'course_name': row['course_name'],
+                'section': row['section'],
+                'course_times': adapter.clean_times(row['course_times']),
+                'instructor': adapter.clean_instructor(row['instructor']),
+                'term': row['srcdb'] or None,
+                'key': row['key'],
+            }
+            crn = adapter.crn_from_key(row['key'])
+            if crn:
+                course_data['crn'] = crn
+            rows.append(course_data)
+        return rows
+
+    def apply_snapshot(self, course_data: Dict, snapshot: Dict) -> Dict:
+        """
+        Parse a detail snapshot into course_data, as scrape_course_detail does.
+
+        Args:
+            course_data: List-view data (updated in place)
+            snapshot: Buffer entry with the panel's text and section rows
+
+        Returns:
+            The updated course_data dictionary, or None (course_data left
+            alone) if the panel shows another section's CRN
+        """
+        text = snapshot.get('text') or ''
+        crn = course_data.get('crn')
+        if crn and self.scraper.adapter.panel_crn(text) != crn:
+            return None
+        if not course_data.get('course_times') or not course_data.get('instructor'):
+            section_data = self.scraper.parse_section_table(
+                snapshot.get('rows') or [], text, course_data.get('course_code', '')
+            )
+            self.scraper.merge_section_data(course_data, section_data)
+        else:
+            self.scraper.merge_enrollment_data(course_data, self.scraper.parse_enrollment_text(text))
+        return course_data
+
+    def run(self, max_courses: int = None) -> int:
+        """
+        Capture details for every row of the loaded list and save them.
+
+        Args:
+            max_courses: Maximum number of courses to scrape (None for all)
+
+        Returns:
+            Number of courses saved
+        """
+        scraper = self.scraper
+        rows = self.read_list_rows()
+        print(f"Found {len(rows)} courses to scrape")
+
+        pending = []
+        for course_data in rows:
+            # Same skips as scrape_course_list: conference sections and already-scraped rows
+            if not course_data.get('key') or scraper.adapter.is_skipped_section(course_data.get('section', '')):
+                continue
+            if scraper.db.course_exists(course_data.get('course_code'), course_data.get('section')):
+                continue
+            pending.append(course_data)
+        if max_courses:
+            pending = pending[:max_courses]
+        by_key = {course_data['key']: course_data for course_data in pending}
+
+        adapter = scraper.adapter
+        scraper.driver.execute_script(DETAIL_OBSERVER_JS, int(self.render_timeout * 1000),
+                                      int(self.settle_time * 1000),
+                                      {'panel': adapter.detail_panel, 'sectionRows': adapter.section_rows,
+                                       'link': adapter.result_link, 'keyPrefix': adapter.key_prefix,
+                                       'crnPattern': adapter.detail_crn_pattern})
+
+        controller = scraper.rate_controller
+        tickets = {}
+        queued = done = saved = 0
+        last_progress = time.time()
+        while done < len(pending):
+            # Queue rows as the rate controller allows, up to batch_size ahead of the drain
+            chunk = []
+            while queued + len(chunk) < len(pending) and queued + len(chunk) - done < self.batch_size:
+                ticket = controller.try_acquire('detail')
+                if ticket is None:
+                    break
+                key = pending[queued + len(chunk)]['key']
+                tickets[key] = ticket
+                chunk.append(key)
+            if chunk:
+                scraper.driver.execute_script("window.__detailCapture.enqueue(arguments[0]);", chunk)
+                queued += len(chunk)
+
+            with scraper._phase('drain'):
+                snapshots = scraper.driver.execute_script("return window.__detailCapture.drain();")
+            if not snapshots:
+                if time.time() - last_progress > self.stall_timeout:
+                    print(f"No detail rendered for {self.stall_timeout:.0f}s; stopping after {done} courses")
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            last_progress = time.time()
+
+            for snapshot in snapshots:
+                done += 1
+                ticket = tickets.pop(snapshot['key'], None)
+                if ticket is not None:
+                    ticket.timed_out = bool(snapshot.get('timed_out'))
+                    ticket.error = bool(snapshot.get('error'))
+                    controller.release(ticket, latency=snapshot.get('render_ms', 0) / 1000)
+                course_data = by_key.get(snapshot['key'])
+                if course_data is None:
+                    continue
+                if snapshot.get('error'):
+                    logger.warning(f"{snapshot['key']}: {snapshot['error']}")
+                    continue
+                if snapshot.get('timed_out'):
+                    # The panel never showed this row's CRN, so the snapshot is
+                    # most likely the previous course's; saving it would replace
+                    # that course's row. Left unsaved for the next run.
+                    self.timeouts += 1
+                    continue
+
+                course_data.pop('key', None)
+                scraper.log_context = {'crn': course_data.get('crn'),
+                                       'course_code': course_data.get('course_code')}
+                with scraper._phase('detail_extract'):
+                    applied = self.apply_snapshot(course_data, snapshot)
+                if applied is None or applied.get('crn') != scraper.adapter.crn_from_key(snapshot['key']):
+                    # Saving another section's panel would replace that section's row
+                    logger.warning(f"{snapshot['key']}: detail panel showed another section; not saved")
+                    self.mismatches += 1
+                    continue
+                with scraper._phase('db_write'):
+                    scraper.db.insert_course(course_data)
+                scraper.courses_scraped += 1
+                saved += 1
+                logger.info("captured", extra={'phase': 'render', 'duration_ms': round(snapshot.get('render_ms', 0), 1),
+                                               **scraper.log_context})
+
+            print(f"Progress: {done}/{len(pending)} courses captured")
+
+        # Rows still queued in the page when the capture stopped
+        for ticket in tickets.values():
+            ticket.timed_out = True
+            controller.release(ticket)
+
+        if self.timeouts:
+            print(f"{self.timeouts} detail panels timed out before showing their CRN "
+                  f"(not saved; run again to retry them)")
+        if self.mismatches:
+            print(f"{self.mismatches} detail panels showed another section (not saved; run again to retry them)")
+        return saved
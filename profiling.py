@@ -0,0 +1,194 @@
+"""
+Phase-scoped CPU and allocation profiling for scrape and export runs.
+
+Wrap each stage of a job in `profiler.phase(name)`. Every phase gets its own
+cProfile profile, a peak-memory figure from tracemalloc, and sampled
+allocation sites. `write_report` saves a JSON report (meant to be diffed
+between releases), a readable text report and one .prof file per phase.
+"""
+
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class _PhaseStats:
+    """Accumulated measurements for one named phase."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self.wall_time = 0.0
+        self.peak_bytes = 0
+        self.allocations = Counter()  # "file:line" -> bytes allocated
+        self.allocation_counts = Counter()
+
+
+class PhaseProfiler:
+    """CPU profiler and tracemalloc tracker scoped to named phases."""
+
+    def __init__(self, top_n: int = 25, allocation_sample_every: int = 20,
+                 traceback_frames: int = 1):
+        """
+        Initialize the profiler.
+
+        Args:
+            top_n: Number of functions / allocation sites per phase in reports
+            allocation_sample_every: Diff tracemalloc snapshots on every Nth
+                call of a phase (snapshots are expensive on hot phases)
+            traceback_frames: Frames stored per allocation by tracemalloc
+        """
+        self.top_n = top_n
+        self.allocation_sample_every = allocation_sample_every
+        self.traceback_frames = traceback_frames
+        self.phases: Dict[str, _PhaseStats] = {}
+        self._stack: List[_PhaseStats] = []
+        self._started = False
+        self._start_time = None
+
+    def start(self):
+        """Start allocation tracking (called automatically by the first phase)."""
+        if not self._started:
+            tracemalloc.start(self.traceback_frames)
+            self._started = True
+            self._start_time = time.perf_counter()
+
+    def stop(self):
+        """Stop allocation tracking."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Profile the enclosed block as part of the named phase.
+
+        Phases may nest; the inner phase's time and allocations are
+        attributed to the inner phase only.
+        """
+        self.start()
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = _PhaseStats(name)
+        stats.calls += 1
+
+        # Only one cProfile profiler can be active at a time, so suspend the parent
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.profile.disable()
+        self._stack.append(stats)
+
+        sample = stats.calls % self.allocation_sample_every == 1 or self.allocation_sample_every == 1
+        before = tracemalloc.take_snapshot() if sample else None
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        stats.profile.enable()
+        try:
+            yield
+        finally:
+            stats.profile.disable()
+            stats.wall_time += time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            stats.peak_bytes = max(stats.peak_bytes, peak - current_before)
+
+            if before is not None:
+                after = tracemalloc.take_snapshot()
+                for diff in after.compare_to(before, 'lineno'):
+                    if diff.size_diff > 0:
+                        frame = diff.traceback[0]
+                        site = f"{frame.filename}:{frame.lineno}"
+                        stats.allocations[site] += diff.size_diff
+                        stats.allocation_counts[site] += max(diff.count_diff, 0)
+
+            self._stack.pop()
+            if parent is not None:
+                # reset_peak() above hid the parent's peak; carry ours up
+                parent.peak_bytes = max(parent.peak_bytes, peak - current_before)
+                parent.profile.enable()
+
+    def _top_functions(self, stats: _PhaseStats) -> List[Dict]:
+        """Functions with the highest cumulative time in a phase."""
+        try:
+            ps = pstats.Stats(stats.profile)
+        except TypeError:
+            # Phase never ran any profiled code
+            return []
+        rows = []
+        for (filename, lineno, function), (cc, nc, tt, ct, _) in ps.stats.items():
+            rows.append({
+                'function': f"{filename}:{lineno}({function})",
+                'ncalls': nc,
+                'tottime': round(tt, 6),
+                'cumtime': round(ct, 6),
+            })
+        rows.sort(key=lambda row: row['cumtime'], reverse=True)
+        return rows[:self.top_n]
+
+    def report(self) -> Dict:
+        """
+        Build the report as a dictionary.
+
+        Returns:
+            Per-phase calls, wall time, peak memory, top functions and top
+            allocation sites
+        """
+        phases = {}
+        for name, stats in self.phases.items():
+            phases[name] = {
+                'calls': stats.calls,
+                'wall_time': round(stats.wall_time, 6),
+                'peak_kib': round(stats.peak_bytes / 1024, 1),
+                'top_functions': self._top_functions(stats),
+                'top_allocations': [
+                    {
+                        'site': site,
+                        'size_kib': round(size / 1024, 1),
+                        'count': stats.allocation_counts[site],
+                    }
+                    for site, size in stats.allocations.most_common(self.top_n)
+                ],
+            }
+        total = time.perf_counter() - self._start_time if self._start_time else 0.0
+        return {'total_wall_time': round(total, 6), 'phases': phases}
+
+    def write_report(self, prefix: str):
+        """
+        Write <prefix>.json, <prefix>.txt and <prefix>.<phase>.prof.
+
+        Args:
+            prefix: Output path without extension
+        """
+        report = self.report()
+        self.stop()
+
+        with open(f"{prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+        with open(f"{prefix}.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Total wall time: {report['total_wall_time']:.2f}s\n")
+            for name, phase in sorted(report['phases'].items(), key=lambda item: -item[1]['wall_time']):
+                f.write(f"\n=== {name}: {phase['calls']} calls, {phase['wall_time']:.2f}s, "
+                        f"peak {phase['peak_kib']:.0f} KiB ===\n")
+                f.write("Top functions (cumulative):\n")
+                for row in phase['top_functions']:
+                    f.write(f"  {row['cumtime']:9.3f}s {row['tottime']:9.3f}s {row['ncalls']:>8}  {row['function']}\n")
+                f.write("Top allocation sites (sampled):\n")
+                for row in phase['top_allocations']:
+                    f.write(f"  {row['size_kib']:9.1f} KiB {row['count']:>8}  {row['site']}\n")
+
+        for name, stats in self.phases.items():
+            safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+            try:
+                stats.profile.dump_stats(f"{prefix}.{safe_name}.prof")
+            except TypeError:
+                pass
+
+        print(f"Profile written to {prefix}.json and {prefix}.txt")
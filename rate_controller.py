@@ -0,0 +1,264 @@
+"""
+Shared adaptive rate and concurrency controller for catalog requests.
+
+Every request the scraper sends to cab.brown.edu (searches, detail clicks,
+deep links) goes through one controller per process, shared by every
+scraper, daemon session and worker thread in it:
+
+- A token bucket caps the request rate; a concurrency limit caps how many
+  requests are in flight at once.
+- AIMD (additive increase, multiplicative decrease) tunes both limits: after
+  a window of fast, successful requests the rate and concurrency creep up;
+  a timeout, an error, or a window whose average latency exceeds the target
+  for that kind of request (a search takes longer than a detail click) cuts
+  them (at most once per cooldown) and records a throttle event.
+
+The scraper so runs at the highest rate the site sustains instead of fixed
+sleeps. metrics() exposes the current limits, counters and throttle events.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+# Average latency (seconds) above which a request kind counts as slowing down;
+# searches include the fixed waits for the page and the full list to render
+DEFAULT_TARGET_LATENCY = {'search': 10.0, 'detail': 2.0, 'request': 2.0}
+
+logger = logging.getLogger(__name__)
+
+
+class Ticket:
+    """One in-flight request, handed back to release()."""
+
+    __slots__ = ('kind', 'start', 'timed_out', 'error')
+
+    def __init__(self, kind: str, start: float):
+        self.kind = kind
+        self.start = start
+        self.timed_out = False
+        self.error = False
+
+
+class RateController:
+    """Token bucket plus AIMD-adjusted concurrency limit."""
+
+    def __init__(self, rate: float = 0.5, min_rate: float = 0.1, max_rate: float = 5.0,
+                 burst: float = 2, concurrency: int = 2, max_concurrency: int = 8,
+                 target_latency: Dict[str, float] = None, additive_increase: float = 0.1,
+                 decrease_factor: float = 0.5, window: int = 20, cooldown: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the controller.
+
+        Args:
+            rate: Starting request rate (requests per second)
+            min_rate: Lowest rate a decrease can reach
+            max_rate: Highest rate an increase can reach
+            burst: Token bucket capacity
+            concurrency: Starting limit on requests in flight
+            max_concurrency: Highest concurrency an increase can reach
+            target_latency: Average latency (seconds) per request kind above which the
+                site counts as slowing down (default DEFAULT_TARGET_LATENCY)
+            additive_increase: Rate added (requests per second) after each healthy window
+            decrease_factor: Multiplier applied to rate and concurrency on a throttle event
+            window: Number of requests per latency window
+            cooldown: Minimum seconds between two decreases
+            clock: Time source (seconds)
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = dict(DEFAULT_TARGET_LATENCY, **(target_latency or {}))
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.window = window
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.tokens = burst
+        self.in_flight = 0
+        self._last_refill = clock()
+        self._last_decrease = None
+        self._healthy_streak = 0
+        self.latencies = {}
+        self._condition = threading.Condition()
+
+        # Metrics
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.throttle_events = []
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _take(self, kind: str) -> Optional[Ticket]:
+        """Take a token and a concurrency slot if both are free (lock held)."""
+        self._refill()
+        if self.in_flight < self.concurrency and self.tokens >= 1:
+            self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            return Ticket(kind, self.clock())
+        return None
+
+    def acquire(self, kind: str = 'request') -> Ticket:
+        """
+        Block until a request may be sent.
+
+        Args:
+            kind: Request kind, for metrics and logs (e.g. "search", "detail")
+
+        Returns:
+            Ticket to pass to release() once the response has arrived
+        """
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                ticket = self._take(kind)
+                if ticket is not None:
+                    self.wait_time += time.monotonic() - start
+                    return ticket
+                if self.in_flight >= self.concurrency:
+                    self._condition.wait()
+                else:
+                    self._condition.wait((1 - self.tokens) / self.rate)
+
+    def try_acquire(self, kind: str = 'request') -> Optional[Ticket]:
+        """
+        Non-blocking acquire() for callers that keep several requests in flight.
+
+        Returns:
+            Ticket, or None if the rate or concurrency limit is reached
+        """
+        with self._condition:
+            return self._take(kind)
+
+    def release(self, ticket: Ticket, latency: Optional[float] = None):
+        """
+        Report a finished request and adjust the limits.
+
+        Args:
+            ticket: Ticket from acquire(); its timed_out/error flags mark failures
+            latency: Observed latency in seconds (default: time since acquire)
+        """
+        with self._condition:
+            if latency is None:
+                latency = self.clock() - ticket.start
+            self.in_flight -= 1
+
+            if ticket.timed_out or ticket.error:
+                if ticket.timed_out:
+                    self.timeouts += 1
+                else:
+                    self.errors += 1
+                self._decrease(f"{ticket.kind} {'timeout' if ticket.timed_out else 'error'}")
+            else:
+                self.successes += 1
+                latencies = self.latencies.setdefault(ticket.kind, deque(maxlen=self.window))
+                latencies.append(latency)
+                average = sum(latencies) / len(latencies)
+                target = self.target_latency.get(ticket.kind, self.target_latency['request'])
+                if len(latencies) == self.window and average > target:
+                    self._decrease(f"{ticket.kind} average latency {average:.2f}s > {target:.2f}s")
+                else:
+                    self._healthy_streak += 1
+                    if self._healthy_streak >= self.window:
+                        self._increase()
+            self._condition.notify_all()
+
+    def _increase(self):
+        """Additive increase after a healthy window (lock held)."""
+        self._healthy_streak = 0
+        self.rate = min(self.max_rate, self.rate + self.additive_increase)
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def _decrease(self, reason: str):
+        """Multiplicative decrease, at most once per cooldown (lock held)."""
+        self._healthy_streak = 0
+        now = self.clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+        self.latencies.clear()
+
+        event = {'time': time.time(), 'reason': reason,
+                 'rate': round(self.rate, 3), 'concurrency': self.concurrency}
+        self.throttle_events.append(event)
+        logger.warning(f"Throttling: {reason}", extra={'phase': 'throttle', **event})
+
+    @contextmanager
+    def request(self, kind: str = 'request'):
+        """
+        Acquire around a block of code; an exception counts as an error.
+
+        Set `ticket.timed_out = True` inside the block to report a timeout
+        that was handled without raising.
+        """
+        ticket = self.acquire(kind)
+        try:
+            yield ticket
+        except Exception as e:
+            if e.__class__.__name__ == 'TimeoutException':
+                ticket.timed_out = True
+            else:
+                ticket.error = True
+            raise
+        finally:
+            self.release(ticket)
+
+    def metrics(self) -> Dict:
+        """
+        Current limits, counters and throttle events.
+
+        Returns:
+            Dictionary of controller metrics
+        """
+        with self._condition:
+            self._refill()
+            latency = {}
+            for kind, window in self.latencies.items():
+                ordered = sorted(window)
+                if ordered:
+                    latency[kind] = {'avg': round(sum(ordered) / len(ordered), 3),
+                                     'p95': round(ordered[int(0.95 * (len(ordered) - 1))], 3)}
+            return {
+                'rate': round(self.rate, 3),
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'tokens': round(self.tokens, 2),
+                'requests': self.requests,
+                'successes': self.successes,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'wait_seconds': round(self.wait_time, 1),
+                'latency': latency,
+                'throttle_events': len(self.throttle_events),
+                'recent_throttles': self.throttle_events[-5:],
+            }
+
+
+_shared: Optional[RateController] = None
+_shared_lock = threading.Lock()
+
+
+def shared_controller() -> RateController:
+    """The process-wide controller every scraper uses unless given its own."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateController()
+        return _shared
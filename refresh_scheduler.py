@@ -0,0 +1,260 @@
+"""
+Priority-based enrollment refresh scheduler.
+
+Keeps a priority queue of CRNs and re-scrapes the sections that matter most
+during registration: nearly full sections and sections whose seat counts are
+changing fast are refreshed every minute or so, while large half-empty
+sections are polled rarely. All refreshes share one global request budget.
+"""
+
+import heapq
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from database import CourseDatabase
+
+
+class SectionState:
+    """Refresh bookkeeping for a single CRN."""
+
+    __slots__ = ('crn', 'max_enrollment', 'seats_available', 'last_refresh',
+                 'changes', 'due')
+
+    def __init__(self, crn: str, max_enrollment: Optional[int] = None,
+                 seats_available: Optional[int] = None, last_refresh: float = 0.0):
+        self.crn = crn
+        self.max_enrollment = max_enrollment
+        self.seats_available = seats_available
+        self.last_refresh = last_refresh
+        self.changes = deque()  # timestamps of observed seat changes
+        self.due = 0.0
+
+    def fill_ratio(self) -> float:
+        """Fraction of seats still available (0.0 = full, 1.0 = empty)."""
+        if not self.max_enrollment or self.seats_available is None:
+            return 1.0
+        return max(0.0, min(1.0, self.seats_available / self.max_enrollment))
+
+
+class RefreshScheduler:
+    """Drives continuous per-CRN refreshes within a global request budget."""
+
+    def __init__(self, refresh_fn: Callable[[str], Optional[Dict]],
+                 requests_per_minute: float = 20,
+                 min_interval: float = 60,
+                 max_interval: float = 6 * 3600,
+                 change_window: float = 3600,
+                 fill_weight: float = 1.0,
+                 change_weight: float = 0.25,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the scheduler.
+
+        Args:
+            refresh_fn: Called with a CRN; returns fresh course data or None
+            requests_per_minute: Global refresh budget
+            min_interval: Shortest refresh interval for the hottest sections (seconds)
+            max_interval: Longest refresh interval for cold sections (seconds)
+            change_window: How far back seat changes count towards the change rate (seconds)
+            fill_weight: Weight of the section's fullness in its priority
+            change_weight: Weight of seat changes per hour in a section's priority
+            clock: Time source (seconds)
+            sleep: Sleep function
+        """
+        self.refresh_fn = refresh_fn
+        self.requests_per_minute = requests_per_minute
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.change_window = change_window
+        self.fill_weight = fill_weight
+        self.change_weight = change_weight
+        self.clock = clock
+        self.sleep = sleep
+
+        self.sections: Dict[str, SectionState] = {}
+        self._heap: List = []
+        self._tokens = 1.0
+        self._last_token_time = clock()
+        self.refreshes = 0
+        self.failures = 0
+
+    def load_from_db(self, db: CourseDatabase):
+        """
+        Seed the queue with every CRN already in the database.
+
+        Args:
+            db: Open course database
+        """
+        for course in db.get_all_courses():
+            if not course.get('crn'):
+                continue
+            last_refresh = 0.0
+            if course.get('last_updated'):
+                try:
+                    last_refresh = datetime.fromisoformat(str(course['last_updated'])).timestamp()
+                except ValueError:
+                    pass
+            self.add(course['crn'], course.get('max_enrollment'),
+                     course.get('seats_available'), last_refresh)
+
+    def add(self, crn: str, max_enrollment: Optional[int] = None,
+            seats_available: Optional[int] = None, last_refresh: float = 0.0):
+        """
+        Add a CRN to the queue (or update its known enrollment).
+
+        Args:
+            crn: Course Reference Number
+            max_enrollment: Maximum enrollment, if known
+            seats_available: Seats available, if known
+            last_refresh: Unix time the section was last scraped
+        """
+        state = self.sections.get(crn)
+        if state is None:
+            state = SectionState(crn, max_enrollment, seats_available, last_refresh)
+            self.sections[crn] = state
+        else:
+            state.max_enrollment = max_enrollment
+            state.seats_available = seats_available
+            state.last_refresh = last_refresh
+        self._schedule(state)
+
+    def change_rate(self, state: SectionState) -> float:
+        """Observed seat changes per hour over the change window."""
+        cutoff = self.clock() - self.change_window
+        while state.changes and state.changes[0] < cutoff:
+            state.changes.popleft()
+        return len(state.changes) * 3600.0 / self.change_window
+
+    def score(self, state: SectionState) -> float:
+        """
+        Priority of a section; 0 is coldest, 1 or more is hottest.
+
+        Nearly full sections and fast-changing sections score highest.
+        """
+        fullness = 1.0 - state.fill_ratio()
+        return self.fill_weight * fullness ** 4 + self.change_weight * self.change_rate(state)
+
+    def interval(self, state: SectionState) -> float:
+        """
+        Target refresh interval for a section, in seconds.
+
+        Interpolates geometrically from max_interval (score 0) down to
+        min_interval (score 1 or more).
+        """
+        heat = min(1.0, self.score(state))
+        return self.max_interval * (self.min_interval / self.max_interval) ** heat
+
+    def _schedule(self, state: SectionState):
+        """Push a section onto the queue at its next due time."""
+        state.due = state.last_refresh + self.interval(state)
+        heapq.heappush(self._heap, (state.due, state.crn))
+
+    def _pop_due(self) -> Optional[SectionState]:
+        """Pop the most overdue section, skipping stale heap entries."""
+        while self._heap:
+            due, crn = self._heap[0]
+            state = self.sections.get(crn)
+            if state is None or state.due != due:
+                heapq.heappop(self._heap)
+                continue
+            if due > self.clock():
+                return None
+            heapq.heappop(self._heap)
+            return state
+        return None
+
+    def _take_token(self) -> bool:
+        """Take one request from the budget if available."""
+        now = self.clock()
+        rate = self.requests_per_minute / 60.0
+        self._tokens = min(1.0, self._tokens + (now - self._last_token_time) * rate)
+        self._last_token_time = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def refresh_next(self) -> bool:
+        """
+        Refresh the most overdue section if one is due and the budget allows.
+
+        Returns:
+            True if a refresh was attempted, False otherwise
+        """
+        if not self._heap or self._heap[0][0] > self.clock():
+            return False
+        if not self._take_token():
+            return False
+
+        state = self._pop_due()
+        if state is None:
+            # Only stale entries were due; give the token back
+            self._tokens += 1.0
+            return False
+
+        try:
+            course_data = self.refresh_fn(state.crn)
+        except Exception as e:
+            print(f"Error refreshing CRN {state.crn}: {e}")
+            course_data = None
+
+        now = self.clock()
+        state.last_refresh = now
+        if course_data:
+            self.refreshes += 1
+            seats = course_data.get('seats_available')
+            if state.seats_available is not None and seats != state.seats_available:
+                state.changes.append(now)
+            state.seats_available = seats
+            if course_data.get('max_enrollment') is not None:
+                state.max_enrollment = course_data['max_enrollment']
+        else:
+            self.failures += 1
+
+        self._schedule(state)
+        return True
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Refresh sections continuously.
+
+        Args:
+            duration: Stop after this many seconds (None to run forever)
+        """
+        start = self.clock()
+        while duration is None or self.clock() - start < duration:
+            if self.refresh_next():
+                if (self.refreshes + self.failures) % 10 == 0:
+                    print(f"Refreshes: {self.refreshes}, failures: {self.failures}")
+                continue
+            # Nothing due or out of budget: sleep until whichever comes first
+            wait = 60.0 / self.requests_per_minute
+            if self._heap:
+                wait = min(wait, max(0.0, self._heap[0][0] - self.clock()))
+            self.sleep(max(wait, 0.1))
+
+
+def main():
+    """Main entry point."""
+    from scraper import BrownCourseScraper
+
+    scraper = BrownCourseScraper(headless=True)
+    scheduler = RefreshScheduler(scraper.refresh_course)
+    scheduler.load_from_db(scraper.db)
+    print(f"Scheduling refreshes for {len(scheduler.sections)} sections")
+
+    try:
+        scraper.setup_driver()
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("\nStopped refreshing")
+    finally:
+        print(f"Refreshes: {scheduler.refreshes}, failures: {scheduler.failures}")
+        scraper.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Content-addressed on-disk cache for catalog payloads.
+
+Payloads (detail panel text, result lists, API responses) are stored once per
+SHA-256 content hash under `objects/`, gzip-compressed, so identical payloads
+fetched under different keys share one file. A small SQLite index maps each
+request key to its current hash, validators (ETag / Last-Modified) and
+fetch/validation times.
+
+Revalidation works two ways:
+- HTTP callers send `conditional_headers(key)` and call `touch(key)` on a 304.
+- Browser-scraped payloads are compared by hash in `store()`; an unchanged
+  payload only updates the index's validation time.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Content-addressed payload store with per-key validation metadata."""
+
+    def __init__(self, cache_dir: str = ".cache/responses"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the index and object files
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.db"))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                validated_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+        # Counters for hit/miss reporting
+        self.hits = 0            # payload unchanged (or 304)
+        self.misses = 0          # new key or changed payload
+        self.bytes_written = 0   # new object bytes actually written
+        self.bytes_deduped = 0   # payload bytes that matched an existing object
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash[2:] + ".gz")
+
+    @staticmethod
+    def content_hash(payload: bytes) -> str:
+        """SHA-256 hex digest of a payload."""
+        return hashlib.sha256(payload).hexdigest()
+
+    def _entry(self, key: str) -> Optional[tuple]:
+        return self.conn.execute(
+            "SELECT hash, size, etag, last_modified, fetched_at, validated_at FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached payload for a key.
+
+        Args:
+            key: Request key (e.g. "detail:202520:26343")
+
+        Returns:
+            Payload bytes, or None if the key has never been stored
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        path = self._object_path(entry[0])
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """
+        HTTP validators for a conditional request.
+
+        Returns:
+            If-None-Match / If-Modified-Since headers (empty if nothing cached)
+        """
+        entry = self._entry(key)
+        headers = {}
+        if entry and entry[2]:
+            headers['If-None-Match'] = entry[2]
+        if entry and entry[3]:
+            headers['If-Modified-Since'] = entry[3]
+        return headers
+
+    def touch(self, key: str):
+        """Record that a key was revalidated without its payload changing (e.g. a 304)."""
+        self.hits += 1
+        self.conn.execute("UPDATE responses SET validated_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+
+    def store(self, key: str, payload, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> bool:
+        """
+        Store a freshly fetched payload, revalidating by content.
+
+        Args:
+            key: Request key
+            payload: Payload (str is UTF-8 encoded)
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+
+        Returns:
+            True if the payload is new or changed, False if it matched the cached copy
+        """
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        content_hash = self.content_hash(payload)
+        now = time.time()
+
+        entry = self._entry(key)
+        if entry and entry[0] == content_hash:
+            self.hits += 1
+            self.bytes_deduped += len(payload)
+            self.conn.execute(
+                "UPDATE responses SET validated_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, etag, last_modified, key)
+            )
+            self.conn.commit()
+            return False
+
+        self.misses += 1
+        path = self._object_path(content_hash)
+        if os.path.exists(path):
+            # Same content already stored under another key
+            self.bytes_deduped += len(payload)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self.bytes_written += len(payload)
+
+        self.conn.execute("""
+            INSERT OR REPLACE INTO responses
+            (key, hash, size, etag, last_modified, fetched_at, validated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (key, content_hash, len(payload), etag, last_modified, now, now))
+        self.conn.commit()
+        return True
+
+    def prune(self) -> int:
+        """
+        Delete object files no longer referenced by any key.
+
+        Returns:
+            Number of files removed
+        """
+        referenced = {row[0] for row in self.conn.execute("SELECT DISTINCT hash FROM responses")}
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if name.endswith('.gz') and prefix + name[:-3] not in referenced:
+                    os.remove(os.path.join(prefix_dir, name))
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counts for this session plus on-disk totals.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        keys, unique, total_size = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT hash), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'bytes_written': self.bytes_written,
+            'bytes_deduped': self.bytes_deduped,
+            'keys': keys,
+            'unique_objects': unique,
+            'payload_bytes': total_size,
+        }
+
+    def close(self):
+        """Close the index."""
+        if self.conn:
+            self.conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -15,7 +15,8 @@ def main():
     print("Estimated time: 30-60 minutes")
     print("Progress updates every 10 courses\n")
     
-    scraper = BrownCourseScraper(headless=False)
+    # Recycle Chrome periodically; its renderer memory grows over a full run
+    scraper = BrownCourseScraper(headless=False, max_courses_per_session=300, max_memory_mb=2048)
     
     try:
         scraper.setup_driver()
@@ -38,6 +39,7 @@ def main():
         print("Final Summary")
         print('='*60)
         print(f"Courses scraped: {scraper.courses_scraped}")
+        print(f"Browser restarts: {scraper.browser_restarts}")
         
         db = CourseDatabase()
         count = db.get_course_count()
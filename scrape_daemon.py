@@ -0,0 +1,295 @@
+"""
+Persistent scraping daemon with warm browser sessions.
+
+Every ad-hoc script starts Chrome, opens cab.brown.edu and waits for the full
+results list before doing anything. The daemon pays that once: it keeps one
+or more browser sessions with the catalog loaded and accepts commands over a
+local Unix socket, streaming results back as they are scraped.
+
+Protocol: the client sends one JSON object per line and reads JSON lines back
+until an event of type "done" or "error".
+
+    {"cmd": "scrape", "crns": ["26343", "27488"]}   -> "course" events, then "done"
+    {"cmd": "refresh", "department": "APMA"}        -> "course" events, then "done"
+    {"cmd": "state"}                                -> one "state" event, then "done"
+    {"cmd": "shutdown"}                             -> "done", then the daemon exits
+
+Each session lives on its own thread, which owns its scraper (and so its
+SQLite connection); requests wait for the next idle session.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, Iterator, List
+
+DEFAULT_SOCKET = ".cache/scraper.sock"
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserSession(threading.Thread):
+    """A warm scraper serving jobs from the daemon's shared job queue."""
+
+    def __init__(self, index: int, jobs: queue.Queue, db_path: str, headless: bool):
+        super().__init__(name=f"session-{index}", daemon=True)
+        self.index = index
+        self.jobs = jobs
+        self.db_path = db_path
+        self.headless = headless
+        self.scraper = None
+        self.status = 'starting'
+        self.started_at = None
+        self.jobs_done = 0
+        self.ready = threading.Event()
+
+    def run(self):
+        from scraper import BrownCourseScraper
+
+        self.scraper = BrownCourseScraper(headless=self.headless, db_path=self.db_path)
+        try:
+            self.scraper.setup_driver()
+            self.scraper.load_all_courses()
+        except Exception as e:
+            logger.error(f"Session {self.index} failed to start: {e}", exc_info=True)
+            self.status = 'failed'
+            self.ready.set()
+            self.scraper.cleanup()
+            return
+        self.started_at = time.time()
+        self.status = 'idle'
+        self.ready.set()
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            self.status = 'busy'
+            try:
+                self.handle(job)
+            except Exception as e:
+                logger.error(f"Session {self.index} job failed: {e}", exc_info=True)
+                job['events'].put({'event': 'error', 'message': str(e)})
+            finally:
+                job['events'].put(None)
+                self.jobs_done += 1
+                self.status = 'idle'
+            # Recycle between jobs if the session has grown too large
+            self.scraper.check_browser_health()
+
+        self.status = 'stopped'
+        self.scraper.cleanup()
+
+    def handle(self, job: Dict):
+        """Run one command and put its events on the job's event queue."""
+        events = job['events']
+        command = job['command']
+        cmd = command.get('cmd')
+        scraped = 0
+
+        if cmd == 'scrape':
+            for crn in command.get('crns', []):
+                course_data = self.scraper.refresh_course(str(crn))
+                if course_data:
+                    scraped += 1
+                    events.put({'event': 'course', 'session': self.index, 'data': dict(course_data)})
+                else:
+                    events.put({'event': 'missing', 'session': self.index, 'crn': crn})
+        elif cmd == 'refresh':
+            def on_result(course_data):
+                events.put({'event': 'course', 'session': self.index, 'data': dict(course_data)})
+            scraped = len(self.scraper.lookup(command['department'], on_result=on_result))
+        else:
+            raise ValueError(f"Unknown command: {cmd}")
+
+        events.put({'event': 'done', 'session': self.index, 'scraped': scraped})
+
+    def describe(self) -> Dict:
+        """Snapshot of this session for the state command."""
+        state = {
+            'session': self.index,
+            'status': self.status,
+            'jobs_done': self.jobs_done,
+            'uptime': round(time.time() - self.started_at, 1) if self.started_at else None,
+        }
+        if self.scraper is not None:
+            state.update({
+                'courses_scraped': self.scraper.courses_scraped,
+                'browser_restarts': self.scraper.browser_restarts,
+                'current_query': self.scraper.current_query,
+            })
+        return state
+
+
+class ScrapeDaemon:
+    """Unix-socket server dispatching commands to warm browser sessions."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, sessions: int = 1,
+                 db_path: str = "brown_courses.db", headless: bool = True):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            sessions: Number of warm browser sessions
+            db_path: Path to SQLite database file
+            headless: Run the browsers without a window
+        """
+        self.socket_path = socket_path
+        self.db_path = db_path
+        self.jobs = queue.Queue()
+        self.sessions = [BrowserSession(index, self.jobs, db_path, headless) for index in range(sessions)]
+        self.started_at = time.time()
+        self.server = None
+
+    def start_sessions(self) -> int:
+        """
+        Start every session and wait until each has loaded the catalog.
+
+        Returns:
+            Number of sessions ready to take jobs
+        """
+        for session in self.sessions:
+            session.start()
+        for session in self.sessions:
+            session.ready.wait()
+        return sum(1 for session in self.sessions if session.status == 'idle')
+
+    def state(self) -> Dict:
+        """Daemon-wide state for the state command."""
+        from database import CourseDatabase
+        from rate_controller import shared_controller
+
+        # Read-only: no schema setup, and never competes with the sessions for the write lock
+        course_count = 0
+        if os.path.exists(self.db_path):
+            with CourseDatabase(self.db_path, read_only=True) as db:
+                course_count = db.get_course_count()
+        return {
+            'event': 'state',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'queued_jobs': self.jobs.qsize(),
+            'courses_in_db': course_count,
+            'sessions': [session.describe() for session in self.sessions],
+            'rate': shared_controller().metrics(),
+        }
+
+    def dispatch(self, command: Dict) -> Iterator[Dict]:
+        """
+        Run a command and yield its events as they arrive.
+
+        Args:
+            command: Decoded request, e.g. {"cmd": "scrape", "crns": [...]}
+        """
+        cmd = command.get('cmd')
+        if cmd == 'state':
+            yield self.state()
+            yield {'event': 'done'}
+            return
+        if cmd == 'shutdown':
+            yield {'event': 'done'}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if cmd not in ('scrape', 'refresh'):
+            yield {'event': 'error', 'message': f"Unknown command: {cmd}"}
+            return
+
+        events = queue.Queue()
+        self.jobs.put({'command': command, 'events': events})
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            yield event
+
+    def serve(self):
+        """Start the sessions and serve requests until a shutdown command."""
+        ready = self.start_sessions()
+        if not ready:
+            print("No browser session could be started")
+            return
+        print(f"{ready} warm session(s) ready")
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        command = json.loads(line)
+                        for event in daemon.dispatch(command):
+                            self.wfile.write((json.dumps(event, default=str) + '\n').encode('utf-8'))
+                            self.wfile.flush()
+                    except (BrokenPipeError, ConnectionResetError):
+                        return
+                    except Exception as e:
+                        self.wfile.write((json.dumps({'event': 'error', 'message': str(e)}) + '\n').encode('utf-8'))
+                        self.wfile.flush()
+
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self.server.daemon_threads = True
+        print(f"Listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            for _ in self.sessions:
+                self.jobs.put(None)
+            for session in self.sessions:
+                session.join(timeout=30)
+            print("Daemon stopped")
+
+
+def send_command(command: Dict, socket_path: str = DEFAULT_SOCKET) -> Iterator[Dict]:
+    """
+    Send a command to a running daemon and yield the events it streams back.
+
+    Args:
+        command: Request, e.g. {"cmd": "scrape", "crns": ["26343"]}
+        socket_path: Path of the daemon's Unix socket
+
+    Yields:
+        Event dictionaries, ending with a "done" or "error" event
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(command) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as reader:
+            for line in reader:
+                event = json.loads(line)
+                yield event
+                if event.get('event') in ('done', 'error'):
+                    return
+
+
+def print_events(events: Iterator[Dict]) -> List[Dict]:
+    """Print streamed events as readable lines and return them."""
+    received = []
+    for event in events:
+        received.append(event)
+        kind = event.get('event')
+        if kind == 'course':
+            course = event['data']
+            print(f"{course.get('course_code')} {course.get('section')} (CRN {course.get('crn')}): "
+                  f"{course.get('seats_available')}/{course.get('max_enrollment')} seats")
+        elif kind == 'missing':
+            print(f"CRN {event['crn']} not found")
+        elif kind in ('state', 'error'):
+            print(json.dumps(event, indent=2))
+        elif kind == 'done' and 'scraped' in event:
+            print(f"Done: {event['scraped']} courses scraped")
+    return received
@@ -0,0 +1,136 @@
+"""
+Non-blocking structured logging for the scraper.
+
+Log calls only put a record on an in-memory queue; a background listener
+thread formats each record as one JSON object per line and writes it to a
+size-rotated log file whose old generations are gzip-compressed. Extra
+fields passed with `extra={...}` (course_index, crn, phase, duration_ms, ...)
+become top-level keys of the JSON event.
+"""
+
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime
+from typing import Optional
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON events."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                event[key] = value
+        if record.exc_info:
+            event['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            event['exc'] = record.exc_text
+        return json.dumps(event, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps the traceback apart from the message.
+
+    The stock prepare() formats the record, appending the traceback to msg,
+    and clears exc_info. Here msg holds only the message and the traceback
+    is kept as exc_text, which JsonFormatter writes as the exc field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            # Tracebacks hold frames alive; the text is all the writer needs
+            record.exc_info = None
+        return record
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that gzips rotated files (scraper.log.1.gz, ...)."""
+
+    def __init__(self, *args, compress: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        if compress:
+            self.namer = lambda name: name + '.gz'
+            self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+def setup_logging(path: str = 'scraper.log', level: int = logging.INFO,
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  compress: bool = True, force: bool = False) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to a background JSON file writer.
+
+    Calling this again is a no-op unless force is set.
+
+    Args:
+        path: Log file to write
+        level: Minimum level to record
+        max_bytes: Rotate once the file reaches this size (0 to never rotate)
+        backup_count: Number of rotated files to keep
+        compress: Gzip rotated files
+        force: Replace an existing configuration
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+    if _listener is not None:
+        if not force:
+            return _listener
+        shutdown_logging()
+
+    file_handler = CompressingRotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', compress=compress
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(StructuredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,126 @@
+"""
+Worker that claims jobs from the shared job queue and scrapes them.
+
+Run one worker per machine or container, all pointing at the same database:
+
+    python job_queue.py enqueue --all-departments
+    python scrape_worker.py --worker-id host-a
+    python scrape_worker.py --worker-id host-b
+"""
+
+import argparse
+import os
+import socket
+import threading
+import traceback
+
+from job_queue import JobQueue
+from scraper import BrownCourseScraper
+
+
+class LeaseHeartbeat:
+    """Background thread that keeps a worker's leases alive."""
+
+    def __init__(self, db_path: str, worker_id: str, lease_seconds: float):
+        self.db_path = db_path
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.job_ids = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        # SQLite connections can't be shared across threads, so open our own
+        with JobQueue(self.db_path, self.lease_seconds) as queue:
+            while not self._stop.wait(self.lease_seconds / 3):
+                queue.heartbeat(self.worker_id, list(self.job_ids))
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+def run_job(scraper: BrownCourseScraper, job: dict) -> dict:
+    """
+    Scrape one job.
+
+    Args:
+        scraper: Scraper with a running driver
+        job: Claimed job (kind and target)
+
+    Returns:
+        Result summary to store with the job
+    """
+    before = scraper.courses_scraped
+    if job['kind'] == 'crn':
+        course_data = scraper.refresh_course(job['target'])
+        return {'found': course_data is not None}
+
+    if not scraper.search(job['target']):
+        return {'courses_scraped': 0}
+    scraper.scrape_course_list(department=job['target'])
+    return {'courses_scraped': scraper.courses_scraped - before}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Claim and scrape jobs from the shared queue")
+    parser.add_argument('--db', default='brown_courses.db', help="Path to SQLite database file")
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Unique name for this worker")
+    parser.add_argument('--batch-size', type=int, default=5, help="Jobs to claim at a time")
+    parser.add_argument('--lease', type=float, default=300, help="Lease length in seconds")
+    parser.add_argument('--headed', action='store_true', help="Show the browser window")
+    parser.add_argument('--no-wal', action='store_true',
+                        help="Use a rollback journal instead of WAL (needed when workers on several "
+                             "hosts share the database over a network filesystem)")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.db, lease_seconds=args.lease)
+    scraper = BrownCourseScraper(headless=not args.headed, db_path=args.db,
+                                 journal_mode='DELETE' if args.no_wal else 'WAL')
+    heartbeat = LeaseHeartbeat(args.db, args.worker_id, args.lease)
+
+    print(f"Worker {args.worker_id} starting...")
+
+    try:
+        scraper.setup_driver()
+        heartbeat.start()
+
+        while True:
+            jobs = queue.claim(args.worker_id, args.batch_size)
+            if not jobs:
+                print("No jobs left to claim")
+                break
+
+            heartbeat.job_ids = [job['id'] for job in jobs]
+            for job in jobs:
+                print(f"[{args.worker_id}] {job['kind']} {job['target']}")
+                try:
+                    result = run_job(scraper, job)
+                    if not queue.complete(args.worker_id, job['id'], result):
+                        print(f"Lease on job {job['id']} expired before completion")
+                except Exception as e:
+                    traceback.print_exc()
+                    queue.fail(args.worker_id, job['id'], str(e))
+                finally:
+                    heartbeat.job_ids.remove(job['id'])
+
+    except KeyboardInterrupt:
+        print("\nWorker stopped")
+    finally:
+        heartbeat.stop()
+        scraper.cleanup()
+
+        print(f"Courses scraped by this worker: {scraper.courses_scraped}")
+        for status, count in sorted(queue.stats().items()):
+            print(f"{status}: {count}")
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
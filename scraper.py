@@ -11,36 +11,119 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+import argparse
 import time
 import re
 import logging
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+from course_record import CourseRecord
 from database import CourseDatabase
+from rate_controller import shared_controller
+from scrape_logging import setup_logging
+from site_adapters import BrownAdapter
 
-# Configure logging
-logging.basicConfig(
-    filename='scraper.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filemode='w'
-)
+logger = logging.getLogger(__name__)
 
 
 class BrownCourseScraper:
     """Scraper for Brown University course catalog."""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, db_path: str = "brown_courses.db",
+                 max_courses_per_session: int = None, max_memory_mb: float = None,
+                 memory_check_interval: int = 25, profiler=None, response_cache=None,
+                 rate_controller=None, tracer=None, click_tracer=None, adapter=None,
+                 journal_mode: str = "WAL"):
         """
         Initialize the scraper.
         
         Args:
             headless: Run browser in headless mode (no GUI)
+            db_path: Path to SQLite database file
+            max_courses_per_session: Restart the browser after this many courses (None for no limit)
+            max_memory_mb: Restart the browser when its memory exceeds this (None for no limit)
+            memory_check_interval: Sample browser memory every N courses
+            profiler: Optional profiling.PhaseProfiler to time each scrape phase
+            response_cache: Optional response_cache.ResponseCache; detail panels
+                whose content hasn't changed since the last crawl skip re-parsing.
+                A full crawl with a cache revisits stored rows instead of resuming
+            rate_controller: rate_controller.RateController pacing every request
+                (default: the process-wide shared controller)
+            tracer: Optional driver_tracer.CommandTracer counting and timing every
+                WebDriver command per course and phase
+            click_tracer: Optional devtools_trace.SlowClickTracer saving a DevTools
+                performance trace for every slow detail click
+            adapter: site_adapters adapter with the catalog's URL, selectors and
+                field parsers (default: BrownAdapter)
+            journal_mode: Database journal mode. WAL (the default) lets monitors and
+                exports read while the scraper writes; use DELETE when the database
+                is shared over a network filesystem, where WAL doesn't work
         """
-        self.base_url = "https://cab.brown.edu/"
-        self.db = CourseDatabase()
+        self.adapter = adapter or BrownAdapter()
+        self.base_url = self.adapter.base_url
+        self.db = CourseDatabase(db_path, journal_mode=journal_mode,
+                                 synchronous="NORMAL" if journal_mode == "WAL" else None)
         self.driver = None
         self.headless = headless
         self.courses_scraped = 0
         
+        # Browser recycling
+        self.max_courses_per_session = max_courses_per_session
+        self.max_memory_mb = max_memory_mb
+        self.memory_check_interval = memory_check_interval
+        self.session_courses = 0
+        self._last_memory_check = 0
+        self.browser_restarts = 0
+        self.current_query = ""
+        
+        self.profiler = profiler
+        self.response_cache = response_cache
+        self.rate_controller = rate_controller or shared_controller()
+        self.tracer = tracer
+        self.click_tracer = click_tracer
+        
+        # Per-course fields attached to every structured log event
+        self.log_context = {}
+        
+        # JSON events to scraper.log via a background thread (no-op if already set up)
+        setup_logging()
+        
+        if self.tracer is not None:
+            self.tracer.course_key = lambda: self.log_context.get('crn') or self.log_context.get('course_index')
+        
+    @contextmanager
+    def _phase(self, name: str):
+        """Time a scrape phase, log it as a structured event, and profile it if enabled."""
+        start = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.push_phase(name)
+        try:
+            with (self.profiler.phase(name) if self.profiler else nullcontext()):
+                yield
+        finally:
+            if self.tracer is not None:
+                self.tracer.pop_phase()
+            duration_ms = (time.perf_counter() - start) * 1000
+            logger.info(name, extra={'phase': name, 'duration_ms': round(duration_ms, 1), **self.log_context})
+    
+    @contextmanager
+    def _click_trace(self, crn: Optional[str]):
+        """Time a detail click and keep its DevTools trace if it was slow (see devtools_trace.py)."""
+        if self.click_tracer is None:
+            yield
+            return
+        self.click_tracer.begin(self.driver)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            latency = time.perf_counter() - start
+            trace = self.click_tracer.end(self.driver, crn, latency)
+            if trace:
+                logger.info("Slow click traced", extra={'phase': 'click_trace', 'path': trace['path'],
+                                                        'latency_ms': trace['latency_ms'], **trace['summary'],
+                                                        **self.log_context})
+    
     def setup_driver(self):
         """Set up Chrome WebDriver."""
         options = webdriver.ChromeOptions()
@@ -52,48 +135,204 @@ class BrownCourseScraper:
         options.add_argument("--window-size=1920,1080")  # Ensure wide screen for side-by-side panels
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.click_tracer is not None:
+            from devtools_trace import enable_performance_logging
+            enable_performance_logging(options)
         
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
+        if self.tracer is not None:
+            self.driver = self.tracer.wrap(self.driver)
         self.driver.maximize_window()
+        self.session_courses = 0
+        self._last_memory_check = 0
+    
+    def sample_memory(self) -> dict:
+        """
+        Measure the memory used by the current browser session.
+        
+        The JS heap comes from the page itself. Process sizes (chromedriver,
+        the browser, and its renderers) need the optional psutil package.
+        
+        Returns:
+            Dictionary of memory figures in MB (missing figures are omitted)
+        """
+        memory = {}
+        
+        try:
+            heap = self.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+            if heap:
+                memory['js_heap_mb'] = heap / 1024 / 1024
+        except Exception:
+            pass
+        
+        try:
+            import psutil
+            
+            driver_process = psutil.Process(self.driver.service.process.pid)
+            memory['driver_rss_mb'] = driver_process.memory_info().rss / 1024 / 1024
+            browser_rss = renderer_rss = 0
+            for child in driver_process.children(recursive=True):
+                try:
+                    rss = child.memory_info().rss
+                    if '--type=renderer' in child.cmdline():
+                        renderer_rss += rss
+                    else:
+                        browser_rss += rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            memory['browser_rss_mb'] = browser_rss / 1024 / 1024
+            memory['renderer_rss_mb'] = renderer_rss / 1024 / 1024
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not sample process memory: {e}")
+        
+        return memory
+    
+    def _total_memory_mb(self, memory: dict) -> float:
+        """Total browser memory, preferring process sizes over the JS heap."""
+        process_keys = ('driver_rss_mb', 'browser_rss_mb', 'renderer_rss_mb')
+        if any(key in memory for key in process_keys):
+            return sum(memory.get(key, 0) for key in process_keys)
+        return memory.get('js_heap_mb', 0)
+    
+    def check_browser_health(self) -> bool:
+        """
+        Restart the browser if it has exceeded its memory or course limit.
+        
+        Memory is sampled every memory_check_interval courses and logged.
+        
+        Returns:
+            True if the browser was restarted
+        """
+        if self.max_courses_per_session and self.session_courses >= self.max_courses_per_session:
+            self.restart_browser(f"{self.session_courses} courses this session")
+            return True
+        
+        if self.session_courses - self._last_memory_check < self.memory_check_interval:
+            return False
+        self._last_memory_check = self.session_courses
+        
+        memory = self.sample_memory()
+        total_mb = self._total_memory_mb(memory)
+        logger.info(
+            f"Memory after {self.session_courses} courses: {total_mb:.0f} MB",
+            extra={'phase': 'memory', 'session_courses': self.session_courses,
+                   'total_mb': round(total_mb, 1), **{key: round(value, 1) for key, value in memory.items()}}
+        )
+        
+        if self.max_memory_mb and total_mb > self.max_memory_mb:
+            self.restart_browser(f"memory {total_mb:.0f} MB > {self.max_memory_mb:.0f} MB")
+            return True
+        return False
+    
+    def restart_browser(self, reason: str):
+        """
+        Replace the browser with a fresh session and restore the last search.
+        
+        Args:
+            reason: Why the browser is being recycled (for the log)
+        """
+        print(f"Restarting browser ({reason})...")
+        logger.info(f"Restarting browser: {reason}")
+        
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting old browser: {e}")
+        
+        self.setup_driver()
+        self.search(self.current_query)
+        self.browser_restarts += 1
         
     def load_all_courses(self):
         """Navigate to site and load all courses."""
         print("Loading Brown course catalog...")
-        self.driver.get(self.base_url)
+        with self._phase('search'):
+            self.search("")
+        print("Course list loaded successfully!")
+    
+    def search(self, query: str = "") -> int:
+        """
+        Run a catalog search and wait for the results list.
         
-        # Wait for page to load
-        time.sleep(2)
+        An empty query lists the whole catalog; a CRN, course code or
+        department code jumps straight to the matching rows.
+        
+        Args:
+            query: Text to type into the search box
+            
+        Returns:
+            Number of results on the page (0 if nothing matched)
+        """
+        self.current_query = query
+        with self.rate_controller.request('search'):
+            return self._search(query)
+    
+    def _search(self, query: str) -> int:
+        """Load the catalog and run a search (see search)."""
+        self.driver.get(self.base_url)
         
         try:
-            # Find the search box and click it
+            # Wait for the page to load and find the search box
             search_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='title, tag, subject, CRN or keyword']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.adapter.search_input))
             )
             
-            # Click the search box and press Enter
+            # Click the search box, type the query and press Enter
             search_box.click()
-            time.sleep(0.5)
+            if query:
+                search_box.send_keys(query)
             search_box.send_keys(Keys.RETURN)
             
             print("Waiting for course list to load...")
             # Wait for search results to appear
             WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".result.result--group-start"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.adapter.result_row))
             )
             
-            time.sleep(2)  # Additional wait for all courses to render
-            print("Course list loaded successfully!")
+            self.wait_for_results()
             
         except TimeoutException:
+            if query:
+                # A targeted search with no matches never renders a result row
+                logger.warning(f"No results for search '{query}'")
+                return 0
             print("Error: Timeout waiting for course list to load")
             raise
+        
+        return self.get_course_count()
+    
+    def wait_for_results(self, timeout: float = 5):
+        """
+        Wait until the results list stops growing.
+        
+        The first rows appear before the rest of the list has rendered, so
+        the row count is polled until two reads in a row agree. If it is
+        still changing after timeout seconds, the rows so far are used.
+        
+        Args:
+            timeout: Seconds to wait
+        """
+        counts = []
+        
+        def settled(driver):
+            counts.append(self.get_course_count())
+            return len(counts) > 1 and counts[-1] == counts[-2]
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(settled)
+        except TimeoutException:
+            logger.warning(f"Results list still changing after {timeout:.0f}s ({counts[-1]} rows)")
     
     def get_course_count(self):
         """Get the total number of courses found."""
         try:
             # Directly count the course elements
-            course_elements = self.driver.find_elements(By.CSS_SELECTOR, ".result.result--group-start")
+            course_elements = self.driver.find_elements(By.CSS_SELECTOR, self.adapter.result_row)
             return len(course_elements)
         except:
             return 0
@@ -108,15 +347,18 @@ class BrownCourseScraper:
         Returns:
             Department code (e.g., "AFRI")
         """
-        match = re.match(r'^([A-Z]+)', course_code)
-        return match.group(1) if match else ""
+        return self.adapter.extract_department(course_code)
     
-    def scrape_course_list(self, max_courses: int = None):
+    def scrape_course_list(self, max_courses: int = None, department: str = None,
+                           list_only: bool = False):
         """
         Scrape all courses from the list.
         
         Args:
             max_courses: Maximum number of courses to scrape (None for all)
+            department: Only scrape rows from this department (None for all)
+            list_only: Store the list-view row without clicking into the course;
+                details are hydrated later on demand (see detail_cache.py)
         """
         total_courses = self.get_course_count()
         print(f"Found {total_courses} courses to scrape")
@@ -129,8 +371,12 @@ class BrownCourseScraper:
         
         while course_index < total_courses:
             try:
+                # Recycle the browser if it has grown too large; the new session
+                # reloads the same search, so course_index still lines up
+                self.check_browser_health()
+                
                 # Get all course elements (re-fetch to avoid stale references)
-                course_elements = self.driver.find_elements(By.CSS_SELECTOR, ".result.result--group-start")
+                course_elements = self.driver.find_elements(By.CSS_SELECTOR, self.adapter.result_row)
                 
                 if course_index >= len(course_elements):
                     print("No more courses found")
@@ -138,71 +384,62 @@ class BrownCourseScraper:
                 
                 course_element = course_elements[course_index]
                 
-                logging.info(f"Processing course index {course_index}")
+                self.log_context = {'course_index': course_index}
                 
-                # Scroll to element
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", course_element)
-                time.sleep(0.5)
+                # Scroll to element (only needed before clicking)
+                if not list_only:
+                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", course_element)
                 
                 # Extract basic info from list view
-                course_data = self.extract_list_data(course_element)
-                logging.info(f"Extracted list data: {course_data.get('course_code', 'Unknown')}")
+                with self._phase('list_extract'):
+                    course_data = self.extract_list_data(course_element)
+                if course_data:
+                    self.log_context.update(crn=course_data.get('crn'), course_code=course_data.get('course_code'))
                 
-                # Check if course already exists (Resume capability)
-                if course_data and self.db.course_exists(course_data.get('course_code'), course_data.get('section')):
-                    print(f"Skipping {course_data.get('course_code')} (Already scraped)")
+                # A department search also matches other departments' rows by keyword
+                if course_data and department and course_data.get('department') != department:
+                    course_index += 1
+                    continue
+                
+                # Check if course already exists (Resume capability). With a response
+                # cache, stored rows are revisited instead: that is where its hits come from.
+                if course_data and not list_only and self.response_cache is None and self.db.course_exists(course_data.get('course_code'), course_data.get('section')):
+                    logger.info("Skipping (already scraped)", extra={'phase': 'skip', **self.log_context})
                     course_index += 1
                     continue
                 
                 # Skip sections that start with 'C' (discussion/conference sections)
-                if course_data and course_data.get('section', '').startswith('C'):
-                    logging.info(f"Skipping section {course_data.get('section')}")
-                    print(f"Skipping section {course_data.get('section')} for {course_data.get('course_code')}")
+                if course_data and self.adapter.is_skipped_section(course_data.get('section', '')):
+                    logger.info("Skipping conference section",
+                                extra={'phase': 'skip', 'section': course_data.get('section'), **self.log_context})
                     course_index += 1
                     continue
                 
-                if course_data:
-                    # Click into course for enrollment data
+                if course_data and list_only:
+                    if course_data.get('crn'):
+                        with self._phase('db_write'):
+                            self.db.upsert_list_data(course_data)
+                        self.courses_scraped += 1
+                        if self.courses_scraped % 100 == 0:
+                            print(f"Progress: {self.courses_scraped}/{total_courses} rows stored")
+                elif course_data:
                     try:
-                        logging.info("Clicking course element...")
-                        course_element.click()
-                        time.sleep(1)
-                        logging.info("Clicked.")
-
-                        
-                        # Check if we need to extract data from the detail page
-                        # (for courses that don't show times/instructor in list view)
-                        if not course_data.get('course_times') or not course_data.get('instructor'):
-                            print(f"Extracting from All Sections table for {course_data.get('course_code')}")
-                            # Extract everything from the All Sections table
-                            section_data = self.extract_section_from_table(course_data.get('course_code', ''))
-                            
-                            # Update course_data with section table data
-                            if section_data.get('course_times'):
-                                course_data['course_times'] = section_data['course_times']
-                            if section_data.get('instructor'):
-                                course_data['instructor'] = section_data['instructor']
-                            if section_data.get('crn'):
-                                course_data['crn'] = section_data['crn']
-                            if section_data.get('section'):
-                                course_data['section'] = section_data['section']
-                            if section_data.get('max_enrollment') is not None:
-                                course_data['max_enrollment'] = section_data['max_enrollment']
-                            if section_data.get('seats_available') is not None:
-                                course_data['seats_available'] = section_data['seats_available']
-                        else:
-                            # Extract enrollment data normally
-                            enrollment_data = self.extract_enrollment_data()
-                            course_data.update(enrollment_data)
-                        
-                        time.sleep(1)
+                        if self.scrape_course_detail(course_element, course_data) is None:
+                            # Not saved, so the next run (resume) retries it
+                            print(f"Detail panel for {course_data.get('course_code')} did not render; skipped")
+                            course_index += 1
+                            continue
                         
                         # Save to database
-                        self.db.insert_course(course_data)
+                        with self._phase('db_write'):
+                            self.db.insert_course(course_data)
                         self.courses_scraped += 1
+                        self.session_courses += 1
                         
                         if self.courses_scraped % 10 == 0:
                             print(f"Progress: {self.courses_scraped}/{total_courses} courses scraped")
+                            metrics = self.rate_controller.metrics()
+                            logger.info("Rate limits", extra={'phase': 'rate', **metrics})
                         
                     except Exception as e:
                         print(f"Error processing course detail: {e}")
@@ -213,18 +450,434 @@ class BrownCourseScraper:
                 course_index += 1
                 
             except StaleElementReferenceException:
-                logging.warning(f"Stale element at index {course_index}, retrying...")
+                logger.warning(f"Stale element at index {course_index}, retrying...")
                 print(f"Stale element at index {course_index}, retrying...")
                 continue
             except Exception as e:
-                logging.error(f"Error at course index {course_index}: {e}", exc_info=True)
+                logger.error(f"Error at course index {course_index}: {e}", exc_info=True)
                 print(f"Error at course index {course_index}: {e}")
                 course_index += 1
                 continue
         
         print(f"\nScraping complete! Total courses scraped: {self.courses_scraped}")
+        if self.browser_restarts:
+            print(f"Browser restarted {self.browser_restarts} times")
+    
+    def scrape_course_detail(self, course_element, course_data: dict) -> dict:
+        """
+        Click into a course and merge its detail-panel data into course_data.
+        
+        Args:
+            course_element: Selenium WebElement for the course row
+            course_data: List-view data from extract_list_data (updated in place)
+            
+        Returns:
+            The updated course_data dictionary, or None if the panel never
+            showed the row's CRN (whatever it shows belongs to another
+            section, so nothing is merged and the row shouldn't be saved)
+        """
+        # Click into course for enrollment data
+        with self._phase('click'), self.rate_controller.request('detail') as ticket, \
+                self._click_trace(course_data.get('crn')):
+            course_element.click()
+            ticket.timed_out = not self.wait_for_detail(course_data.get('crn'))
+        if ticket.timed_out:
+            return None
+        
+        # Unchanged since the last crawl: reuse the stored parse
+        if self.response_cache is not None and self._detail_unchanged(course_data):
+            return course_data
+        
+        # Check if we need to extract data from the detail page
+        # (for courses that don't show times/instructor in list view)
+        if not course_data.get('course_times') or not course_data.get('instructor'):
+            logger.info("Extracting from All Sections table", extra={'phase': 'detail_extract', **self.log_context})
+            # Extract everything from the All Sections table
+            with self._phase('detail_extract'):
+                section_data = self.extract_section_from_table(course_data.get('course_code', ''))
+            
+            self.merge_section_data(course_data, section_data)
+        else:
+            # Extract enrollment data normally
+            with self._phase('detail_extract'):
+                enrollment_data = self.extract_enrollment_data()
+            self.merge_enrollment_data(course_data, enrollment_data)
+        
+        return course_data
+    
+    def wait_for_detail(self, crn: Optional[str], timeout: float = 10) -> bool:
+        """
+        Wait until the detail panel shows a section's CRN.
+        
+        Only the panel's own CRN field counts: the All Sections table lists
+        sibling sections too, so their CRNs can be on the page before (or
+        instead of) the section that was opened.
+        
+        Args:
+            crn: Course Reference Number of the section that was opened
+                (None to accept any section, for rows without a CRN)
+            timeout: Seconds to wait
+            
+        Returns:
+            True if the panel rendered in time
+        """
+        def rendered(driver):
+            shown = self.adapter.panel_crn(self.get_detail_payload())
+            return shown is not None and (crn is None or shown == crn)
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(rendered)
+            return True
+        except TimeoutException:
+            logger.warning(f"Detail panel for CRN {crn} did not render within {timeout:.0f}s",
+                           extra={'phase': 'click', **self.log_context})
+            return False
+    
+    def merge_section_data(self, course_data: dict, section_data: dict):
+        """
+        Update course_data with the non-empty fields from the All Sections table.
+        
+        A table row for another CRN than course_data's (the parsed row
+        belongs to a sibling section) is ignored.
+        """
+        if course_data.get('crn') and section_data.get('crn') not in (None, course_data['crn']):
+            return
+        if section_data.get('course_times'):
+            course_data['course_times'] = section_data['course_times']
+        if section_data.get('instructor'):
+            course_data['instructor'] = section_data['instructor']
+        if section_data.get('crn'):
+            course_data['crn'] = section_data['crn']
+        if section_data.get('section'):
+            course_data['section'] = section_data['section']
+        if section_data.get('max_enrollment') is not None:
+            course_data['max_enrollment'] = section_data['max_enrollment']
+        if section_data.get('seats_available') is not None:
+            course_data['seats_available'] = section_data['seats_available']
+    
+    def merge_enrollment_data(self, course_data: dict, enrollment_data: dict):
+        """
+        Update course_data with enrollment data from the detail text.
+        
+        Nothing is merged if the text shows another CRN than course_data's
+        (the panel is still another section's).
+        """
+        if course_data.get('crn') and enrollment_data.get('crn') not in (None, course_data['crn']):
+            return
+        # Keep the list-view CRN if the detail text didn't contain one
+        if enrollment_data.get('crn') is None:
+            enrollment_data.pop('crn', None)
+        course_data.update(enrollment_data)
+    
+    def matches_query(self, course_data: dict, query: str) -> bool:
+        """
+        Check whether a result row is what a targeted search asked for.
+        
+        Catalog searches are keyword searches, so "APMA" also returns
+        courses from other departments that mention APMA.
+        
+        Args:
+            course_data: List-view data from extract_list_data
+            query: CRN ("26343"), course code ("APMA 0355") or department ("APMA")
+            
+        Returns:
+            True if the row matches the query exactly
+        """
+        query = query.strip().upper()
+        if query.isdigit():
+            # Rows without a list-view CRN are checked again after the detail click
+            return not course_data.get('crn') or course_data['crn'] == query
+        if ' ' in query:
+            return ' '.join(course_data.get('course_code', '').upper().split()) == ' '.join(query.split())
+        return course_data.get('department', '').upper() == query
+    
+    def lookup(self, query: str, save: bool = True, skip_crns: set = None, on_result=None) -> list:
+        """
+        Search for a CRN, course code or department and scrape the matching rows.
+        
+        Conference sections ("C..") are skipped, as in the full crawl.
+        
+        Args:
+            query: CRN, course code or department code
+            save: Write the scraped rows to the database
+            skip_crns: CRNs to leave out (e.g. already scraped in this run)
+            on_result: Called with each course data dictionary as soon as it is scraped
+            
+        Returns:
+            List of course data dictionaries (empty if nothing matched)
+        """
+        if not self.search(query):
+            return []
+        
+        results = []
+        course_index = 0
+        while True:
+            # Re-fetch each time; clicking a row can re-render the list
+            course_elements = self.driver.find_elements(By.CSS_SELECTOR, self.adapter.result_row)
+            if course_index >= len(course_elements):
+                break
+            course_element = course_elements[course_index]
+            course_index += 1
+            
+            course_data = self.extract_list_data(course_element)
+            if not course_data or not self.matches_query(course_data, query):
+                continue
+            self.log_context = {'query': query, 'crn': course_data.get('crn'),
+                                'course_code': course_data.get('course_code')}
+            if skip_crns and course_data.get('crn') in skip_crns:
+                continue
+            if self.adapter.is_skipped_section(course_data.get('section', '')):
+                continue
+            
+            if self.scrape_course_detail(course_element, course_data) is None:
+                continue
+            if query.strip().isdigit() and course_data.get('crn') != query.strip():
+                continue
+            
+            if save:
+                self.db.insert_course(course_data)
+                self.courses_scraped += 1
+            results.append(course_data)
+            if on_result:
+                on_result(course_data)
+        
+        return results
+    
+    def scrape_subset(self, crns: list = None, course_codes: list = None,
+                      departments: list = None) -> list:
+        """
+        Scrape an explicit subset of the catalog with targeted searches.
+        
+        Only the matching rows are loaded and clicked, so repairing a handful
+        of rows takes seconds instead of a full run. Records and database
+        writes are the same as the full crawl produces.
+        
+        Args:
+            crns: CRNs to scrape
+            course_codes: Course codes to scrape (all sections), e.g. "APMA 0355"
+            departments: Department codes to scrape (all courses), e.g. "AFRI"
+            
+        Returns:
+            List of course data dictionaries that were scraped
+        """
+        queries = list(departments or []) + list(course_codes or []) + list(crns or [])
+        print(f"Scraping subset: {len(queries)} targeted searches")
+        
+        results = []
+        scraped_crns = set()
+        for query in queries:
+            # Skip CRNs already covered by an earlier department/course search
+            if query.strip() in scraped_crns:
+                continue
+            try:
+                found = []
+                if query.strip().isdigit():
+                    # CRNs open directly by key; search only if that fails
+                    stored = self.db.get_course_by_crn(query.strip())
+                    course_data = self.scrape_by_key(query.strip(), stored.get('term') if stored else None)
+                    found = [course_data] if course_data else []
+                if not found:
+                    found = self.lookup(query, skip_crns=scraped_crns)
+            except Exception as e:
+                logger.error(f"Error scraping {query}: {e}", exc_info=True)
+                print(f"Error scraping {query}: {e}")
+                continue
+            if not found:
+                print(f"No courses found for {query}")
+            for course_data in found:
+                if course_data.get('crn'):
+                    scraped_crns.add(course_data['crn'])
+            results.extend(found)
+        
+        print(f"Subset scrape complete! Courses scraped: {len(results)}")
+        return results
+    
+    def get_detail_payload(self) -> str:
+        """Text of the open detail panel (the whole page if the panel isn't found)."""
+        panels = self.driver.find_elements(By.CSS_SELECTOR, self.adapter.detail_panel)
+        if panels:
+            return panels[-1].text
+        return self.driver.find_element(By.TAG_NAME, "body").text
+    
+    def _detail_unchanged(self, course_data: dict) -> bool:
+        """
+        Revalidate the open detail panel against the response cache.
+        
+        If the panel's content hash matches the last crawl and the database
+        already holds its parsed enrollment, the stored values are merged into
+        course_data and the (slow) detail extraction can be skipped.
+        
+        Args:
+            course_data: List-view data (updated in place on a hit)
+            
+        Returns:
+            True if the cached parse was reused
+        """
+        crn = course_data.get('crn')
+        if not crn:
+            return False
+        
+        with self._phase('revalidate'):
+            key = f"detail:{course_data.get('term') or ''}:{crn}"
+            changed = self.response_cache.store(key, self.get_detail_payload())
+        if changed:
+            return False
+        
+        stored = self.db.get_course_by_crn(crn)
+        if not stored or stored.get('max_enrollment') is None:
+            return False
+        
+        for field in ('course_times', 'instructor', 'section'):
+            if not course_data.get(field) and stored.get(field):
+                course_data[field] = stored[field]
+        course_data['max_enrollment'] = stored['max_enrollment']
+        course_data['seats_available'] = stored['seats_available']
+        return True
+    
+    def refresh_course(self, crn: str) -> Optional[dict]:
+        """
+        Re-scrape a single section.
+        
+        Opens its details directly by key (see scrape_by_key) and falls back
+        to searching for its CRN if that fails.
+        
+        Args:
+            crn: Course Reference Number
+            
+        Returns:
+            Fresh course data (also saved to the database), or None if the
+            CRN could not be found
+        """
+        stored = self.db.get_course_by_crn(crn)
+        course_data = self.scrape_by_key(crn, stored.get('term') if stored else None)
+        if course_data:
+            return course_data
+    
+        # Fall back to a CRN search (e.g. the term is wrong or the deep link didn't open)
+        results = self.lookup(crn)
+        if not results:
+            logger.warning(f"CRN {crn} not found in search results")
+            return None
+        return results[0]
     
-    def extract_list_data(self, course_element) -> dict:
+    def default_term(self) -> Optional[str]:
+        """Term id selected in the search form (e.g. "202520")."""
+        return self.adapter.default_term(self.driver)
+    
+    def open_detail(self, crn: str, term: Optional[str] = None, group: str = "") -> bool:
+        """
+        Open a course's detail panel directly by key, without a search.
+    
+        The page has a hidden `#deep-link-tag` anchor with the same
+        data-action as the result rows; filling in its data-key/data-srcdb
+        and clicking it opens any section's details, whatever is listed.
+    
+        Args:
+            crn: Course Reference Number
+            term: Term id (data-srcdb); the form's selected term if None
+            group: Row group ("code:AFRI 0370"), if known
+    
+        Returns:
+            True if the detail panel opened for this CRN
+        """
+        if not self.driver.find_elements(By.ID, self.adapter.deep_link_id):
+            self.driver.get(self.base_url)
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.ID, self.adapter.deep_link_id))
+                )
+            except TimeoutException:
+                logger.warning("Deep-link anchor not found on the catalog page")
+                return False
+    
+        term = term or self.default_term()
+        with self._phase('click'), self.rate_controller.request('detail') as ticket, self._click_trace(crn):
+            self.driver.execute_script("""
+                var tag = document.getElementById(arguments[3]);
+                tag.setAttribute('data-group', arguments[0]);
+                tag.setAttribute('data-key', arguments[1]);
+                tag.setAttribute('data-srcdb', arguments[2]);
+                tag.click();
+            """, group, self.adapter.key_for_crn(crn), term or "", self.adapter.deep_link_id)
+            ticket.timed_out = not self.wait_for_detail(crn)
+        return not ticket.timed_out
+    
+    def scrape_by_key(self, crn: str, term: Optional[str] = None, save: bool = True) -> Optional[dict]:
+        """
+        Scrape one section by opening its details directly (see open_detail).
+    
+        Starts from the stored row when there is one and overwrites only the
+        fields parsed from the panel, so a panel that doesn't show this
+        section's times or instructor keeps the stored ones. Without a stored
+        row, course code and name come from the detail panel's header.
+    
+        Args:
+            crn: Course Reference Number
+            term: Term id (data-srcdb); the form's selected term if None
+            save: Write the scraped row to the database
+    
+        Returns:
+            Course data dictionary, or None if the detail panel didn't open,
+            showed another section, lacked a course code or title, or the
+            row couldn't be saved (callers then fall back to a search)
+        """
+        stored = self.db.get_course_by_crn(crn) or {}
+        group = f"code:{stored['course_code']}" if stored.get('course_code') else ""
+        self.log_context = {'crn': crn, 'course_code': stored.get('course_code')}
+        if not self.open_detail(crn, term, group):
+            return None
+    
+        course_data = stored.copy() if stored else CourseRecord()
+        course_data['crn'] = crn
+        course_data['term'] = term or course_data['term'] or self.default_term()
+        if not course_data['course_code']:
+            course_data.update(self.extract_detail_header())
+            course_data['department'] = self.extract_department(course_data['course_code'] or "")
+    
+        with self._phase('detail_extract'):
+            page_text = self.get_detail_payload()
+            panel = self.adapter.detail_panel
+            rows = self.driver.find_elements(
+                By.CSS_SELECTOR,
+                ", ".join(f"{panel} {selector.strip()}" for selector in self.adapter.section_rows.split(","))
+            )
+            section_data = self.parse_section_table((row.text for row in rows), page_text,
+                                                    course_data['course_code'] or '')
+            # The section table may list other sections of the course; keep this CRN's row
+            if section_data.get('crn') in (None, crn):
+                self.merge_section_data(course_data, section_data)
+            self.merge_enrollment_data(course_data, self.parse_enrollment_text(page_text))
+    
+        if course_data.get('crn') != crn:
+            logger.warning(f"Detail panel for CRN {crn} showed CRN {course_data.get('crn')}")
+            return None
+        if not course_data['course_code'] or not course_data['course_name']:
+            logger.warning(f"Detail panel for CRN {crn} has no course code or title")
+            return None
+    
+        if save:
+            with self._phase('db_write'):
+                if not self.db.insert_course(course_data):
+                    return None
+            self.courses_scraped += 1
+        return course_data
+    
+    def extract_detail_header(self) -> dict:
+        """
+        Course code and title from the open detail panel.
+    
+        Returns:
+            Dictionary with course_code and course_name (None if not found)
+        """
+        header = {'course_code': None, 'course_name': None}
+        for field, selector in (('course_code', f"{self.adapter.detail_panel} {self.adapter.detail_code}"),
+                                ('course_name', f"{self.adapter.detail_panel} {self.adapter.detail_title}")):
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                header[field] = elements[-1].text.strip() or None
+        return header
+    
+    def extract_list_data(self, course_element) -> Optional[CourseRecord]:
         """
         Extract course data from list view.
         
@@ -232,14 +885,14 @@ class BrownCourseScraper:
             course_element: Selenium WebElement for the course
             
         Returns:
-            Dictionary with course data
+            CourseRecord with the list-view fields, or None on error
         """
         try:
-            course_data = {}
+            course_data = CourseRecord()
             
             # Course code (e.g., "AFRI 0370")
             try:
-                code_element = course_element.find_element(By.CSS_SELECTOR, ".result__code")
+                code_element = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_code)
                 course_data['course_code'] = code_element.text.strip()
                 course_data['department'] = self.extract_department(course_data['course_code'])
             except:
@@ -248,16 +901,16 @@ class BrownCourseScraper:
             
             # Course name
             try:
-                name_element = course_element.find_element(By.CSS_SELECTOR, ".result__title")
+                name_element = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_title)
                 course_data['course_name'] = name_element.text.strip()
             except:
                 course_data['course_name'] = ""
             
             # Section - extract from the part section
             try:
-                part_section = course_element.find_element(By.CSS_SELECTOR, ".result__part")
+                part_section = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_part)
                 # Section is in the flex--3 span
-                section_element = part_section.find_element(By.CSS_SELECTOR, ".result__flex--3")
+                section_element = part_section.find_element(By.CSS_SELECTOR, self.adapter.result_section)
                 section_text = section_element.text.strip()
                 course_data['section'] = section_text
             except:
@@ -265,26 +918,30 @@ class BrownCourseScraper:
             
             # Course times - in flex--grow span
             try:
-                time_element = course_element.find_element(By.CSS_SELECTOR, ".flex--grow")
-                time_text = time_element.text.strip()
+                time_element = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_times)
                 # Remove "Meets:" prefix if present
-                if "Meets:" in time_text:
-                    time_text = time_text.replace("Meets:", "").strip()
-                course_data['course_times'] = time_text
+                course_data['course_times'] = self.adapter.clean_times(time_element.text)
             except:
                 course_data['course_times'] = ""
             
             # Instructor - in result__flex--9 text--right span
             try:
-                instructor_element = course_element.find_element(By.CSS_SELECTOR, ".result__flex--9.text--right")
-                instructor_text = instructor_element.text.strip()
+                instructor_element = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_instructor)
                 # Remove "Instructor:" prefix if present
-                if "Instructor:" in instructor_text:
-                    instructor_text = instructor_text.replace("Instructor:", "").strip()
-                course_data['instructor'] = instructor_text
+                course_data['instructor'] = self.adapter.clean_instructor(instructor_element.text)
             except:
                 course_data['instructor'] = ""
             
+            # CRN and term - the row link carries data-key="crn:26343" data-srcdb="202520"
+            try:
+                link_element = course_element.find_element(By.CSS_SELECTOR, self.adapter.result_link)
+                crn = self.adapter.crn_from_key(link_element.get_attribute('data-key') or "")
+                if crn:
+                    course_data['crn'] = crn
+                course_data['term'] = link_element.get_attribute('data-srcdb') or None
+            except:
+                pass
+            
             return course_data
             
         except Exception as e:
@@ -295,6 +952,27 @@ class BrownCourseScraper:
         """
         Extract enrollment data from course detail page.
         
+        Returns:
+            Dictionary with enrollment data and CRN
+        """
+        try:
+            # The panel has rendered by now (see wait_for_detail), so parse
+            # the entire page text
+            page_text = self.driver.find_element(By.TAG_NAME, "body").text
+            return self.parse_enrollment_text(page_text)
+            
+        except Exception as e:
+            print(f"Error extracting enrollment data: {e}")
+        
+        return {'max_enrollment': None, 'seats_available': None, 'crn': None}
+    
+    def parse_enrollment_text(self, page_text: str) -> dict:
+        """
+        Parse enrollment data and CRN out of detail text.
+        
+        Args:
+            page_text: Text of the detail panel or page
+            
         Returns:
             Dictionary with enrollment data and CRN
         """
@@ -305,38 +983,26 @@ class BrownCourseScraper:
         }
         
         try:
-            # Wait for detail page to load - try multiple selectors
-            time.sleep(1)
+            # The panel's own CRN field ("CRN 26343" or "CRN: 26343")
+            enrollment_data['crn'] = self.adapter.panel_crn(page_text)
             
-            # Try to get the entire page text and parse it
-            try:
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text
-                
-                # Extract CRN - look for pattern "CRN 26343" or "CRN: 26343"
-                crn_match = re.search(r'CRN[:\s]+(\d+)', page_text, re.IGNORECASE)
-                if crn_match:
-                    enrollment_data['crn'] = crn_match.group(1)
+            # Extract enrollment - look for "Maximum Enrollment: 40 / Seats Avail: 16"
+            enrollment_match = re.search(r'Maximum Enrollment[:\s]+(\d+)\s*/\s*Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
+            if enrollment_match:
+                enrollment_data['max_enrollment'] = int(enrollment_match.group(1))
+                enrollment_data['seats_available'] = int(enrollment_match.group(2))
+            else:
+                # Try alternative pattern
+                max_match = re.search(r'Maximum Enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
+                seats_match = re.search(r'Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
                 
-                # Extract enrollment - look for "Maximum Enrollment: 40 / Seats Avail: 16"
-                enrollment_match = re.search(r'Maximum Enrollment[:\s]+(\d+)\s*/\s*Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
-                if enrollment_match:
-                    enrollment_data['max_enrollment'] = int(enrollment_match.group(1))
-                    enrollment_data['seats_available'] = int(enrollment_match.group(2))
-                else:
-                    # Try alternative pattern
-                    max_match = re.search(r'Maximum Enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
-                    seats_match = re.search(r'Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
+                if max_match:
+                    enrollment_data['max_enrollment'] = int(max_match.group(1))
+                if seats_match:
+                    enrollment_data['seats_available'] = int(seats_match.group(1))
                     
-                    if max_match:
-                        enrollment_data['max_enrollment'] = int(max_match.group(1))
-                    if seats_match:
-                        enrollment_data['seats_available'] = int(seats_match.group(1))
-                        
-            except Exception as e:
-                print(f"Could not extract from page text: {e}")
-            
         except Exception as e:
-            print(f"Error extracting enrollment data: {e}")
+            print(f"Could not extract from page text: {e}")
         
         return enrollment_data
     
@@ -348,6 +1014,33 @@ class BrownCourseScraper:
         Args:
             course_code: The course code to help with logging
             
+        Returns:
+            Dictionary with section data (times, instructor, CRN, enrollment)
+        """
+        try:
+            # Look for the "All Sections" table
+            # Try to find rows in the table - S01 row should have the data
+            page_text = self.driver.find_element(By.TAG_NAME, "body").text
+            rows = self.driver.find_elements(By.CSS_SELECTOR, self.adapter.section_rows)
+            
+            # Row text is read lazily; parsing stops at the S01 row
+            return self.parse_section_table((row.text for row in rows), page_text, course_code)
+            
+        except Exception as e:
+            print(f"Error extracting section table data for {course_code}: {e}")
+        
+        return {'course_times': '', 'instructor': '', 'crn': None,
+                'max_enrollment': None, 'seats_available': None, 'section': ''}
+    
+    def parse_section_table(self, row_texts, page_text: str, course_code: str = '') -> dict:
+        """
+        Parse the S01 row of the "All Sections" table plus enrollment text.
+        
+        Args:
+            row_texts: Iterable of section table row texts
+            page_text: Text of the detail panel or page
+            course_code: The course code to help with logging
+            
         Returns:
             Dictionary with section data (times, instructor, CRN, enrollment)
         """
@@ -360,114 +1053,120 @@ class BrownCourseScraper:
             'section': ''
         }
         
+        # Look for S01 section data in the table
+        # Pattern: S01 followed by CRN, Meets time, and Instructor
+        # Example from table: "S01    26810    MWF 12-12:50p    K. Mallory"
+        
+        # Try to find the table and parse it
         try:
-            time.sleep(1)
-            
-            # Look for the "All Sections" table
-            # Try to find rows in the table - S01 row should have the data
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            
-            # Look for S01 section data in the table
-            # Pattern: S01 followed by CRN, Meets time, and Instructor
-            # Example from table: "S01    26810    MWF 12-12:50p    K. Mallory"
-            
-            # Try to find the table and parse it
-            try:
-                # Find all table rows
-                rows = self.driver.find_elements(By.CSS_SELECTOR, "table tr, .section-row, [class*='section']")
+            for row_text in row_texts:
+                row_text = row_text.strip()
                 
-                for row in rows:
-                    row_text = row.text.strip()
+                # Look for S01 in the row
+                if re.search(r'\bS01\b', row_text):
+                    # Try to extract data from the row
+                    # Pattern: S01 <CRN> <Meets> <Instructor>
+                    parts = row_text.split()
                     
-                    # Look for S01 in the row
-                    if re.search(r'\bS01\b', row_text):
-                        # Try to extract data from the row
-                        # Pattern: S01 <CRN> <Meets> <Instructor>
-                        parts = row_text.split()
+                    if len(parts) >= 4:
+                        section_data['section'] = 'S01'
                         
-                        if len(parts) >= 4:
-                            section_data['section'] = 'S01'
-                            
-                            # Try to find CRN (5-digit number)
-                            for i, part in enumerate(parts):
-                                if part.isdigit() and len(part) == 5:
-                                    section_data['crn'] = part
-                                    
-                                    # Times should be after CRN
-                                    if i + 1 < len(parts):
-                                        # Collect time parts (e.g., "MWF 12-12:50p")
-                                        time_parts = []
-                                        j = i + 1
-                                        while j < len(parts) and not parts[j][0].isupper() or re.match(r'^[MTWRF]+$', parts[j]):
+                        # Try to find CRN (5-digit number)
+                        for i, part in enumerate(parts):
+                            if part.isdigit() and len(part) == 5:
+                                section_data['crn'] = part
+                                
+                                # Times should be after CRN
+                                if i + 1 < len(parts):
+                                    # Collect time parts (e.g., "MWF 12-12:50p")
+                                    time_parts = []
+                                    j = i + 1
+                                    while j < len(parts) and not parts[j][0].isupper() or re.match(r'^[MTWRF]+$', parts[j]):
+                                        time_parts.append(parts[j])
+                                        j += 1
+                                        if j < len(parts) and re.search(r'\d', parts[j]):
                                             time_parts.append(parts[j])
                                             j += 1
-                                            if j < len(parts) and re.search(r'\d', parts[j]):
-                                                time_parts.append(parts[j])
-                                                j += 1
-                                                break
-                                        
-                                        if time_parts:
-                                            section_data['course_times'] = ' '.join(time_parts)
-                                        
-                                        # Instructor is the rest
-                                        if j < len(parts):
-                                            section_data['instructor'] = ' '.join(parts[j:])
-                                    break
-                        
-                        # If we found S01, we're done
-                        if section_data['section'] == 'S01':
-                            break
-                
-                # If table parsing didn't work, try regex on full page text
-                if not section_data['section']:
-                    # Look for pattern: S01 followed by 5-digit CRN, time, and instructor
-                    s01_match = re.search(r'S01\s+(\d{5})\s+([MTWRF\s\d:\-apm]+)\s+([A-Z][^\n]+)', page_text)
-                    if s01_match:
-                        section_data['section'] = 'S01'
-                        section_data['crn'] = s01_match.group(1)
-                        section_data['course_times'] = s01_match.group(2).strip()
-                        section_data['instructor'] = s01_match.group(3).strip()
-                
-            except Exception as e:
-                print(f"Error parsing table for {course_code}: {e}")
+                                            break
+                                    
+                                    if time_parts:
+                                        section_data['course_times'] = ' '.join(time_parts)
+                                    
+                                    # Instructor is the rest
+                                    if j < len(parts):
+                                        section_data['instructor'] = ' '.join(parts[j:])
+                                break
+                    
+                    # If we found S01, we're done
+                    if section_data['section'] == 'S01':
+                        break
             
-            # Also try to get enrollment data
-            # Look for "Current enrollment: 143" or "Maximum Enrollment: X / Seats Avail: Y"
-            enrollment_match = re.search(r'Current enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
-            if enrollment_match:
-                section_data['max_enrollment'] = int(enrollment_match.group(1))
-                # For current enrollment, seats available would be 0 or we need to find max
-                # Try to find max enrollment separately
-                max_match = re.search(r'Maximum Enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
-                if max_match:
-                    actual_max = int(max_match.group(1))
-                    current = int(enrollment_match.group(1))
-                    section_data['max_enrollment'] = actual_max
-                    section_data['seats_available'] = max(0, actual_max - current)
-            else:
-                # Try the standard pattern
-                enrollment_match = re.search(r'Maximum Enrollment[:\s]+(\d+)\s*/\s*Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
-                if enrollment_match:
-                    section_data['max_enrollment'] = int(enrollment_match.group(1))
-                    section_data['seats_available'] = int(enrollment_match.group(2))
+            # If table parsing didn't work, try regex on full page text
+            if not section_data['section']:
+                # Look for pattern: S01 followed by 5-digit CRN, time, and instructor
+                s01_match = re.search(r'S01\s+(\d{5})\s+([MTWRF\s\d:\-apm]+)\s+([A-Z][^\n]+)', page_text)
+                if s01_match:
+                    section_data['section'] = 'S01'
+                    section_data['crn'] = s01_match.group(1)
+                    section_data['course_times'] = s01_match.group(2).strip()
+                    section_data['instructor'] = s01_match.group(3).strip()
             
         except Exception as e:
-            print(f"Error extracting section table data for {course_code}: {e}")
+            print(f"Error parsing table for {course_code}: {e}")
+        
+        # Also try to get enrollment data
+        # Look for "Current enrollment: 143" or "Maximum Enrollment: X / Seats Avail: Y"
+        enrollment_match = re.search(r'Current enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
+        if enrollment_match:
+            section_data['max_enrollment'] = int(enrollment_match.group(1))
+            # For current enrollment, seats available would be 0 or we need to find max
+            # Try to find max enrollment separately
+            max_match = re.search(r'Maximum Enrollment[:\s]+(\d+)', page_text, re.IGNORECASE)
+            if max_match:
+                actual_max = int(max_match.group(1))
+                current = int(enrollment_match.group(1))
+                section_data['max_enrollment'] = actual_max
+                section_data['seats_available'] = max(0, actual_max - current)
+        else:
+            # Try the standard pattern
+            enrollment_match = re.search(r'Maximum Enrollment[:\s]+(\d+)\s*/\s*Seats Avail[:\s]+(\d+)', page_text, re.IGNORECASE)
+            if enrollment_match:
+                section_data['max_enrollment'] = int(enrollment_match.group(1))
+                section_data['seats_available'] = int(enrollment_match.group(2))
         
         return section_data
     
-    def run(self, max_courses: int = None):
+    def run(self, max_courses: int = None, crns: list = None, course_codes: list = None,
+            departments: list = None, list_only: bool = False, pipelined: bool = False):
         """
         Run the complete scraping process.
         
+        If any of crns, course_codes or departments is given, only that subset
+        is scraped (see scrape_subset) and the full list is never loaded.
+        
         Args:
             max_courses: Maximum number of courses to scrape (None for all)
+            crns: CRNs to scrape
+            course_codes: Course codes to scrape
+            departments: Department codes to scrape
+            list_only: Store list rows without clicking into them (full crawl only)
+            pipelined: Capture details with the in-page observer buffer (full crawl only,
+                see pipelined_capture.py)
         """
         try:
             print("Starting Brown Course Catalog Scraper...")
             self.setup_driver()
-            self.load_all_courses()
-            self.scrape_course_list(max_courses)
+            # Commit scraped rows in small batches instead of one fsync per course
+            with self.db.batch(size=50, interval=2.0):
+                if crns or course_codes or departments:
+                    self.scrape_subset(crns, course_codes, departments)
+                else:
+                    self.load_all_courses()
+                    if pipelined and not list_only:
+                        from pipelined_capture import PipelinedDetailCapture
+                        PipelinedDetailCapture(self).run(max_courses)
+                    else:
+                        self.scrape_course_list(max_courses, list_only=list_only)
             
         except Exception as e:
             print(f"Fatal error: {e}")
@@ -486,12 +1185,26 @@ class BrownCourseScraper:
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Scrape the Brown course catalog")
+    parser.add_argument('--profile', metavar='PREFIX', default=None,
+                        help="Profile the run and write PREFIX.json / PREFIX.txt reports")
+    args = parser.parse_args()
+    
+    profiler = None
+    if args.profile:
+        from profiling import PhaseProfiler
+        profiler = PhaseProfiler()
+    
     # Create scraper instance
-    scraper = BrownCourseScraper(headless=False)
+    scraper = BrownCourseScraper(headless=False, profiler=profiler)
     
     # Run scraper
     # Set max_courses to a small number for testing, or None to scrape all
-    scraper.run(max_courses=None)  # Change to None to scrape all courses
+    try:
+        scraper.run(max_courses=None)  # Change to None to scrape all courses
+    finally:
+        if profiler:
+            profiler.write_report(args.profile)
     
     # Print summary
     print(f"\nDatabase summary:")
@@ -0,0 +1,165 @@
+"""
+Site adapters: everything catalog-specific the scraper needs.
+
+Brown's catalog (cab.brown.edu) runs on a course-search product that other
+schools use too, with the same `result__*` markup, `data-key="crn:..."`
+row links and `data-srcdb` term ids. An adapter bundles a catalog's URL,
+CSS selectors, field parsers and term handling; the scraper reads all of
+them from its adapter instead of hard-coding Brown's.
+
+    FoseAdapter   - the shared markup; give it a name and base URL
+    BrownAdapter  - cab.brown.edu (the default)
+
+get_adapter("brown") returns a registered adapter; get_adapter("name=URL")
+builds a FoseAdapter for any other catalog on the same product.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+class FoseAdapter:
+    """Catalog using the standard result-list / detail-panel markup."""
+
+    # Search page
+    search_input = "input[placeholder*='title, tag, subject, CRN or keyword']"
+    term_select_id = "crit-srcdb"
+
+    # Results list
+    result_row = ".result.result--group-start"
+    result_link = "a.result__link"
+    result_code = ".result__code"
+    result_title = ".result__title"
+    result_part = ".result__part"
+    result_section = ".result__flex--3"
+    result_times = ".flex--grow"
+    result_instructor = ".result__flex--9.text--right"
+
+    # Detail panel
+    detail_panel = ".panel--kind-details"
+    detail_code = ".dtl-course-code"
+    detail_title = ".detail-title"
+    section_rows = "table tr, .section-row, [class*='section']"
+    deep_link_id = "deep-link-tag"
+    # The panel's own CRN field ("CRN: 26343"), the first labelled CRN in its text.
+    # Rows of the All Sections table list sibling CRNs without the label.
+    detail_crn_pattern = r"CRN[:\s]+(\d+)"
+
+    # Row keys look like "crn:26343"
+    key_prefix = "crn:"
+    # Discussion/conference sections aren't scraped
+    skipped_section_prefixes = ('C',)
+
+    def __init__(self, name: str, base_url: str):
+        """
+        Initialize the adapter.
+
+        Args:
+            name: Short catalog name (also names its database partition)
+            base_url: Catalog home page with the search box
+        """
+        self.name = name
+        self.base_url = base_url
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, {self.base_url!r})"
+
+    def extract_department(self, course_code: str) -> str:
+        """Department code from a course code ("AFRI 0370" -> "AFRI")."""
+        match = re.match(r'^([A-Z]+)', course_code)
+        return match.group(1) if match else ""
+
+    def clean_times(self, text: str) -> str:
+        """Meeting times from a result row, without the screen-reader label."""
+        return text.replace("Meets:", "").strip()
+
+    def clean_instructor(self, text: str) -> str:
+        """Instructor from a result row, without the screen-reader label."""
+        return text.replace("Instructor:", "").strip()
+
+    def crn_from_key(self, key: str) -> Optional[str]:
+        """CRN from a row's data-key ("crn:26343" -> "26343"), or None."""
+        if key and key.startswith(self.key_prefix):
+            return key[len(self.key_prefix):]
+        return None
+
+    def panel_crn(self, text: str) -> Optional[str]:
+        """CRN a detail panel is showing, from its text ("CRN: 26343" -> "26343"), or None."""
+        match = re.search(self.detail_crn_pattern, text or "", re.IGNORECASE)
+        return match.group(1) if match else None
+
+    def key_for_crn(self, crn: str) -> str:
+        """Row data-key for a CRN."""
+        return f"{self.key_prefix}{crn}"
+
+    def is_skipped_section(self, section: str) -> bool:
+        """Whether a section (e.g. "C01") is left out of scrapes."""
+        return bool(section) and section.startswith(self.skipped_section_prefixes)
+
+    def default_term(self, driver) -> Optional[str]:
+        """
+        Term id selected in the search form.
+
+        Args:
+            driver: WebDriver on the catalog page
+
+        Returns:
+            Term id (e.g. "202520"), or None if the form has no term selector
+        """
+        elements = driver.find_elements("id", self.term_select_id)
+        if not elements:
+            return None
+        return elements[0].get_attribute('value') or None
+
+    def terms(self, driver) -> List[Dict[str, str]]:
+        """
+        Every term the catalog offers.
+
+        Args:
+            driver: WebDriver on the catalog page
+
+        Returns:
+            List of {"id": "202520", "label": "Spring 2026"} in the form's order
+        """
+        return driver.execute_script("""
+            var select = document.getElementById(arguments[0]);
+            if (!select) { return []; }
+            return Array.from(select.options).map(function (option) {
+                return {id: option.value, label: option.text.trim()};
+            });
+        """, self.term_select_id) or []
+
+
+class BrownAdapter(FoseAdapter):
+    """Brown University's Courses@Brown."""
+
+    def __init__(self, name: str = "brown", base_url: str = "https://cab.brown.edu/"):
+        super().__init__(name, base_url)
+
+
+ADAPTERS = {
+    'brown': BrownAdapter,
+}
+
+
+def get_adapter(spec: str) -> FoseAdapter:
+    """
+    Adapter for a catalog.
+
+    Args:
+        spec: Registered name ("brown"), or "name=URL" for another catalog
+            using the same markup
+
+    Returns:
+        The adapter instance
+
+    Raises:
+        ValueError: If the name isn't registered and no URL was given
+    """
+    if '=' in spec:
+        name, base_url = spec.split('=', 1)
+        return FoseAdapter(name.strip(), base_url.strip())
+    try:
+        return ADAPTERS[spec]()
+    except KeyError:
+        raise ValueError(f"Unknown catalog {spec!r}; use one of {sorted(ADAPTERS)} or NAME=URL")
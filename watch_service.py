@@ -0,0 +1,191 @@
+"""
+Seat-availability watchlist service.
+
+Re-checks a short list of CRNs or course codes with targeted catalog searches
+(the same search box lookup test_missing_times.py uses for "APMA 0355") and
+emits an event to every sink whenever a watched section's seats change.
+Nothing else in the catalog is crawled, so a small watchlist gets
+sub-minute detection latency.
+"""
+
+import json
+import logging
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database import CourseDatabase
+
+
+class StdoutSink:
+    """Print events as readable lines."""
+
+    def emit(self, event: Dict):
+        print(f"[{event['timestamp']}] {event['type']}: {event['course_code']} {event['section']} "
+              f"(CRN {event['crn']}) seats {event['old_seats']} -> {event['new_seats']}")
+        sys.stdout.flush()
+
+
+class FileSink:
+    """Append events to a file as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def emit(self, event: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event) + '\n')
+
+
+class WebhookSink:
+    """POST each event as JSON to a URL (e.g. a local webhook)."""
+
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, event: Dict):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(event).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except Exception as e:
+            logging.warning(f"Webhook {self.url} failed: {e}")
+
+
+def classify_change(old_seats: Optional[int], new_seats: Optional[int]) -> Optional[str]:
+    """
+    Name the kind of seat change between two observations.
+
+    Returns:
+        'seats_opened', 'seats_closed', 'seats_changed', or None if unchanged
+    """
+    if old_seats is None or new_seats is None or old_seats == new_seats:
+        return None
+    if old_seats == 0:
+        return 'seats_opened'
+    if new_seats == 0:
+        return 'seats_closed'
+    return 'seats_changed'
+
+
+class WatchService:
+    """Refreshes watched sections at a fixed cadence and reports seat changes."""
+
+    def __init__(self, scraper, targets: List[str], sinks: List, interval: float = 30):
+        """
+        Initialize the service.
+
+        Args:
+            scraper: BrownCourseScraper with a running driver
+            targets: CRNs or course codes (e.g. "26343", "APMA 0355")
+            sinks: Objects with an emit(event) method
+            interval: Seconds between the starts of consecutive checks
+        """
+        self.scraper = scraper
+        self.targets = targets
+        self.sinks = sinks
+        self.interval = interval
+        self.seats: Dict[str, Optional[int]] = {}  # CRN -> last seen seats available
+        self.cycles = 0
+        self.events = 0
+
+    def _previous_seats(self, db: CourseDatabase, crn: str) -> Optional[int]:
+        """Last known seats for a CRN, falling back to the database on first sight."""
+        if crn in self.seats:
+            return self.seats[crn]
+        course = db.get_course_by_crn(crn)
+        return course.get('seats_available') if course else None
+
+    def emit(self, event: Dict):
+        """Send an event to every sink."""
+        self.events += 1
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception as e:
+                logging.warning(f"Sink {type(sink).__name__} failed: {e}")
+
+    def fetch(self, target: str) -> List[Dict]:
+        """
+        Scrape a target's sections without saving them.
+
+        CRNs open their detail panel directly by key (no search reload);
+        course codes, and CRNs whose deep link fails, are searched.
+
+        Args:
+            target: CRN or course code
+
+        Returns:
+            Course data dictionaries
+        """
+        target = target.strip()
+        if target.isdigit():
+            stored = self.scraper.db.get_course_by_crn(target)
+            course_data = self.scraper.scrape_by_key(target, stored.get('term') if stored else None,
+                                                     save=False)
+            if course_data:
+                return [course_data]
+        return self.scraper.lookup(target, save=False)
+
+    def check(self, target: str):
+        """
+        Look up one target and emit events for any seat changes.
+
+        Args:
+            target: CRN or course code
+        """
+        db = self.scraper.db
+        # Saved only after comparing, so a first check still sees the stored seats
+        for course_data in self.fetch(target):
+            crn = course_data.get('crn')
+            if not crn:
+                continue
+            new_seats = course_data.get('seats_available')
+            old_seats = self._previous_seats(db, crn)
+            self.seats[crn] = new_seats
+            db.insert_course(course_data)
+            self.scraper.courses_scraped += 1
+
+            change = classify_change(old_seats, new_seats)
+            if change:
+                self.emit({
+                    'type': change,
+                    'timestamp': datetime.now().isoformat(timespec='seconds'),
+                    'crn': crn,
+                    'course_code': course_data.get('course_code', ''),
+                    'section': course_data.get('section', ''),
+                    'old_seats': old_seats,
+                    'new_seats': new_seats,
+                    'max_enrollment': course_data.get('max_enrollment'),
+                })
+
+    def run(self, cycles: Optional[int] = None):
+        """
+        Check every target, then wait out the rest of the interval; repeat.
+
+        Args:
+            cycles: Stop after this many passes over the watchlist (None to run forever)
+        """
+        while cycles is None or self.cycles < cycles:
+            start = time.time()
+            for target in self.targets:
+                try:
+                    self.check(target)
+                except Exception as e:
+                    logging.error(f"Error checking {target}: {e}", exc_info=True)
+                    print(f"Error checking {target}: {e}")
+            self.cycles += 1
+
+            elapsed = time.time() - start
+            if elapsed > self.interval:
+                print(f"Warning: checking {len(self.targets)} targets took {elapsed:.0f}s "
+                      f"(interval {self.interval:.0f}s); shorten the watchlist to keep up")
+            else:
+                time.sleep(self.interval - elapsed)